@@ -11,7 +11,7 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from src.config import get_settings
-from src.infrastructure.database import Base
+from src.infrastructure.database import Base, _connect_args
 from src.infrastructure.models import UserModel  # noqa: F401 - Import for metadata
 
 config = context.config
@@ -20,7 +20,8 @@ settings = get_settings()
 # Set database URL from settings
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
-if config.config_file_name is not None:
+# Skip logging setup when invoked programmatically by the running app
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
@@ -54,6 +55,9 @@ async def run_async_migrations() -> None:
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        # Same statement cache settings as the app, so migrations also run
+        # through PgBouncer in transaction pooling mode
+        connect_args=_connect_args(settings),
     )
 
     async with connectable.connect() as connection:
@@ -64,7 +68,13 @@ async def run_async_migrations() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
-    asyncio.run(run_async_migrations())
+    # The app passes its own connection so the upgrade runs inside the
+    # transaction that holds the migration lock
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+    else:
+        asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,32 @@
+"""Create user_friends table
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The subscriptions table was previously only created by create_all on
+    # startup; databases that already have it are left untouched.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_friends (
+            user_id UUID NOT NULL REFERENCES users (id),
+            friend_id UUID NOT NULL REFERENCES users (id),
+            PRIMARY KEY (user_id, friend_id)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("user_friends")
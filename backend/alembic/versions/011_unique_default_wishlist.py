@@ -0,0 +1,42 @@
+"""Allow at most one default wishlist per user
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Racing /start presses could create two default wishlists before
+    # registration became a single upsert; keep the oldest one as default.
+    op.execute("""
+        UPDATE wishlists SET is_default = false
+        WHERE is_default AND id NOT IN (
+            SELECT DISTINCT ON (user_id) id
+            FROM wishlists
+            WHERE is_default
+            ORDER BY user_id, created_at, id
+        )
+    """)
+    op.create_index(
+        "uq_wishlists_user_default",
+        "wishlists",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text("is_default"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_wishlists_user_default", table_name="wishlists")
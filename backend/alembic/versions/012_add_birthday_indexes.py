@@ -0,0 +1,36 @@
+"""Add indexes for the birthday reminder scan
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Birthdays are looked up by calendar day regardless of year
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_users_birth_month_day
+        ON users ((EXTRACT(MONTH FROM birth_date)), (EXTRACT(DAY FROM birth_date)))
+        WHERE birth_date IS NOT NULL
+    """)
+    # The primary key (user_id, friend_id) only serves "whom do I follow";
+    # reminders need the reverse edge, "who follows this user"
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_user_friends_friend_id
+        ON user_friends (friend_id, user_id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_user_friends_friend_id")
+    op.execute("DROP INDEX IF EXISTS ix_users_birth_month_day")
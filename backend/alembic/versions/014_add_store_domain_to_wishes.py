@@ -0,0 +1,35 @@
+"""Add store_domain to wishes
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Registrable domain of the link, set by the application; existing rows
+    # are filled by scripts/backfill_store_domains.py after the upgrade
+    op.add_column("wishes", sa.Column("store_domain", sa.String(255), nullable=True))
+    # Most wishes have no link; keep them out of the index
+    op.create_index(
+        "ix_wishes_store_domain",
+        "wishes",
+        ["store_domain"],
+        postgresql_where=sa.text("store_domain IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wishes_store_domain", table_name="wishes")
+    op.drop_column("wishes", "store_domain")
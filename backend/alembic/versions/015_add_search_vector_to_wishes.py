@@ -0,0 +1,42 @@
+"""Add full-text search vector to wishes
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Kept in step with WISH_SEARCH_VECTOR in src/infrastructure/models/wish.py.
+    # Adding a stored generated column rewrites the table once.
+    op.execute(
+        "ALTER TABLE wishes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(subtitle, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(subtitle, '')), 'B') || "
+        "setweight(to_tsvector('russian', coalesce(description, '')), 'C') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.create_index(
+        "ix_wishes_search_vector",
+        "wishes",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wishes_search_vector", table_name="wishes")
+    op.drop_column("wishes", "search_vector")
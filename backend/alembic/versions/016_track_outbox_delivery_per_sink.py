@@ -0,0 +1,39 @@
+"""Track outbox delivery per sink
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "outbox",
+        sa.Column(
+            "delivered_to",
+            postgresql.ARRAY(sa.String(32)),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.add_column(
+        "outbox",
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("outbox", "claimed_until")
+    op.drop_column("outbox", "delivered_to")
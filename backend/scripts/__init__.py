@@ -0,0 +1 @@
+# Developer tooling: load testing and data seeding
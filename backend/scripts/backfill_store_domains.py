@@ -0,0 +1,59 @@
+"""
+Fill wishes.store_domain for wishes created before it existed.
+
+Usage (from backend/, after migration 014):
+    python -m scripts.backfill_store_domains --batch-size 5000 --pause 0.1
+
+Walks wishes with a link and no store domain in primary key order, one
+batch per transaction, so locks are short and the run can be stopped and
+restarted at any point. Links without a recognisable domain stay NULL and
+are skipped. --pause sleeps between batches to leave room for live traffic.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+from uuid import UUID
+
+from src.infrastructure.database import close_db, get_session_factory
+from src.infrastructure.utils import extract_store_from_url
+from src.repositories import WishRepository
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill wishes.store_domain")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds between batches")
+    args = parser.parse_args(argv)
+
+    session_factory = get_session_factory()
+    after: Optional[UUID] = None
+    scanned = updated = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            async with session_factory() as session:
+                async with session.begin():
+                    repository = WishRepository(session)
+                    rows = await repository.get_links_without_store(after, args.batch_size)
+                    if not rows:
+                        break
+                    domains = {
+                        wish_id: domain
+                        for wish_id, link in rows
+                        if (domain := extract_store_from_url(link)) is not None
+                    }
+                    updated += await repository.set_store_domains(domains)
+            scanned += len(rows)
+            after = rows[-1][0]
+            print(f"{scanned} scanned, {updated} updated, {time.perf_counter() - started:.0f}s")
+            if len(rows) < args.batch_size:
+                break
+            await asyncio.sleep(args.pause)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""
+Check the image proxy against a local stand-in image host.
+
+Usage (from backend/):
+    python -m scripts.image_proxy_check --images 20
+
+Serves generated multi-megapixel JPEG and PNG photos from an in-process
+HTTP server, proxies each through ImageProxy into a temporary blob store
+and reports source versus thumbnail sizes and processing times. It also
+checks that concurrent requests share one download, that a second proxy
+on the same directory (another worker) serves from disk without fetching,
+that broken sources fail fast, and that the store evicts down to its
+budget. No database is needed.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import socket
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+from PIL import Image, ImageDraw
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from src.infrastructure.blob_store import BlobStore
+from src.services.images import ImageProxy, ImageProxyError
+
+WIDTHS = [160, 320, 640]
+
+
+def _photo(seed: int, size: tuple[int, int], fmt: str) -> bytes:
+    """A noisy picture that compresses about as badly as a product photo."""
+    rng = random.Random(seed)
+    image = Image.effect_noise(size, 60).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        radius = rng.randrange(50, 600)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, quality=92)
+    return buffer.getvalue()
+
+
+class StandInImageHost:
+    def __init__(self, images: int):
+        self.images = {
+            f"{index}.{'png' if index % 5 == 4 else 'jpg'}": _photo(
+                index, (3000, 2000) if index % 2 else (1600, 2400), "PNG" if index % 5 == 4 else "JPEG"
+            )
+            for index in range(images)
+        }
+        self.hits: Counter[str] = Counter()
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/img/{name}", self.image),
+            Route("/broken.jpg", self.broken),
+        ])
+
+    async def image(self, request: Request) -> Response:
+        name = request.path_params["name"]
+        self.hits[name] += 1
+        await asyncio.sleep(0.05)
+        media_type = "image/png" if name.endswith(".png") else "image/jpeg"
+        return Response(self.images[name], media_type=media_type)
+
+    async def broken(self, request: Request) -> Response:
+        self.hits["broken.jpg"] += 1
+        return PlainTextResponse("not an image", media_type="image/jpeg")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _proxy(root: Path, max_bytes: int) -> ImageProxy:
+    return ImageProxy(
+        BlobStore(root, max_bytes),
+        secret="check",
+        widths=WIDTHS,
+        max_source_bytes=30_000_000,
+        fetch_timeout=30.0,
+        max_concurrency=4,
+        process_workers=2,
+        allow_private_hosts=True,
+    )
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check the image proxy against a stand-in host")
+    parser.add_argument("--images", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    host = StandInImageHost(args.images)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(host.app(), host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base = f"http://127.0.0.1:{port}"
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        proxy = _proxy(root, max_bytes=1024 ** 3)
+        other_worker = _proxy(root, max_bytes=1024 ** 3)
+        try:
+            first = f"{base}/img/0.jpg"
+            # Warm up the process pool so the timings below are per image
+            await proxy.get_image(first)
+
+            started = time.perf_counter()
+            images = await asyncio.gather(*(
+                proxy.get_image(f"{base}/img/{name}") for name in host.images for _ in range(3)
+            ))
+            elapsed = time.perf_counter() - started
+            if any(count != 1 for count in host.hits.values()):
+                failures.append(f"Sources fetched more than once: {dict(host.hits)}")
+
+            thumbnail_bytes = {width: 0 for width in WIDTHS}
+            for name, image in zip(host.images, images[::3]):
+                for width in WIDTHS:
+                    _, digest, path = await proxy.get_thumbnail(f"{base}/img/{name}", width)
+                    thumbnail_bytes[width] += path.stat().st_size
+                    with Image.open(path) as thumbnail:
+                        if thumbnail.format != "WEBP" or thumbnail.width != width:
+                            failures.append(f"Thumbnail {digest} is {thumbnail.format} {thumbnail.size}")
+                if len(image.blurhash) != 28:
+                    failures.append(f"Unexpected blurhash {image.blurhash}")
+
+            hits_before = sum(host.hits.values())
+            await other_worker.get_image(first)
+            if sum(host.hits.values()) != hits_before:
+                failures.append("Second worker fetched an image already in the store")
+
+            for _ in range(2):
+                try:
+                    await proxy.get_image(f"{base}/broken.jpg")
+                    failures.append("Broken image was accepted")
+                except ImageProxyError:
+                    pass
+            if host.hits["broken.jpg"] != 1:
+                failures.append("Broken image was fetched again within the error TTL")
+
+            if proxy.snap_width(200) != 320 or proxy.snap_width(5000) != 640:
+                failures.append("Widths are not snapped to the configured set")
+            if not proxy.verify(first, proxy.sign(first)) or proxy.verify(first, "0" * 32):
+                failures.append("Signature check is wrong")
+
+            used = sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+            budget = used // 2
+            freed = BlobStore(root, budget).evict()
+            left = sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+            if left > budget:
+                failures.append(f"Eviction left {left} bytes over a {budget} byte budget")
+        finally:
+            await proxy.close()
+            await other_worker.close()
+            server.should_exit = True
+            await serving
+
+    source_bytes = sum(len(data) for data in host.images.values())
+    print(json.dumps({
+        "images": len(host.images),
+        "source_mb": round(source_bytes / 1024 ** 2, 1),
+        "thumbnail_kb_per_image": {
+            width: round(total / len(host.images) / 1024, 1) for width, total in thumbnail_bytes.items()
+        },
+        "process_seconds_per_image": round(elapsed / len(host.images), 3),
+        "evicted_bytes": freed,
+        "failures": failures,
+    }, indent=2))
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
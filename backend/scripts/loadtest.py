@@ -0,0 +1,346 @@
+"""
+Load generator replaying Mini App client flows against a running backend.
+
+Usage (from backend/):
+    python -m scripts.loadtest --base-url http://localhost:8000 \\
+        --users 200 --rate 20 --concurrency 100 --duration 60 --output report.json
+
+Setup registers --users users via /users/register, each with a few wishes,
+and subscribes them to each other. The run then starts sessions as a
+Poisson process at --rate sessions/s, with at most --concurrency running at
+once. Each session replays a client flow: register, open profile, list
+wishlists and wishes, browse friends, search, then book and unbook a
+friend's wish.
+
+The report is JSON with p50/p95/p99 latency and the error rate per
+endpoint, so reports from two releases can be diffed directly.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class EndpointStats:
+    """Latency samples and error count for one endpoint."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict[str, Any]:
+        samples = sorted(self.latencies)
+        count = len(samples)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "mean_ms": round(sum(samples) / count * 1000, 2) if count else None,
+            "p50_ms": _percentile(samples, 50),
+            "p95_ms": _percentile(samples, 95),
+            "p99_ms": _percentile(samples, 99),
+        }
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile in milliseconds."""
+    if not sorted_samples:
+        return None
+    rank = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return round(sorted_samples[rank] * 1000, 2)
+
+
+@dataclass
+class SeededUser:
+    """A user created during setup."""
+
+    telegram_id: int
+    first_name: str
+    wishlist_id: Optional[str] = None
+    wish_ids: list[str] = field(default_factory=list)
+
+
+class LoadTest:
+    """Drives client flows and collects per-endpoint statistics."""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self._client = client
+        self._rng = rng
+        self._stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.users: list[SeededUser] = []
+
+    async def call(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        expected: tuple[int, ...] = (200,),
+        **kwargs: Any,
+    ) -> Optional[httpx.Response]:
+        """Issue a request and record it under the endpoint name."""
+        stats = self._stats[name]
+        started = time.perf_counter()
+        try:
+            response = await self._client.request(method, API_PREFIX + path, **kwargs)
+        except httpx.HTTPError:
+            stats.latencies.append(time.perf_counter() - started)
+            stats.errors += 1
+            return None
+        stats.latencies.append(time.perf_counter() - started)
+        if response.status_code not in expected:
+            stats.errors += 1
+        return response
+
+    # -- setup ---------------------------------------------------------
+
+    async def register(self, user: SeededUser) -> None:
+        await self.call(
+            "POST /users/register",
+            "POST",
+            "/users/register",
+            json={
+                "telegram_id": user.telegram_id,
+                "username": f"load{user.telegram_id}",
+                "first_name": user.first_name,
+                "last_name": "Load",
+            },
+        )
+
+    async def seed_user(self, telegram_id: int, wishes_per_user: int) -> SeededUser:
+        user = SeededUser(telegram_id=telegram_id, first_name=f"Load{telegram_id}")
+        await self.register(user)
+
+        response = await self.call(
+            "GET /wishlists/user/telegram/{telegram_id}",
+            "GET",
+            f"/wishlists/user/telegram/{telegram_id}",
+        )
+        if response is not None and response.status_code == 200:
+            wishlists = response.json()["wishlists"]
+            if wishlists:
+                user.wishlist_id = wishlists[0]["id"]
+
+        if user.wishlist_id:
+            for i in range(wishes_per_user):
+                response = await self.call(
+                    "POST /wishes",
+                    "POST",
+                    "/wishes",
+                    expected=(201,),
+                    params={"telegram_id": telegram_id},
+                    json={
+                        "wishlist_id": user.wishlist_id,
+                        "title": f"Gift {i} of {telegram_id}",
+                        "price": self._rng.randint(500, 50_000),
+                        "currency": "RUB",
+                    },
+                )
+                if response is not None and response.status_code == 201:
+                    user.wish_ids.append(response.json()["id"])
+        return user
+
+    async def setup(
+        self, users: int, telegram_id_base: int, wishes_per_user: int,
+        friends_per_user: int, concurrency: int,
+    ) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def seed(telegram_id: int) -> SeededUser:
+            async with semaphore:
+                return await self.seed_user(telegram_id, wishes_per_user)
+
+        self.users = list(await asyncio.gather(
+            *(seed(telegram_id_base + i) for i in range(users))
+        ))
+
+        async def befriend(user: SeededUser) -> None:
+            async with semaphore:
+                others = [u for u in self._rng.sample(self.users, min(len(self.users), friends_per_user + 1))
+                          if u.telegram_id != user.telegram_id][:friends_per_user]
+                for friend in others:
+                    await self.call(
+                        "POST /users/{target_id}/subscribe",
+                        "POST",
+                        f"/users/{friend.telegram_id}/subscribe",
+                        params={"current_user_id": user.telegram_id},
+                    )
+
+        await asyncio.gather(*(befriend(user) for user in self.users))
+
+    # -- client flow -----------------------------------------------------
+
+    async def session(self) -> None:
+        """One Mini App visit by a random seeded user."""
+        user = self._rng.choice(self.users)
+        tg = user.telegram_id
+
+        # Bot /start
+        await self.register(user)
+
+        # Open own profile
+        await self.call(
+            "GET /users/telegram/{telegram_id}", "GET", f"/users/telegram/{tg}",
+        )
+        await self.call(
+            "GET /wishlists/user/telegram/{telegram_id}", "GET", f"/wishlists/user/telegram/{tg}",
+        )
+        if user.wishlist_id:
+            await self.call(
+                "GET /wishes", "GET", "/wishes",
+                params={"wishlist_id": user.wishlist_id, "viewer_telegram_id": tg},
+            )
+
+        # Friends tab
+        response = await self.call(
+            "GET /users/friends", "GET", "/users/friends", params={"telegram_id": tg},
+        )
+        friends = response.json() if response is not None and response.status_code == 200 else []
+
+        # Search
+        await self.call(
+            "GET /users/search", "GET", "/users/search",
+            params={"query": "Load", "current_user_id": tg},
+        )
+
+        if not friends:
+            return
+
+        # Open a friend's profile and book/unbook one of their wishes
+        friend_tg = self._rng.choice(friends)["telegram_id"]
+        await self.call(
+            "GET /users/telegram/{telegram_id}", "GET", f"/users/telegram/{friend_tg}",
+            params={"current_user_id": tg},
+        )
+        response = await self.call(
+            "GET /wishlists/user/telegram/{telegram_id}", "GET", f"/wishlists/user/telegram/{friend_tg}",
+        )
+        if response is None or response.status_code != 200:
+            return
+        wishlists = response.json()["wishlists"]
+        if not wishlists:
+            return
+        response = await self.call(
+            "GET /wishes", "GET", "/wishes",
+            params={"wishlist_id": wishlists[0]["id"], "viewer_telegram_id": tg},
+        )
+        if response is None or response.status_code != 200:
+            return
+        free = [w for w in response.json() if not w["is_booked"]]
+        if not free:
+            return
+        wish_id = self._rng.choice(free)["id"]
+        # 409 means another session booked it first, which is expected under load
+        booked = await self.call(
+            "POST /wishes/{wish_id}/book", "POST", f"/wishes/{wish_id}/book",
+            expected=(200, 409), params={"telegram_id": tg},
+        )
+        if booked is not None and booked.status_code == 200:
+            await self.call(
+                "DELETE /wishes/{wish_id}/book", "DELETE", f"/wishes/{wish_id}/book",
+                params={"telegram_id": tg},
+            )
+
+    async def run(self, rate: float, concurrency: int, duration: float) -> dict[str, Any]:
+        """Start sessions as a Poisson process for `duration` seconds."""
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: list[asyncio.Task] = []
+        dropped = 0
+        sessions_done = 0
+
+        async def run_session() -> None:
+            nonlocal sessions_done
+            try:
+                await self.session()
+            finally:
+                sessions_done += 1
+                semaphore.release()
+
+        self._stats.clear()
+        started = time.perf_counter()
+        deadline = started + duration
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self._rng.expovariate(rate))
+            if semaphore.locked():
+                # Open model: arrivals beyond the concurrency cap are counted, not queued
+                dropped += 1
+                continue
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(run_session()))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        total_requests = sum(len(s.latencies) for s in self._stats.values())
+        total_errors = sum(s.errors for s in self._stats.values())
+        return {
+            "config": {"rate": rate, "concurrency": concurrency, "duration": duration},
+            "elapsed_s": round(elapsed, 2),
+            "sessions": sessions_done,
+            "sessions_dropped": dropped,
+            "requests": total_requests,
+            "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+            "endpoints": {name: stats.summary() for name, stats in sorted(self._stats.items())},
+        }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay Mini App flows against the backend")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=100, help="Users to register during setup")
+    parser.add_argument("--telegram-id-base", type=int, default=9_000_000_000,
+                        help="First Telegram ID used for load-test users")
+    parser.add_argument("--wishes-per-user", type=int, default=5)
+    parser.add_argument("--friends-per-user", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=10.0, help="Session arrivals per second")
+    parser.add_argument("--concurrency", type=int, default=50, help="Max concurrent sessions")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run length in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-setup", action="store_true",
+                        help="Reuse users from a previous run (same --users/--telegram-id-base)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits,
+    ) as client:
+        test = LoadTest(client, rng)
+        if args.skip_setup:
+            test.users = [
+                SeededUser(telegram_id=args.telegram_id_base + i, first_name=f"Load{args.telegram_id_base + i}")
+                for i in range(args.users)
+            ]
+        else:
+            print(f"Seeding {args.users} users...", file=sys.stderr)
+            await test.setup(
+                args.users, args.telegram_id_base, args.wishes_per_user,
+                args.friends_per_user, args.concurrency,
+            )
+        print(f"Running for {args.duration:.0f}s at {args.rate}/s...", file=sys.stderr)
+        report = await test.run(args.rate, args.concurrency, args.duration)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Run the hot read routes with the SQL profiler in strict mode.
+
+Usage (from backend/):
+    python -m scripts.query_budget_check --friends 12
+
+Needs a migrated database at DATABASE_URL. Registers a user following
+--friends users (more than N_PLUS_ONE_THRESHOLD, so a per-friend query
+shows up as a loop), each with a couple of wishes, then calls the routes
+the Mini App hits on every screen. In strict mode a route that exceeds
+its query_budget, or repeats one statement with different parameters,
+raises, and the check fails. The entity cache is off, so every count is
+the cold-cache worst case.
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Optional
+
+os.environ.update(
+    SQL_PROFILER_ENABLED="true",
+    SQL_PROFILER_STRICT="true",
+    CACHE_ENABLED="false",
+    METRICS_ENABLED="false",
+    LIVE_UPDATES_ENABLED="false",
+    OUTBOX_RELAY_ENABLED="false",
+    LINK_ENRICHMENT_ENABLED="false",
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from scripts.loadtest import API_PREFIX  # noqa: E402
+from src.main import app  # noqa: E402
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def _seed(client: TestClient, telegram_id: int, friends: int) -> str:
+    """Create the viewer and their friends; returns a friend's wishlist ID."""
+    wishlist_id = ""
+    for offset in range(friends + 1):
+        user_id = telegram_id + offset
+        client.post(f"{API_PREFIX}/users/register", json={
+            "telegram_id": user_id, "username": f"budget{user_id}", "first_name": f"Budget{offset}",
+        }).raise_for_status()
+        if offset == 0:
+            continue
+        wishlists = client.get(f"{API_PREFIX}/wishlists/user/telegram/{user_id}").json()["wishlists"]
+        wishlist_id = wishlists[0]["id"]
+        if not client.get(f"{API_PREFIX}/wishes", params={"wishlist_id": wishlist_id}).json():
+            for i in range(2):
+                client.post(f"{API_PREFIX}/wishes", params={"telegram_id": user_id}, json={
+                    "wishlist_id": wishlist_id, "title": f"Budget gift {i}", "link": f"https://shop{i}.example.com/p",
+                }).raise_for_status()
+        client.post(f"{API_PREFIX}/users/{user_id}/subscribe", params={"current_user_id": telegram_id})
+    return wishlist_id
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check query budgets of hot routes in strict mode")
+    parser.add_argument("--telegram-id", type=int, default=8_800_000_000)
+    parser.add_argument("--friends", type=int, default=12)
+    args = parser.parse_args(argv)
+    viewer = args.telegram_id
+
+    failures = 0
+    with TestClient(app) as client:
+        wishlist_id = _seed(client, viewer, args.friends)
+        routes = [
+            ("/users/friends", {"telegram_id": viewer}),
+            ("/users/search", {"query": "Budget", "current_user_id": viewer}),
+            ("/wishes", {"wishlist_id": wishlist_id, "viewer_telegram_id": viewer}),
+            ("/wishes/search", {"telegram_id": viewer, "q": "gift"}),
+            ("/users/friends/top-stores", {"telegram_id": viewer}),
+            (f"/wishlists/user/telegram/{viewer}", {}),
+            (f"/users/telegram/{viewer}", {}),
+        ]
+        for path, params in routes:
+            try:
+                response = client.get(API_PREFIX + path, params=params)
+            except Exception as e:
+                failures += 1
+                print(f"FAIL {path}: {type(e).__name__}: {e}")
+                continue
+            match = _QUERIES.search(response.headers.get("server-timing", ""))
+            queries = match.group(1) if match else "?"
+            ok = response.status_code == 200
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {path}: {response.status_code}, {queries} queries")
+
+    print("OK" if not failures else f"FAILED: {failures} route(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Check the link scraper against a local stand-in store.
+
+Usage (from backend/):
+    python -m scripts.scraper_check
+
+Serves product pages from an in-process HTTP server on 127.0.0.1 and
+reaches it under two host names, 127.0.0.1 and localhost, which the scraper
+treats as two stores. It checks OpenGraph and JSON-LD parsing (including a
+windows-1251 page), redirects, error pages, the per-store and global
+download limits, the URL cache and the private address guard, then prints
+a summary. No database is needed.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+from collections import Counter
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, PlainTextResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+from src.infrastructure.link_metadata import LinkMetadata
+from src.infrastructure.scraper import LinkScraper
+
+OG_PAGE = """<!doctype html><html><head>
+<title>Fallback title</title>
+<meta property="og:title" content="Наушники Sony WH-1000XM5">
+<meta property="og:description" content="Беспроводные наушники &amp; шумоподавление">
+<meta property="og:image" content="/images/{item}.jpg">
+<meta property="product:price:amount" content="29 990">
+<meta property="product:price:currency" content="RUB">
+</head><body>{filler}</body></html>"""
+
+JSON_LD_PAGE = """<html><head><meta charset="windows-1251"><title>Кофемашина</title>
+<script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+  {"@type": "BreadcrumbList"},
+  {"@type": "Product", "name": "Кофемашина DeLonghi", "image": ["https://cdn.example.com/c.jpg"],
+   "offers": {"@type": "Offer", "price": "1 299,00", "priceCurrency": "RUR"}}]}
+</script></head><body></body></html>"""
+
+
+class StandInStore:
+    """Records requests and in-flight downloads per host."""
+
+    def __init__(self, slow_seconds: float):
+        self.slow_seconds = slow_seconds
+        self.hits: Counter[str] = Counter()
+        self.in_flight: Counter[str] = Counter()
+        self.max_in_flight: Counter[str] = Counter()
+        self.max_total = 0
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/og/{item}", self.og),
+            Route("/jsonld", self.json_ld),
+            Route("/slow/{item}", self.slow),
+            Route("/redirect", self.redirect),
+            Route("/missing", self.missing),
+            Route("/image", self.image),
+        ])
+
+    def _hit(self, request: Request) -> str:
+        host = request.headers["host"].split(":")[0]
+        self.hits[request.url.path] += 1
+        return host
+
+    async def og(self, request: Request) -> Response:
+        self._hit(request)
+        return HTMLResponse(OG_PAGE.format(item=request.path_params["item"], filler=""))
+
+    async def json_ld(self, request: Request) -> Response:
+        self._hit(request)
+        # Charset only in the page itself, as many older stores do
+        return Response(JSON_LD_PAGE.encode("windows-1251"), headers={"content-type": "text/html"})
+
+    async def slow(self, request: Request) -> Response:
+        host = self._hit(request)
+        self.in_flight[host] += 1
+        self.max_in_flight[host] = max(self.max_in_flight[host], self.in_flight[host])
+        self.max_total = max(self.max_total, sum(self.in_flight.values()))
+        try:
+            await asyncio.sleep(self.slow_seconds)
+        finally:
+            self.in_flight[host] -= 1
+        return HTMLResponse(OG_PAGE.format(item=request.path_params["item"], filler="x" * 50_000))
+
+    async def redirect(self, request: Request) -> Response:
+        self._hit(request)
+        return RedirectResponse("/og/redirected", status_code=302)
+
+    async def missing(self, request: Request) -> Response:
+        self._hit(request)
+        return PlainTextResponse("not found", status_code=404)
+
+    async def image(self, request: Request) -> Response:
+        self._hit(request)
+        return Response(b"\x89PNG", media_type="image/png")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _check(condition: bool, message: str, failures: list[str]) -> None:
+    if not condition:
+        failures.append(message)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check the link scraper against a stand-in store")
+    parser.add_argument("--pages", type=int, default=8, help="Slow pages requested per host")
+    parser.add_argument("--per-domain", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--slow", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    store = StandInStore(args.slow)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(store.app(), host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    scraper = LinkScraper(
+        max_concurrency=args.concurrency,
+        per_domain_concurrency=args.per_domain,
+        timeout=5.0,
+        max_bytes=200_000,
+        parse_processes=2,
+        cache_size=100,
+        cache_ttl=60.0,
+        allow_private_hosts=True,
+    )
+    guarded = LinkScraper(
+        max_concurrency=1,
+        per_domain_concurrency=1,
+        timeout=5.0,
+        max_bytes=200_000,
+        parse_processes=1,
+        cache_size=10,
+        cache_ttl=60.0,
+    )
+    failures: list[str] = []
+    base = f"http://127.0.0.1:{port}"
+    other = f"http://localhost:{port}"
+    try:
+        og = await scraper.get_metadata(f"{base}/og/headphones?utm_source=tg")
+        _check(og == LinkMetadata(
+            title="Наушники Sony WH-1000XM5",
+            description="Беспроводные наушники & шумоподавление",
+            image_url=f"{base}/images/headphones.jpg",
+            price=29990.0,
+            currency="RUB",
+        ), f"OpenGraph page parsed as {og}", failures)
+
+        # Same page behind a different tracking parameter and a fragment: cached
+        await scraper.get_metadata(f"{base}/og/headphones?utm_source=vk#reviews")
+        _check(store.hits["/og/headphones"] == 1, "Normalized URL was fetched twice", failures)
+
+        json_ld = await scraper.get_metadata(f"{base}/jsonld")
+        _check(json_ld is not None and json_ld.title == "Кофемашина DeLonghi"
+               and json_ld.price == 1299.0 and json_ld.currency == "RUB"
+               and json_ld.image_url == "https://cdn.example.com/c.jpg",
+               f"JSON-LD page parsed as {json_ld}", failures)
+
+        redirected = await scraper.get_metadata(f"{base}/redirect")
+        _check(redirected is not None and redirected.image_url == f"{base}/images/redirected.jpg",
+               f"Redirect resolved to {redirected}", failures)
+
+        _check(await scraper.get_metadata(f"{base}/missing") is None, "404 page returned metadata", failures)
+        _check(await scraper.get_metadata(f"{base}/image") is None, "Image returned metadata", failures)
+
+        # Concurrent callers of one URL share a download
+        await asyncio.gather(*(scraper.get_metadata(f"{other}/og/shared") for _ in range(10)))
+        _check(store.hits["/og/shared"] == 1, "Concurrent requests were not coalesced", failures)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        urls = [f"{host}/slow/{index}" for index in range(args.pages) for host in (base, other)]
+        results = await asyncio.gather(*(scraper.get_metadata(url) for url in urls))
+        elapsed = loop.time() - started
+        _check(all(result is not None for result in results), "Slow pages failed", failures)
+        _check(max(store.max_in_flight.values()) <= args.per_domain, "Per-store limit exceeded", failures)
+        _check(store.max_total <= args.concurrency, "Global limit exceeded", failures)
+
+        hits_before = sum(store.hits.values())
+        _check(await guarded.get_metadata(f"{base}/og/private") is None, "Private host was fetched", failures)
+        _check(sum(store.hits.values()) == hits_before, "Guarded scraper reached the store", failures)
+    finally:
+        await scraper.close()
+        await guarded.close()
+        server.should_exit = True
+        await serving
+
+    print(json.dumps({
+        "requests_per_path": dict(store.hits),
+        "max_in_flight_per_host": dict(store.max_in_flight),
+        "max_in_flight_total": store.max_total,
+        "slow_pages": len(urls),
+        "slow_pages_seconds": round(elapsed, 2),
+        "failures": failures,
+    }, indent=2, ensure_ascii=False))
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
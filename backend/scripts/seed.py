@@ -0,0 +1,313 @@
+"""
+High-volume synthetic data seeder.
+
+Generates users, a power-law subscription graph, wishlists with event dates
+and wishes with prices and bookings, and loads them with asyncpg
+copy_records_to_table from several processes at once.
+
+Usage (from backend/, against a migrated database):
+    python -m scripts.seed --users 1000000 --wishes 10000000 --streams 8
+
+Output is fully determined by --seed. IDs are derived from row indexes,
+and every fixed-size chunk of rows gets its own RNG, so the result does
+not depend on --streams or on scheduling order. Tables are loaded parent
+first (users, user_friends, wishlists, wishes), so foreign keys stay
+enforced during the load.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+import asyncpg
+
+from src.config import get_settings
+
+CHUNK_SIZE = 50_000
+
+# High bits of generated UUIDs, one per table
+_USER_NS = 0x1
+_WISHLIST_NS = 0x2
+_WISH_NS = 0x3
+
+FIRST_NAMES = ["Анна", "Иван", "Мария", "Дмитрий", "Елена", "Алексей", "Ольга", "Сергей", "Kate", "Alex"]
+LAST_NAMES = ["Иванова", "Петров", "Смирнова", "Кузнецов", "Попова", "Волков", None, None]
+WISHLIST_TITLES = [("День рождения", "🎂"), ("Новый год", "🎄"), ("Свадьба", "💍"), ("Путешествие", "✈️")]
+GIFTS = [
+    "Наушники", "Книга", "Кофемашина", "Рюкзак", "Кроссовки", "Настольная игра",
+    "Сертификат в спа", "Фотоаппарат", "Умные часы", "Плед", "Электросамокат", "Парфюм",
+]
+ADJECTIVES = ["новые", "беспроводные", "красивые", "уютные", "большие", "подарочные", "premium"]
+STORES = ["ozon.ru", "www.wildberries.ru", "market.yandex.ru", "www.amazon.com", "shop.nike.com", "m.lamoda.ru"]
+CURRENCIES = ["RUB"] * 8 + ["USD", "EUR"]
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """Dataset shape shared with worker processes."""
+
+    seed: int
+    users: int
+    wishlists_per_user: int
+    wishes: int
+    avg_friends: float
+    friend_alpha: float
+    booked_ratio: float
+    telegram_id_base: int
+    now: datetime
+
+
+def _uuid(namespace: int, seed: int, index: int) -> uuid.UUID:
+    """Deterministic ID: table namespace, seed and row index."""
+    return uuid.UUID(int=(namespace << 124) | ((seed & 0xFFFFFFFF) << 64) | index)
+
+
+def user_id(cfg: SeedConfig, index: int) -> uuid.UUID:
+    return _uuid(_USER_NS, cfg.seed, index)
+
+
+def wishlist_id(cfg: SeedConfig, index: int) -> uuid.UUID:
+    return _uuid(_WISHLIST_NS, cfg.seed, index)
+
+
+def _chunk_rng(cfg: SeedConfig, table: str, chunk: int) -> random.Random:
+    return random.Random(f"{cfg.seed}:{table}:{chunk}")
+
+
+def _popular_user(cfg: SeedConfig, rng: random.Random) -> int:
+    """Pick a user index with a power-law bias towards low indexes."""
+    return min(cfg.users - 1, int(cfg.users * rng.random() ** cfg.friend_alpha))
+
+
+def _created_at(cfg: SeedConfig, rng: random.Random) -> datetime:
+    return cfg.now - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+
+
+# -- row generators ----------------------------------------------------------
+
+USER_COLUMNS = [
+    "id", "telegram_id", "username", "first_name", "last_name", "avatar_url",
+    "profile_text", "birth_date", "created_at", "updated_at",
+]
+
+
+def gen_users(cfg: SeedConfig, chunk: int, start: int, stop: int) -> Iterator[tuple]:
+    rng = _chunk_rng(cfg, "users", chunk)
+    for i in range(start, stop):
+        created = _created_at(cfg, rng)
+        birth_date: Optional[date] = None
+        if rng.random() < 0.9:
+            birth_date = date(1960, 1, 1) + timedelta(days=rng.randrange(50 * 365))
+        yield (
+            user_id(cfg, i),
+            cfg.telegram_id_base + i,
+            f"user{i}" if rng.random() < 0.8 else None,
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            None,
+            "Saving for a dream ✨",
+            birth_date,
+            created,
+            created,
+        )
+
+
+FRIEND_COLUMNS = ["user_id", "friend_id"]
+
+
+def gen_friends(cfg: SeedConfig, chunk: int, start: int, stop: int) -> Iterator[tuple]:
+    rng = _chunk_rng(cfg, "user_friends", chunk)
+    # Out-degree follows a Pareto distribution with the requested mean
+    shape = 2.0
+    scale = cfg.avg_friends * (shape - 1) / shape
+    for i in range(start, stop):
+        degree = min(cfg.users - 1, int(scale * rng.paretovariate(shape)))
+        targets: set[int] = set()
+        attempts = 0
+        while len(targets) < degree and attempts < degree * 3:
+            attempts += 1
+            target = _popular_user(cfg, rng)
+            if target != i:
+                targets.add(target)
+        source = user_id(cfg, i)
+        for target in sorted(targets):
+            yield (source, user_id(cfg, target))
+
+
+WISHLIST_COLUMNS = [
+    "id", "user_id", "title", "description", "is_public", "is_default",
+    "emoji", "event_date", "created_at", "updated_at",
+]
+
+
+def gen_wishlists(cfg: SeedConfig, chunk: int, start: int, stop: int) -> Iterator[tuple]:
+    """Wishlist index w belongs to user w // wishlists_per_user; slot 0 is the default."""
+    rng = _chunk_rng(cfg, "wishlists", chunk)
+    per_user = cfg.wishlists_per_user
+    for w in range(start, stop):
+        owner, slot = divmod(w, per_user)
+        created = _created_at(cfg, rng)
+        if slot == 0:
+            yield (
+                wishlist_id(cfg, w), user_id(cfg, owner), "Мои желания",
+                "Мой основной список желаний", True, True, None, None, created, created,
+            )
+            continue
+        title, emoji = rng.choice(WISHLIST_TITLES)
+        event_date = cfg.now + timedelta(days=rng.randrange(-60, 365))
+        yield (
+            wishlist_id(cfg, w), user_id(cfg, owner), title, None,
+            rng.random() < 0.85, False, emoji, event_date, created, created,
+        )
+
+
+WISH_COLUMNS = [
+    "id", "wishlist_id", "title", "subtitle", "description", "link", "image_url",
+    "price", "currency", "is_booked", "booked_by_user_id", "priority",
+    "created_at", "updated_at",
+]
+
+
+def gen_wishes(cfg: SeedConfig, chunk: int, start: int, stop: int) -> Iterator[tuple]:
+    rng = _chunk_rng(cfg, "wishes", chunk)
+    total_wishlists = cfg.users * cfg.wishlists_per_user
+    for j in range(start, stop):
+        w = rng.randrange(total_wishlists)
+        owner = w // cfg.wishlists_per_user
+        gift = rng.choice(GIFTS)
+        store = rng.choice(STORES)
+        booked = rng.random() < cfg.booked_ratio and cfg.users > 1
+        booker = None
+        if booked:
+            booker_index = rng.randrange(cfg.users - 1)
+            booker = user_id(cfg, booker_index if booker_index < owner else booker_index + 1)
+        created = _created_at(cfg, rng)
+        yield (
+            _uuid(_WISH_NS, cfg.seed, j),
+            wishlist_id(cfg, w),
+            f"{gift} {rng.choice(ADJECTIVES)}",
+            rng.choice(ADJECTIVES) if rng.random() < 0.3 else None,
+            f"Очень хочу {gift.lower()}" if rng.random() < 0.5 else None,
+            f"https://{store}/product/{rng.randrange(10**8)}" if rng.random() < 0.7 else None,
+            f"https://img.example.com/{j}.jpg" if rng.random() < 0.6 else None,
+            round(math.exp(rng.gauss(8.0, 1.2)), 2) if rng.random() < 0.9 else None,
+            rng.choice(CURRENCIES),
+            booked,
+            booker,
+            "really_want" if rng.random() < 0.25 else "just_want",
+            created,
+            created,
+        )
+
+
+TABLES = {
+    "users": (gen_users, USER_COLUMNS),
+    "user_friends": (gen_friends, FRIEND_COLUMNS),
+    "wishlists": (gen_wishlists, WISHLIST_COLUMNS),
+    "wishes": (gen_wishes, WISH_COLUMNS),
+}
+
+
+# -- loading -----------------------------------------------------------------
+
+def _dsn() -> str:
+    return get_settings().database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def _copy_chunk(dsn: str, cfg: SeedConfig, table: str, chunk: int, start: int, stop: int) -> int:
+    generator, columns = TABLES[table]
+    records = list(generator(cfg, chunk, start, stop))
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.copy_records_to_table(table, records=records, columns=columns)
+    finally:
+        await conn.close()
+    return len(records)
+
+
+def load_chunk(dsn: str, cfg: SeedConfig, table: str, chunk: int, start: int, stop: int) -> int:
+    """Generate and COPY one chunk (runs in a worker process)."""
+    return asyncio.run(_copy_chunk(dsn, cfg, table, chunk, start, stop))
+
+
+def load_table(pool: ProcessPoolExecutor, dsn: str, cfg: SeedConfig, table: str, rows: int) -> None:
+    """Load a table in fixed-size chunks across the worker processes."""
+    started = time.perf_counter()
+    futures = [
+        pool.submit(load_chunk, dsn, cfg, table, chunk, start, min(start + CHUNK_SIZE, rows))
+        for chunk, start in enumerate(range(0, rows, CHUNK_SIZE))
+    ]
+    loaded = sum(f.result() for f in futures)
+    elapsed = time.perf_counter() - started
+    print(f"{table}: {loaded:,} rows in {elapsed:.1f}s ({loaded / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+async def _prepare(dsn: str, truncate: bool) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        if truncate:
+            await conn.execute("TRUNCATE wishes, wishlists, user_friends, users")
+    finally:
+        await conn.close()
+
+
+async def _analyze(dsn: str) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("ANALYZE users, user_friends, wishlists, wishes")
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic data via COPY")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--wishlists-per-user", type=int, default=3)
+    parser.add_argument("--wishes", type=int, default=1_000_000)
+    parser.add_argument("--avg-friends", type=float, default=20.0)
+    parser.add_argument("--friend-alpha", type=float, default=3.0,
+                        help="Popularity skew of subscription targets (1 = uniform)")
+    parser.add_argument("--booked-ratio", type=float, default=0.15)
+    parser.add_argument("--telegram-id-base", type=int, default=1_000_000_000)
+    parser.add_argument("--streams", type=int, default=8, help="Parallel COPY processes")
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    cfg = SeedConfig(
+        seed=args.seed,
+        users=args.users,
+        wishlists_per_user=max(1, args.wishlists_per_user),
+        wishes=args.wishes,
+        avg_friends=args.avg_friends,
+        friend_alpha=args.friend_alpha,
+        booked_ratio=args.booked_ratio,
+        telegram_id_base=args.telegram_id_base,
+        # Fixed reference time keeps runs reproducible
+        now=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    dsn = _dsn()
+    asyncio.run(_prepare(dsn, args.truncate))
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.streams) as pool:
+        load_table(pool, dsn, cfg, "users", cfg.users)
+        load_table(pool, dsn, cfg, "user_friends", cfg.users)
+        load_table(pool, dsn, cfg, "wishlists", cfg.users * cfg.wishlists_per_user)
+        load_table(pool, dsn, cfg, "wishes", cfg.wishes)
+    asyncio.run(_analyze(dsn))
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Check that the production server stops promptly with live streams open.
+
+Usage (from backend/):
+    python -m scripts.shutdown_check --streams 20 --workers 2
+
+Starts `python -m src.server` on --port against DATABASE_URL, registers
+a user, opens --streams SSE streams on their default wishlist, sends
+SIGTERM and times how long the server takes to exit. Open streams must
+end right away rather than holding the shutdown for SHUTDOWN_TIMEOUT.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from scripts.loadtest import API_PREFIX
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+async def _open_stream(client: httpx.AsyncClient, url: str, opened: asyncio.Queue) -> str:
+    try:
+        async with client.stream("GET", url) as response:
+            await opened.put(response.status_code)
+            async for _ in response.aiter_raw():
+                pass
+        return "closed"
+    except httpx.HTTPError as e:
+        return type(e).__name__
+
+
+async def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time server shutdown with open SSE streams")
+    parser.add_argument("--port", type=int, default=8190)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--telegram-id", type=int, default=8_900_000_001)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    env = dict(
+        os.environ, PORT=str(args.port), WEB_CONCURRENCY=str(args.workers),
+        LIVE_UPDATES_ENABLED="true", METRICS_ENABLED="false",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+            for _ in range(100):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+
+            await client.post(f"{API_PREFIX}/users/register", json={
+                "telegram_id": args.telegram_id, "first_name": "Shutdown",
+            })
+            response = await client.get(f"{API_PREFIX}/wishlists/user/telegram/{args.telegram_id}")
+            response.raise_for_status()
+            wishlist_id = response.json()["wishlists"][0]["id"]
+
+            opened: asyncio.Queue[int] = asyncio.Queue()
+            streams = [
+                asyncio.create_task(_open_stream(client, f"{API_PREFIX}/wishlists/{wishlist_id}/stream", opened))
+                for _ in range(args.streams)
+            ]
+            statuses = [await opened.get() for _ in range(args.streams)]
+            print(f"{statuses.count(200)}/{args.streams} streams open")
+
+            started = time.perf_counter()
+            server.send_signal(signal.SIGTERM)
+            await asyncio.to_thread(server.wait)
+            elapsed = time.perf_counter() - started
+            results = await asyncio.gather(*streams)
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+    print(f"server exited {elapsed:.2f}s after SIGTERM; streams: {dict(Counter(results))}")
+    ok = elapsed <= args.max_seconds
+    print("OK" if ok else f"FAILED: slower than {args.max_seconds:.0f}s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,107 @@
+"""
+Memory and fan-out cost of idle live-update streams in one worker.
+
+Usage (from backend/):
+    python -m scripts.sse_bench --subscribers 10000 --wishlists 500
+
+Opens --subscribers hub subscriptions spread over --wishlists wishlists,
+each drained by its own task iterating WishlistHub.stream() the way a
+StreamingResponse does, and reports the memory they hold while idle. It
+then times one heartbeat round to every stream and one wish change
+broadcast to the busiest wishlist. Socket and HTTP parser buffers are
+not included; no database is needed.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import resource
+import time
+import tracemalloc
+from typing import Optional
+from uuid import uuid4
+
+from src.services.live_updates import WishlistHub
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark idle SSE subscribers")
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--wishlists", type=int, default=500)
+    parser.add_argument("--buffer", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    hub = WishlistHub(buffer_size=args.buffer, heartbeat_interval=3600, max_subscribers=args.subscribers)
+    wishlist_ids = [uuid4() for _ in range(args.wishlists)]
+    done = asyncio.Event()
+    expected = 0
+    total = 0
+
+    async def consume(stream) -> None:
+        nonlocal total
+        async for _ in stream:
+            total += 1
+            if total >= expected:
+                done.set()
+
+    gc.collect()
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    tasks = []
+    for index in range(args.subscribers):
+        subscription = hub.subscribe(wishlist_ids[index % args.wishlists], None)
+        tasks.append(asyncio.create_task(consume(hub.stream(subscription))))
+    # Let every stream send its retry line and park on its waiter
+    expected = args.subscribers
+    await done.wait()
+    gc.collect()
+    idle, _ = tracemalloc.get_traced_memory()
+    per_subscriber = (idle - before) / args.subscribers
+
+    # One keep-alive to every stream
+    done.clear()
+    expected = total + args.subscribers
+    started = time.perf_counter()
+    for wishlist_id in wishlist_ids:
+        hub.broadcast(wishlist_id, ": ping\n\n")
+    await done.wait()
+    heartbeat_ms = (time.perf_counter() - started) * 1000
+
+    # One wish change to a single wishlist's viewers
+    target = wishlist_ids[0]
+    viewers = len(range(0, args.subscribers, args.wishlists))
+    message = "event: wish\ndata: " + json.dumps({"type": "booked", "wish": {"id": str(uuid4())}}) + "\n\n"
+    done.clear()
+    expected = total + viewers
+    started = time.perf_counter()
+    hub.broadcast(target, message)
+    await done.wait()
+    broadcast_ms = (time.perf_counter() - started) * 1000
+
+    tracemalloc.stop()
+    await hub.close()
+    await asyncio.gather(*tasks)
+
+    print(json.dumps({
+        "subscribers": args.subscribers,
+        "wishlists": args.wishlists,
+        "idle_bytes_per_subscriber": round(per_subscriber),
+        "idle_total_mb": round((idle - before) / 1024 / 1024, 1),
+        "process_rss_growth_mb": round(_rss_mb() - rss_before, 1),
+        "heartbeat_round_ms": round(heartbeat_ms, 1),
+        "broadcast_viewers": viewers,
+        "broadcast_ms": round(broadcast_ms, 2),
+        "open_after_close": hub.subscriber_count,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
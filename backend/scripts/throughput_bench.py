@@ -0,0 +1,120 @@
+"""
+Closed-loop throughput benchmark of one read endpoint.
+
+Usage (from backend/):
+    python -m scripts.throughput_bench --base-url http://localhost:8000 \\
+        --concurrency 64 --duration 20 --client-processes 4
+
+Registers one user with --wishes wishes, then keeps --concurrency requests
+in flight against GET /wishes?wishlist_id=<their wishlist> (or --path,
+where {wishlist_id} and {telegram_id} are filled in) for --duration
+seconds and prints requests per second and latency percentiles as JSON.
+The load is split over --client-processes processes so that the client
+is not the bottleneck when the server runs several workers; compare the
+reported rps before and after a change, or across WEB_CONCURRENCY values.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from typing import Any, Optional
+
+import httpx
+
+from scripts.loadtest import API_PREFIX, _percentile
+
+
+async def _seed(base_url: str, telegram_id: int, wishes: int) -> str:
+    """Register the benchmark user and fill their default wishlist."""
+    async with httpx.AsyncClient(base_url=base_url + API_PREFIX, timeout=30) as client:
+        response = await client.post("/users/register", json={
+            "telegram_id": telegram_id, "username": f"bench{telegram_id}", "first_name": "Bench",
+        })
+        response.raise_for_status()
+        response = await client.get(f"/wishlists/user/telegram/{telegram_id}")
+        response.raise_for_status()
+        wishlist_id = response.json()["wishlists"][0]["id"]
+
+        response = await client.get("/wishes", params={"wishlist_id": wishlist_id})
+        response.raise_for_status()
+        for i in range(len(response.json()), wishes):
+            response = await client.post("/wishes", params={"telegram_id": telegram_id}, json={
+                "wishlist_id": wishlist_id, "title": f"Bench gift {i}", "price": 1000 + i,
+            })
+            response.raise_for_status()
+        return wishlist_id
+
+
+async def _drive(url: str, concurrency: int, duration: float) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def _drive_process(url: str, concurrency: int, duration: float) -> dict[str, Any]:
+    return asyncio.run(_drive(url, concurrency, duration))
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark requests per second on one endpoint")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/wishes?wishlist_id={wishlist_id}")
+    parser.add_argument("--telegram-id", type=int, default=8_900_000_001)
+    parser.add_argument("--wishes", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight in total")
+    parser.add_argument("--client-processes", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    wishlist_id = await _seed(args.base_url, args.telegram_id, args.wishes)
+    url = args.base_url + API_PREFIX + args.path.format(
+        wishlist_id=wishlist_id, telegram_id=args.telegram_id
+    )
+    await _drive(url, min(args.concurrency, 8), args.warmup)
+
+    processes = max(1, args.client_processes)
+    per_process = max(1, args.concurrency // processes)
+    print(f"GET {url}: {processes}x{per_process} in flight for {args.duration:.0f}s...", file=sys.stderr)
+    if processes == 1:
+        results = [await _drive(url, per_process, args.duration)]
+    else:
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            results = await asyncio.to_thread(
+                pool.starmap, _drive_process, [(url, per_process, args.duration)] * processes
+            )
+
+    latencies = sorted(sample for result in results for sample in result["latencies"])
+    errors = sum(result["errors"] for result in results)
+    print(json.dumps({
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,13 +2,23 @@
 FastAPI dependency injection.
 """
 
+import hashlib
+import hmac
+import time
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.infrastructure.database import get_session
-from src.repositories import UserRepository, WishlistRepository
+from src.config import get_settings
+from src.infrastructure.database import get_read_session, get_session
+from src.repositories import (
+    BotNotificationRepository,
+    OutboxRepository,
+    UserRepository,
+    WishlistRepository,
+    WishRepository,
+)
 from src.services import UserService, WishlistService
 
 
@@ -19,11 +29,11 @@ async def get_user_repository(
     return UserRepository(session)
 
 
-async def get_user_service(
-    repository: Annotated[UserRepository, Depends(get_user_repository)]
-) -> UserService:
-    """Dependency for UserService."""
-    return UserService(repository)
+async def get_outbox_repository(
+    session: Annotated[AsyncSession, Depends(get_session)]
+) -> OutboxRepository:
+    """Dependency for OutboxRepository, sharing the request's write session."""
+    return OutboxRepository(session)
 
 
 async def get_wishlist_repository(
@@ -33,13 +43,121 @@ async def get_wishlist_repository(
     return WishlistRepository(session)
 
 
+async def get_wish_repository(
+    session: Annotated[AsyncSession, Depends(get_session)]
+) -> WishRepository:
+    """Dependency for WishRepository."""
+    return WishRepository(session)
+
+
+async def get_user_service(
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+    outbox_repository: Annotated[OutboxRepository, Depends(get_outbox_repository)],
+    wishlist_repository: Annotated[WishlistRepository, Depends(get_wishlist_repository)],
+) -> UserService:
+    """Dependency for UserService."""
+    return UserService(repository, outbox_repository, wishlist_repository)
+
+
 async def get_wishlist_service(
-    repository: Annotated[WishlistRepository, Depends(get_wishlist_repository)]
+    repository: Annotated[WishlistRepository, Depends(get_wishlist_repository)],
+    wish_repository: Annotated[WishRepository, Depends(get_wish_repository)],
+    outbox_repository: Annotated[OutboxRepository, Depends(get_outbox_repository)],
 ) -> WishlistService:
     """Dependency for WishlistService."""
+    return WishlistService(repository, wish_repository, outbox_repository)
+
+
+async def get_bot_notification_repository(
+    session: Annotated[AsyncSession, Depends(get_session)]
+) -> BotNotificationRepository:
+    """Dependency for BotNotificationRepository."""
+    return BotNotificationRepository(session)
+
+
+async def get_read_user_repository(
+    session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> UserRepository:
+    """Dependency for UserRepository on the read session."""
+    return UserRepository(session)
+
+
+async def get_read_user_service(
+    repository: Annotated[UserRepository, Depends(get_read_user_repository)]
+) -> UserService:
+    """Dependency for UserService on the read session."""
+    return UserService(repository)
+
+
+async def get_read_wishlist_repository(
+    session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> WishlistRepository:
+    """Dependency for WishlistRepository on the read session."""
+    return WishlistRepository(session)
+
+
+async def get_read_wishlist_service(
+    repository: Annotated[WishlistRepository, Depends(get_read_wishlist_repository)]
+) -> WishlistService:
+    """Dependency for WishlistService on the read session."""
     return WishlistService(repository)
 
 
+# Seconds a bot request signature stays valid, allowing for clock skew and retries
+BOT_SIGNATURE_MAX_AGE = 300
+
+
+def bot_signature(key: bytes, timestamp: str, method: str, target: bytes, body: bytes) -> str:
+    """HMAC-SHA256 of a request as signed by the bot; target is the raw path and query."""
+    message = b"\n".join([
+        timestamp.encode("ascii"),
+        method.encode("ascii"),
+        target,
+        hashlib.sha256(body).hexdigest().encode("ascii"),
+    ])
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+async def require_bot_signature(
+    request: Request,
+    signature: Annotated[str, Header(alias="X-Bot-Signature")] = "",
+    timestamp: Annotated[str, Header(alias="X-Bot-Timestamp")] = "0",
+) -> None:
+    """
+    Dependency for internal routes only the bot may call.
+
+    The bot signs the timestamp, method, path with query and a digest of
+    the body with BOT_API_SECRET (or the bot token).
+    """
+    settings = get_settings()
+    key = (settings.bot_api_secret or settings.telegram_bot_token).encode("utf-8")
+    try:
+        age = abs(time.time() - int(timestamp))
+    except ValueError:
+        age = float("inf")
+    target = request.scope.get("raw_path") or request.url.path.encode("utf-8")
+    if request.scope.get("query_string"):
+        target += b"?" + request.scope["query_string"]
+    body = await request.body()
+    if (
+        not key
+        or age > BOT_SIGNATURE_MAX_AGE
+        or not signature.isascii()
+        or not hmac.compare_digest(
+            bot_signature(key, timestamp, request.method, target, body), signature
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid signature",
+        )
+
+
 # Type aliases for cleaner route signatures
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 WishlistServiceDep = Annotated[WishlistService, Depends(get_wishlist_service)]
+ReadUserServiceDep = Annotated[UserService, Depends(get_read_user_service)]
+ReadWishlistServiceDep = Annotated[WishlistService, Depends(get_read_wishlist_service)]
+BotNotificationRepositoryDep = Annotated[
+    BotNotificationRepository, Depends(get_bot_notification_repository)
+]
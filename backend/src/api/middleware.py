@@ -0,0 +1,152 @@
+"""
+ASGI middleware for request instrumentation.
+"""
+
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.database import DB_POSITION_HEADER
+from src.infrastructure.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    REQUEST_LATENCY,
+    REQUESTS_IN_PROGRESS,
+    REQUESTS_TOTAL,
+    STREAM_DURATION,
+    STREAMS_OPEN,
+    start_query_stats,
+    stop_query_stats,
+)
+from src.infrastructure.profiling import report_profile, start_profile, stop_profile
+
+
+def route_template(scope: Scope) -> str:
+    """Get the matched route path template (bounded label cardinality)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def is_event_stream(message: Message) -> bool:
+    """Check whether a response start message opens a Server-Sent Events stream."""
+    content_type = Headers(raw=message["headers"]).get("content-type", "")
+    return content_type.startswith("text/event-stream")
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, in-flight and per-request DB metrics.
+
+    A Server-Sent Events stream counts as served once its response starts:
+    its latency is the time to open it, and from then on it is tracked by
+    the open-streams gauge and the stream duration histogram instead.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if is_event_stream(message):
+                    streaming = True
+                    route = route_template(scope)
+                    REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+                    in_progress.dec()
+                    STREAMS_OPEN.labels(route).inc()
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        stats, token = start_query_stats()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            stop_query_stats(token)
+
+            # The router stores the matched route in the scope
+            route = route_template(scope)
+            if streaming:
+                STREAMS_OPEN.labels(route).dec()
+                STREAM_DURATION.labels(route).observe(elapsed)
+            else:
+                in_progress.dec()
+                REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.duration)
+
+
+class SqlProfilerMiddleware:
+    """
+    Records SQL statements per request.
+
+    Adds a Server-Timing header with database time and statement count, and
+    logs N+1 patterns once the request is done.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5, strict: bool = False):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.strict = strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(scope, self.strict)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.total_time * 1000:.1f};desc="{profile.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_profile(token)
+            report_profile(profile, self.n_plus_one_threshold)
+
+
+class DbPositionMiddleware:
+    """
+    Returns the primary's WAL position after a write in DB_POSITION_HEADER.
+
+    get_session stores the position in the request state once the write
+    transaction has committed, which is before the response starts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get("db_position"):
+                MutableHeaders(scope=message).append(DB_POSITION_HEADER, state["db_position"])
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,5 +1,15 @@
+from .avatars import router as avatars_router
+from .images import router as images_router
+from .notifications import router as notifications_router
 from .users import router as users_router
 from .wishlists import router as wishlists_router
 from .wishes import router as wishes_router
 
-__all__ = ["users_router", "wishlists_router", "wishes_router"]
+__all__ = [
+    "avatars_router",
+    "images_router",
+    "notifications_router",
+    "users_router",
+    "wishlists_router",
+    "wishes_router",
+]
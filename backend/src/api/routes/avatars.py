@@ -0,0 +1,95 @@
+"""
+Mirrored avatar routes.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from src.api.dependencies import require_bot_signature
+from src.api.schemas import AvatarResponse, ErrorResponse
+from src.services.avatars import AvatarRejectedError, avatar_store
+
+router = APIRouter(prefix="/avatars", tags=["avatars"])
+
+# Avatars are content-addressed, so the file behind a URL never changes
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get(
+    "/telegram/{file_unique_id}",
+    response_model=AvatarResponse,
+    responses={404: {"model": ErrorResponse, "description": "Not mirrored yet"}},
+    summary="Find a mirrored profile photo",
+    description="Used by the bot to skip downloading photos that are already stored.",
+)
+async def get_mirrored_avatar(file_unique_id: str) -> AvatarResponse:
+    """Look up a profile photo by its Telegram file_unique_id."""
+    url = await avatar_store.lookup(file_unique_id)
+    if url is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar not mirrored",
+        )
+    return AvatarResponse(url=url)
+
+
+async def limit_avatar_size(request: Request) -> None:
+    """Refuse oversized uploads before the body is read to check the signature."""
+    if int(request.headers.get("content-length") or 0) > avatar_store.max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Avatar too large",
+        )
+
+
+@router.put(
+    "/telegram/{file_unique_id}",
+    response_model=AvatarResponse,
+    responses={
+        403: {"model": ErrorResponse, "description": "Not signed by the bot"},
+        413: {"model": ErrorResponse, "description": "Avatar too large"},
+        415: {"model": ErrorResponse, "description": "Not a JPEG"},
+    },
+    dependencies=[Depends(limit_avatar_size), Depends(require_bot_signature)],
+    summary="Upload a profile photo",
+    description="Store a Telegram profile photo sent by the bot as the raw JPEG body. "
+    "Internal: requests must carry the bot's X-Bot-Signature, which covers the body.",
+)
+async def upload_avatar(file_unique_id: str, request: Request) -> AvatarResponse:
+    """Mirror a profile photo uploaded by the bot."""
+    try:
+        url = await avatar_store.save(file_unique_id, await request.body())
+    except AvatarRejectedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e),
+        )
+    return AvatarResponse(url=url)
+
+
+@router.get(
+    "/{digest}.jpg",
+    response_class=FileResponse,
+    responses={
+        200: {"content": {"image/jpeg": {}}, "description": "Avatar"},
+        304: {"description": "Not modified"},
+        404: {"model": ErrorResponse, "description": "Avatar not found"},
+    },
+    summary="Get an avatar",
+    description="A mirrored profile photo, as linked from a user's `avatar_url`.",
+)
+async def get_avatar(digest: str, request: Request) -> Response:
+    """Serve a mirrored profile photo."""
+    path = await asyncio.to_thread(avatar_store.blob_path, digest)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar not found",
+        )
+
+    headers = {"ETag": f'"{digest[:32]}"', "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
@@ -0,0 +1,98 @@
+"""
+Image proxy routes.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+
+from src.api.schemas import ErrorResponse, ImagePlaceholderResponse
+from src.services.images import ImageProxyError, ProxiedImage, image_proxy
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+# Proxy URLs are signed per source and blobs are content-addressed, so a
+# response for a given URL never changes
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_ERRORS = {
+    403: {"model": ErrorResponse, "description": "Invalid signature"},
+    404: {"model": ErrorResponse, "description": "Source image unavailable"},
+}
+
+
+async def _load(src: str, sig: str) -> ProxiedImage:
+    if not image_proxy.verify(src, sig):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid signature",
+        )
+    try:
+        return await image_proxy.get_image(src)
+    except ImageProxyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+
+@router.get(
+    "/thumbnail",
+    response_class=FileResponse,
+    responses={
+        200: {"content": {"image/webp": {}}, "description": "Resized image"},
+        304: {"description": "Not modified"},
+        **_ERRORS,
+    },
+    summary="Get a resized wish image",
+    description="WebP copy of a wish image at the smallest configured width covering `w`. "
+    "Use the `image_thumbnail_url` of a wish; its blurhash is in the X-Blurhash header.",
+)
+async def get_thumbnail(
+    request: Request,
+    src: str,
+    sig: str,
+    w: Annotated[int, Query(ge=1, le=4096)] = 320,
+) -> Response:
+    """Serve a resized wish image."""
+    if not image_proxy.verify(src, sig):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid signature",
+        )
+    try:
+        image, digest, path = await image_proxy.get_thumbnail(src, w)
+    except ImageProxyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    headers = {
+        "ETag": f'"{digest[:32]}"',
+        "Cache-Control": _CACHE_CONTROL,
+        "X-Blurhash": image.blurhash,
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type="image/webp", headers=headers)
+
+
+@router.get(
+    "/placeholder",
+    response_model=ImagePlaceholderResponse,
+    responses=_ERRORS,
+    summary="Get a wish image placeholder",
+    description="Blurhash and size of a wish image, for drawing a placeholder "
+    "before the thumbnail loads. Takes the `src` and `sig` of `image_thumbnail_url`.",
+)
+async def get_placeholder(src: str, sig: str, response: Response) -> ImagePlaceholderResponse:
+    """Get the blurhash of a wish image."""
+    image = await _load(src, sig)
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return ImagePlaceholderResponse(
+        blurhash=image.blurhash,
+        width=image.width,
+        height=image.height,
+    )
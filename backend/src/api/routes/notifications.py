@@ -0,0 +1,64 @@
+"""
+Bot notification routes.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+
+from src.api.dependencies import BotNotificationRepositoryDep, require_bot_signature
+from src.api.schemas import (
+    BotNotificationAckRequest,
+    BotNotificationListResponse,
+    BotNotificationResponse,
+    ErrorResponse,
+)
+from src.config import get_settings
+
+router = APIRouter(
+    prefix="/notifications",
+    tags=["notifications"],
+    dependencies=[Depends(require_bot_signature)],
+    responses={403: {"model": ErrorResponse, "description": "Not signed by the bot"}},
+)
+
+
+@router.post(
+    "/bot/claim",
+    response_model=BotNotificationListResponse,
+    summary="Claim messages for the bot",
+    description="Internal: hands the oldest queued messages to the bot. Messages not "
+    "acknowledged within BOT_NOTIFICATION_CLAIM_TIMEOUT are handed out again. "
+    "Requests must carry the bot's X-Bot-Signature.",
+)
+async def claim_bot_notifications(
+    repository: BotNotificationRepositoryDep,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> BotNotificationListResponse:
+    """Claim a batch of queued messages."""
+    notifications = await repository.claim(limit, get_settings().bot_notification_claim_timeout)
+    return BotNotificationListResponse(
+        notifications=[
+            BotNotificationResponse(
+                id=notification.id,
+                telegram_id=notification.telegram_id,
+                text=notification.text,
+            )
+            for notification in notifications
+        ]
+    )
+
+
+@router.post(
+    "/bot/ack",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Acknowledge claimed messages",
+    description="Internal: removes messages the bot has queued for sending. "
+    "Requests must carry the bot's X-Bot-Signature.",
+)
+async def ack_bot_notifications(
+    request: BotNotificationAckRequest,
+    repository: BotNotificationRepositoryDep,
+) -> None:
+    """Remove messages the bot has taken over."""
+    await repository.delete(request.ids)
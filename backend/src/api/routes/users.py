@@ -5,19 +5,28 @@ API layer handles only request/response orchestration.
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import UserServiceDep
+from src.api.dependencies import ReadUserServiceDep, UserServiceDep, require_bot_signature
 from src.api.schemas import (
+    ActiveUserListResponse,
+    ActiveUserResponse,
+    BirthdayReminderListResponse,
+    BirthdayReminderResponse,
+    BirthdayUserResponse,
     ErrorResponse,
+    StoreStatsResponse,
+    UserBulkRegisterRequest,
+    UserBulkRegisterResponse,
     UserRegisterRequest,
     UserRegisterResponse,
     UserResponse,
     UserUpdateRequest,
 )
 from src.domain.entities import UserCreate, UserUpdate
-from src.infrastructure.database import get_session
+from src.infrastructure.database import get_read_session
+from src.infrastructure.profiling import query_budget
 from src.repositories import WishRepository
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -75,6 +84,34 @@ async def register_user(
     )
 
 
+@router.post(
+    "/register/bulk",
+    response_model=UserBulkRegisterResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Register or update users in bulk",
+    description="Batch form of /users/register used by the bot's write-behind queue. "
+    "Idempotent: replaying a batch updates the same users again.",
+)
+async def register_users_bulk(
+    request: UserBulkRegisterRequest,
+    user_service: UserServiceDep,
+) -> UserBulkRegisterResponse:
+    """Register or update up to 500 users in one transaction."""
+    results = await user_service.register_many([
+        UserCreate(
+            telegram_id=item.telegram_id,
+            username=item.username,
+            first_name=item.first_name,
+            last_name=item.last_name,
+            avatar_url=item.avatar_url,
+            birth_date=item.birth_date,
+        )
+        for item in request.users
+    ])
+    registered = sum(1 for _, is_new in results if is_new)
+    return UserBulkRegisterResponse(registered=registered, updated=len(results) - registered)
+
+
 @router.get(
     "/telegram/{telegram_id}",
     response_model=UserResponse,
@@ -87,7 +124,7 @@ async def register_user(
 )
 async def get_user_by_telegram_id(
     telegram_id: int,
-    user_service: UserServiceDep,
+    user_service: ReadUserServiceDep,
     current_user_id: int = None,  # Optional: current user's telegram_id to check subscription
 ) -> UserResponse:
     """Get user by Telegram ID."""
@@ -126,10 +163,11 @@ async def get_user_by_telegram_id(
     summary="Get friends list",
     description="Get list of friends (subscribed users) sorted by next birthday.",
 )
+@query_budget(4)
 async def get_friends(
     telegram_id: int,
-    user_service: UserServiceDep,
-    session: Annotated[AsyncSession, Depends(get_session)],
+    user_service: ReadUserServiceDep,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
 ) -> list[UserResponse]:
     """Get friends list."""
     current_user = await user_service.get_user_by_telegram_id(telegram_id)
@@ -140,11 +178,10 @@ async def get_friends(
         )
 
     friends = await user_service.get_friends(current_user.id)
-    wish_repo = WishRepository(session)
+    wish_counts = await WishRepository(session).count_by_user_ids([friend.id for friend in friends])
 
     result = []
     for friend in friends:
-        wish_count = await wish_repo.count_by_user_id(friend.id)
         result.append(
             UserResponse(
                 id=friend.id,
@@ -156,7 +193,7 @@ async def get_friends(
                 profile_text=friend.profile_text,
                 birth_date=friend.birth_date,
                 is_subscribed=True,
-                wish_count=wish_count,
+                wish_count=wish_counts.get(friend.id, 0),
                 created_at=friend.created_at,
                 updated_at=friend.updated_at,
             )
@@ -164,6 +201,106 @@ async def get_friends(
     return result
 
 
+@router.get(
+    "/friends/top-stores",
+    response_model=list[StoreStatsResponse],
+    summary="Get friends' top stores",
+    description="Stores most linked from the wishes of the users this user follows, "
+    "ranked by the number of friends wanting something there.",
+)
+async def get_friends_top_stores(
+    telegram_id: int,
+    user_service: ReadUserServiceDep,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[StoreStatsResponse]:
+    """Get the top stores among friends' wishes."""
+    current_user = await user_service.get_user_by_telegram_id(telegram_id)
+    if not current_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    stores = await WishRepository(session).get_friends_top_stores(current_user.id, limit)
+    return [
+        StoreStatsResponse(
+            store_domain=store.store_domain,
+            wish_count=store.wish_count,
+            friend_count=store.friend_count,
+        )
+        for store in stores
+    ]
+
+
+@router.get(
+    "/birthdays/upcoming",
+    response_model=BirthdayReminderListResponse,
+    responses={403: {"model": ErrorResponse, "description": "Not signed by the bot"}},
+    dependencies=[Depends(require_bot_signature)],
+    summary="Get upcoming birthday reminders",
+    description="Followers to notify about birthdays `days_ahead` days from today, "
+    "one entry per follower. Page through with `after` until next_after is null. "
+    "Internal: requests must carry the bot's X-Bot-Signature.",
+)
+async def get_birthday_reminders(
+    user_service: ReadUserServiceDep,
+    days_ahead: Annotated[int, Query(ge=0, le=30)] = 1,
+    after: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 1000,
+) -> BirthdayReminderListResponse:
+    """Get one page of birthday reminders."""
+    target, reminders = await user_service.get_birthday_reminders(days_ahead, after, limit)
+    return BirthdayReminderListResponse(
+        target_date=target,
+        reminders=[
+            BirthdayReminderResponse(
+                recipient_telegram_id=reminder.recipient_telegram_id,
+                birthdays=[
+                    BirthdayUserResponse(
+                        telegram_id=user.telegram_id,
+                        username=user.username,
+                        first_name=user.first_name,
+                        last_name=user.last_name,
+                        birth_date=user.birth_date,
+                    )
+                    for user in reminder.birthdays
+                ],
+            )
+            for reminder in reminders
+        ],
+        next_after=reminders[-1].recipient_telegram_id if len(reminders) == limit else None,
+    )
+
+
+@router.get(
+    "/active",
+    response_model=ActiveUserListResponse,
+    responses={403: {"model": ErrorResponse, "description": "Not signed by the bot"}},
+    dependencies=[Depends(require_bot_signature)],
+    summary="Get active users",
+    description="Users active in the last `days` days, and users still linking to a "
+    "Bot API file as their avatar, for the bot's avatar refresh. "
+    "Page through with `after` until next_after is null. "
+    "Internal: requests must carry the bot's X-Bot-Signature.",
+)
+async def get_active_users(
+    user_service: ReadUserServiceDep,
+    days: Annotated[int, Query(ge=1, le=365)] = 30,
+    after: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 500,
+) -> ActiveUserListResponse:
+    """Get one page of active users."""
+    users = await user_service.get_active_users(days, after, limit)
+    return ActiveUserListResponse(
+        users=[
+            ActiveUserResponse(telegram_id=telegram_id, avatar_url=avatar_url)
+            for telegram_id, avatar_url in users
+        ],
+        next_after=users[-1][0] if len(users) == limit else None,
+    )
+
+
 @router.post(
     "/{target_id}/subscribe",
     status_code=status.HTTP_200_OK,
@@ -226,10 +363,11 @@ async def unsubscribe_user(
     summary="Search users",
     description="Search users by username or name.",
 )
+@query_budget(3)
 async def search_users(
     query: str,
     current_user_id: int,
-    user_service: UserServiceDep,
+    user_service: ReadUserServiceDep,
 ) -> list[UserResponse]:
     """Search users."""
     current_user = await user_service.get_user_by_telegram_id(current_user_id)
@@ -244,9 +382,9 @@ async def search_users(
     users = await user_service.search_users(query, current_user_id=current_user.id)
     
     # We need to populate is_subscribed for search results
+    subscribed_ids = await user_service.get_subscribed_ids(current_user.id, [user.id for user in users])
     response_list = []
     for user in users:
-        is_sub = await user_service.is_subscribed(current_user.id, user.id)
         response_list.append(
             UserResponse(
                 id=user.id,
@@ -257,7 +395,7 @@ async def search_users(
                 avatar_url=user.avatar_url,
                 profile_text=user.profile_text,
                 birth_date=user.birth_date,
-                is_subscribed=is_sub,
+                is_subscribed=user.id in subscribed_ids,
                 created_at=user.created_at,
                 updated_at=user.updated_at,
             )
@@ -6,16 +6,20 @@ from typing import Annotated, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from src.api.dependencies import UserServiceDep
+from src.api.dependencies import ReadUserServiceDep, UserServiceDep
 from src.api.schemas import (
     WishCreateRequest,
     WishResponse,
+    WishSearchResultResponse,
     WishUpdateRequest,
 )
 from src.domain.entities.wish import Wish, WishCreate, WishUpdate
-from src.repositories import WishRepository, WishlistRepository
+from src.repositories import OutboxRepository, WishRepository, WishlistRepository
 from src.services import WishService
-from src.infrastructure.database import get_session
+from src.services.wish import WishAlreadyBookedError
+from src.services.images import image_proxy
+from src.infrastructure.database import get_read_session, get_session
+from src.infrastructure.profiling import query_budget
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/wishes", tags=["wishes"])
@@ -25,6 +29,7 @@ def _wish_to_response(wish: Wish, viewer_id: Optional[UUID] = None) -> WishRespo
     """Convert wish entity to response schema, computing booked_by_me."""
     data = wish.to_dict()
     data['booked_by_me'] = viewer_id is not None and wish.booked_by_user_id == viewer_id
+    data['image_thumbnail_url'] = image_proxy.proxy_path(wish.image_url)
     return WishResponse(**data)
 
 
@@ -34,14 +39,22 @@ async def get_wish_service(
     """Dependency to get wish service."""
     wish_repository = WishRepository(session)
     wishlist_repository = WishlistRepository(session)
-    return WishService(wish_repository, wishlist_repository)
+    return WishService(wish_repository, wishlist_repository, OutboxRepository(session))
+
+
+async def get_read_wish_service(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+) -> WishService:
+    """Dependency to get wish service on the read session."""
+    return WishService(WishRepository(session), WishlistRepository(session))
 
 
 @router.get("", response_model=list[WishResponse])
+@query_budget(3)
 async def get_wishlist_wishes(
     wishlist_id: UUID,
-    service: Annotated[WishService, Depends(get_wish_service)],
-    user_service: UserServiceDep,
+    service: Annotated[WishService, Depends(get_read_wish_service)],
+    user_service: ReadUserServiceDep,
     viewer_telegram_id: Optional[int] = Query(None, description="Telegram ID of the viewer (to compute booked_by_me)"),
 ):
     """Get all wishes for a wishlist."""
@@ -62,6 +75,49 @@ async def get_wishlist_wishes(
     return [_wish_to_response(wish, viewer_id) for wish in wishes]
 
 
+@router.get(
+    "/search",
+    response_model=list[WishSearchResultResponse],
+    summary="Search friends' wishes",
+    description="Full-text search over the title, subtitle and description of wishes on "
+    "the public wishlists of users `telegram_id` follows. `q` takes web-search syntax: "
+    "\"quoted phrases\", `or` and `-excluded` words. Prices are compared as stored, "
+    "in each wish's own currency.",
+)
+async def search_wishes(
+    telegram_id: int,
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Search query")],
+    service: Annotated[WishService, Depends(get_read_wish_service)],
+    user_service: ReadUserServiceDep,
+    min_price: Annotated[Optional[float], Query(ge=0)] = None,
+    max_price: Annotated[Optional[float], Query(ge=0)] = None,
+    booked: Annotated[Optional[bool], Query(description="Only booked (true) or free (false) wishes")] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=1000)] = 0,
+):
+    """Search wishes on friends' public wishlists."""
+    user = await user_service.get_user_by_telegram_id(telegram_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    hits = await service.search_friends_wishes(
+        user.id, q, min_price, max_price, booked, limit, offset
+    )
+    return [
+        WishSearchResultResponse(
+            **_wish_to_response(hit.wish, user.id).model_dump(),
+            owner_telegram_id=hit.owner_telegram_id,
+            owner_first_name=hit.owner_first_name,
+            owner_username=hit.owner_username,
+            rank=hit.rank,
+        )
+        for hit in hits
+    ]
+
+
 @router.post("", response_model=WishResponse, status_code=status.HTTP_201_CREATED)
 async def create_wish(
     request: WishCreateRequest,
@@ -103,7 +159,8 @@ async def create_wish(
             currency=request.currency,
             priority=request.priority,
         )
-        return await service.create_wish(wish_data)
+        wish = await service.create_wish(wish_data)
+        return _wish_to_response(wish, user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -157,7 +214,8 @@ async def update_wish(
             is_booked=request.is_booked,
             priority=request.priority,
         )
-        return await service.update_wish(wish_id, update_data)
+        updated = await service.update_wish(wish_id, update_data)
+        return _wish_to_response(updated, user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -253,6 +311,8 @@ async def book_wish(
     try:
         updated = await service.book_wish(wish_id, user.id)
         return _wish_to_response(updated, user.id)
+    except WishAlreadyBookedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
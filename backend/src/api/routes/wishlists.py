@@ -3,11 +3,18 @@ Wishlist API routes.
 API layer handles only request/response orchestration.
 """
 
+from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from src.api.dependencies import WishlistServiceDep, UserServiceDep
+from src.api.dependencies import (
+    ReadUserServiceDep,
+    ReadWishlistServiceDep,
+    UserServiceDep,
+    WishlistServiceDep,
+)
 from src.api.schemas import (
     ErrorResponse,
     WishlistCreateRequest,
@@ -16,6 +23,7 @@ from src.api.schemas import (
     WishlistListResponse,
 )
 from src.domain.entities import WishlistCreate, WishlistUpdate, UNSET
+from src.services.live_updates import HubFullError, wishlist_hub
 
 router = APIRouter(prefix="/wishlists", tags=["wishlists"])
 
@@ -32,8 +40,8 @@ router = APIRouter(prefix="/wishlists", tags=["wishlists"])
 )
 async def get_user_wishlists_by_telegram_id(
     telegram_id: int,
-    wishlist_service: WishlistServiceDep,
-    user_service: UserServiceDep,
+    wishlist_service: ReadWishlistServiceDep,
+    user_service: ReadUserServiceDep,
 ) -> WishlistListResponse:
     """Get all wishlists for a user by Telegram ID."""
     # First, find the user by telegram_id
@@ -78,7 +86,7 @@ async def get_user_wishlists_by_telegram_id(
 )
 async def get_user_wishlists(
     user_id: UUID,
-    wishlist_service: WishlistServiceDep,
+    wishlist_service: ReadWishlistServiceDep,
 ) -> WishlistListResponse:
     """Get all wishlists for a user."""
     wishlists = await wishlist_service.get_user_wishlists(user_id)
@@ -167,7 +175,7 @@ async def create_wishlist(
 )
 async def get_wishlist(
     wishlist_id: UUID,
-    wishlist_service: WishlistServiceDep,
+    wishlist_service: ReadWishlistServiceDep,
 ) -> WishlistResponse:
     """Get wishlist by ID."""
     wishlist = await wishlist_service.get_wishlist_by_id(wishlist_id)
@@ -192,6 +200,61 @@ async def get_wishlist(
     )
 
 
+@router.get(
+    "/{wishlist_id}/stream",
+    responses={
+        200: {"description": "Server-Sent Events stream of wish changes"},
+        404: {"model": ErrorResponse, "description": "Wishlist not found or not visible to the viewer"},
+        503: {"model": ErrorResponse, "description": "Too many open streams"},
+    },
+    summary="Stream wishlist changes",
+    description="Push created, updated, booked, unbooked and deleted wish deltas "
+    "as Server-Sent Events. On a `reset` event the client re-fetches the list. "
+    "Private wishlists stream only to their owner.",
+)
+async def stream_wishlist(
+    wishlist_id: UUID,
+    wishlist_service: ReadWishlistServiceDep,
+    user_service: ReadUserServiceDep,
+    viewer_telegram_id: Optional[int] = Query(None, description="Telegram ID of the viewer (to compute booked_by_me)"),
+) -> StreamingResponse:
+    """Stream wish changes of a wishlist."""
+    wishlist = await wishlist_service.get_wishlist_by_id(wishlist_id)
+    if wishlist is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wishlist not found",
+        )
+
+    viewer_id: Optional[UUID] = None
+    if viewer_telegram_id is not None:
+        viewer = await user_service.get_user_by_telegram_id(viewer_telegram_id)
+        if viewer:
+            viewer_id = viewer.id
+
+    # A private wishlist streams only to its owner; anyone else sees no such list
+    if not wishlist.is_public and viewer_id != wishlist.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wishlist not found",
+        )
+
+    try:
+        subscription = wishlist_hub.subscribe(wishlist_id, viewer_id)
+    except HubFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+
+    # The database session is released before the body starts streaming
+    return StreamingResponse(
+        wishlist_hub.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch(
     "/{wishlist_id}",
     response_model=WishlistResponse,
@@ -96,6 +96,21 @@ class UserRegisterResponse(BaseModel):
     }
 
 
+class UserBulkRegisterRequest(BaseModel):
+    """Request schema for registering a batch of users."""
+
+    users: list[UserRegisterRequest] = Field(
+        ..., min_length=1, max_length=500, description="Users to register or update"
+    )
+
+
+class UserBulkRegisterResponse(BaseModel):
+    """Response schema for bulk registration."""
+
+    registered: int = Field(..., description="Users created by this batch")
+    updated: int = Field(..., description="Existing users updated by this batch")
+
+
 class UserUpdateRequest(BaseModel):
     """Request schema for updating user profile."""
 
@@ -117,6 +132,41 @@ class UserUpdateRequest(BaseModel):
     }
 
 
+class BirthdayUserResponse(BaseModel):
+    """User whose birthday is coming up."""
+
+    telegram_id: int = Field(..., description="Telegram user ID")
+    username: Optional[str] = Field(None, description="Telegram username")
+    first_name: str = Field(..., description="User's first name")
+    last_name: Optional[str] = Field(None, description="User's last name")
+    birth_date: date = Field(..., description="User's birth date")
+
+
+class BirthdayReminderResponse(BaseModel):
+    """Birthdays to tell one follower about."""
+
+    recipient_telegram_id: int = Field(..., description="Telegram ID of the follower to notify")
+    birthdays: list[BirthdayUserResponse]
+
+
+class BirthdayReminderListResponse(BaseModel):
+    """One page of birthday reminders."""
+
+    target_date: date = Field(..., description="Date the birthdays fall on")
+    reminders: list[BirthdayReminderResponse]
+    next_after: Optional[int] = Field(
+        None, description="Pass as `after` to get the next page; null on the last page"
+    )
+
+
+class StoreStatsResponse(BaseModel):
+    """A store and how many friends' wishes link to it."""
+
+    store_domain: str = Field(..., description="Registrable domain of the store, e.g. ozon.ru")
+    wish_count: int = Field(..., description="Friends' wishes linking to the store")
+    friend_count: int = Field(..., description="Friends with at least one such wish")
+
+
 class ErrorResponse(BaseModel):
     """Standard error response schema."""
 
@@ -265,6 +315,9 @@ class WishResponse(WishBase):
     wishlist_id: UUID
     is_booked: bool
     booked_by_me: bool = False
+    image_thumbnail_url: Optional[str] = Field(
+        None, description="Resized image path relative to the API root; append &w=<width>"
+    )
     created_at: datetime
     updated_at: datetime
 
@@ -272,3 +325,61 @@ class WishResponse(WishBase):
         "from_attributes": True
     }
 
+
+class WishSearchResultResponse(WishResponse):
+    """A friend's wish found by search."""
+
+    owner_telegram_id: int = Field(..., description="Telegram ID of the wish's owner")
+    owner_first_name: str = Field(..., description="Owner's first name")
+    owner_username: Optional[str] = Field(None, description="Owner's Telegram username")
+    rank: float = Field(..., description="Relevance; results are sorted by it, highest first")
+
+
+class ImagePlaceholderResponse(BaseModel):
+    """Placeholder for a wish image that is still loading."""
+
+    blurhash: str = Field(..., description="Blurhash of the image (https://blurha.sh)")
+    width: int = Field(..., description="Image width in pixels, for the aspect ratio")
+    height: int = Field(..., description="Image height in pixels")
+
+
+class AvatarResponse(BaseModel):
+    """A mirrored Telegram profile photo."""
+
+    url: str = Field(..., description="Path of the avatar relative to the API root")
+
+
+class ActiveUserResponse(BaseModel):
+    """A user whose avatar should be kept fresh."""
+
+    telegram_id: int = Field(..., description="Telegram user ID")
+    avatar_url: Optional[str] = Field(None, description="Currently stored avatar URL")
+
+
+class ActiveUserListResponse(BaseModel):
+    """One page of active users."""
+
+    users: list[ActiveUserResponse]
+    next_after: Optional[int] = Field(
+        None, description="Pass as `after` to get the next page; null on the last page"
+    )
+
+
+class BotNotificationResponse(BaseModel):
+    """A message for the bot to send."""
+
+    id: int = Field(..., description="Pass to /notifications/bot/ack once queued")
+    telegram_id: int = Field(..., description="Chat to send the message to")
+    text: str = Field(..., description="Message text, HTML")
+
+
+class BotNotificationListResponse(BaseModel):
+    """Messages claimed by the bot."""
+
+    notifications: list[BotNotificationResponse]
+
+
+class BotNotificationAckRequest(BaseModel):
+    """Claimed messages the bot has taken over."""
+
+    ids: list[int] = Field(..., max_length=1000, description="IDs of the queued messages")
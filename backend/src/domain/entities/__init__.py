@@ -1,4 +1,30 @@
-from .user import User, UserCreate, UserUpdate
-from .wishlist import Wishlist, WishlistCreate, WishlistUpdate, UNSET
+from .event import BotNotification, OutboxEvent, WishEvents, WishlistEvents
+from .user import BirthdayReminder, User, UserCreate, UserUpdate
+from .wish import StoreStats, WishSearchHit
+from .wishlist import (
+    DEFAULT_WISHLIST_DESCRIPTION,
+    DEFAULT_WISHLIST_TITLE,
+    UNSET,
+    Wishlist,
+    WishlistCreate,
+    WishlistUpdate,
+)
 
-__all__ = ["User", "UserCreate", "UserUpdate", "Wishlist", "WishlistCreate", "WishlistUpdate", "UNSET"]
+__all__ = [
+    "BirthdayReminder",
+    "BotNotification",
+    "OutboxEvent",
+    "StoreStats",
+    "User",
+    "UserCreate",
+    "UserUpdate",
+    "Wishlist",
+    "WishlistCreate",
+    "WishlistUpdate",
+    "WishSearchHit",
+    "UNSET",
+    "DEFAULT_WISHLIST_TITLE",
+    "DEFAULT_WISHLIST_DESCRIPTION",
+    "WishEvents",
+    "WishlistEvents",
+]
@@ -0,0 +1,51 @@
+"""
+Outbox event domain entity.
+Changes recorded in the same transaction as the data they describe.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+
+class WishEvents:
+    """Event types emitted by wish mutations."""
+
+    CREATED = "wish_created"
+    UPDATED = "wish_updated"
+    DELETED = "wish_deleted"
+    FULFILLED = "wish_fulfilled"
+    BOOKED = "wish_booked"
+    UNBOOKED = "wish_unbooked"
+
+
+class WishlistEvents:
+    """Event types emitted by wishlist mutations."""
+
+    CREATED = "wishlist_created"
+    UPDATED = "wishlist_updated"
+    DELETED = "wishlist_deleted"
+
+
+@dataclass
+class OutboxEvent:
+    """An event waiting in the outbox for delivery."""
+
+    id: int
+    event_type: str
+    aggregate_type: str
+    aggregate_id: UUID
+    payload: dict[str, Any]
+    attempts: int
+    created_at: datetime
+    delivered_to: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BotNotification:
+    """A message waiting for the bot to send it."""
+
+    id: int
+    telegram_id: int
+    text: str
@@ -73,3 +73,11 @@ class UserUpdate:
     avatar_url: Optional[str] = None
     profile_text: Optional[str] = None
     birth_date: Optional[date] = None
+
+
+@dataclass
+class BirthdayReminder:
+    """Upcoming birthdays of the users one recipient follows."""
+
+    recipient_telegram_id: int
+    birthdays: list[User] = field(default_factory=list)
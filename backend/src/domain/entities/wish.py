@@ -54,6 +54,26 @@ class Wish:
         }
 
 
+@dataclass
+class StoreStats:
+    """How popular one store is among the wishes of a user's friends."""
+
+    store_domain: str
+    wish_count: int
+    friend_count: int
+
+
+@dataclass
+class WishSearchHit:
+    """A friend's wish matching a search, with its owner and relevance."""
+
+    wish: Wish
+    owner_telegram_id: int
+    owner_first_name: str
+    owner_username: Optional[str]
+    rank: float
+
+
 @dataclass
 class WishCreate:
     """Data required to create a new wish."""
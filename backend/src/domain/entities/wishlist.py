@@ -18,6 +18,10 @@ class _Unset:
 # Singleton sentinel value
 UNSET = _Unset()
 
+# Wishlist every user gets on registration
+DEFAULT_WISHLIST_TITLE = "Мои желания"
+DEFAULT_WISHLIST_DESCRIPTION = "Мой основной список желаний"
+
 
 @dataclass
 class Wishlist:
@@ -0,0 +1,147 @@
+"""
+Content-addressed file store on local disk.
+Blobs are named by the SHA-256 of their content and, when the store has a
+size budget, evicted least recently used first once it outgrows it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Reads refresh a blob's mtime, its recency for eviction, at most this often
+_TOUCH_INTERVAL = 3600.0
+
+# Eviction frees space down to this share of the budget, so it runs rarely
+_EVICT_TO = 0.9
+
+
+class BlobStore:
+    """
+    Immutable blobs under `root`, plus small JSON refs naming them.
+
+    Blobs live at blobs/<2 hex>/<sha256>; refs at refs/<2 hex>/<sha256 of
+    name>.json map a name (say, a source URL) to whatever describes its
+    blobs. Writes go through a temporary file and a rename, so readers never
+    see partial files and several worker processes can share one directory.
+    Each process tracks how much it wrote since its last scan and, once the
+    store may exceed `max_bytes`, rescans the directory and deletes the
+    least recently used files. A ref may outlive the blobs it names;
+    callers treat a missing blob as a cache miss. With `max_bytes` None
+    nothing is ever deleted, for stores whose blobs are linked to.
+
+    All methods do blocking file I/O; call them from a thread.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int]):
+        self._root = Path(root)
+        self._blobs = self._root / "blobs"
+        self._refs = self._root / "refs"
+        self._max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def blob_path(self, digest: str) -> Path:
+        return self._blobs / digest[:2] / digest
+
+    def _ref_path(self, name: str) -> Path:
+        key = hashlib.sha256(name.encode("utf-8")).hexdigest()
+        return self._refs / key[:2] / f"{key}.json"
+
+    def has(self, digest: str) -> bool:
+        """Whether a blob is present; marks it as recently used."""
+        return self._touch(self.blob_path(digest))
+
+    def put(self, data: bytes) -> str:
+        """Store a blob; returns its digest. Storing existing content is a no-op."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not self._touch(path):
+            self._write(path, data)
+        return digest
+
+    def get_ref(self, name: str) -> Optional[dict[str, Any]]:
+        path = self._ref_path(name)
+        if not self._touch(path):
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def set_ref(self, name: str, value: dict[str, Any]) -> None:
+        self._write(self._ref_path(name), json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def _touch(self, path: Path) -> bool:
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        now = time.time()
+        if now - mtime > _TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                # Evicted by another process just now
+                return False
+        return True
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        if self._max_bytes is None:
+            return
+        if self._size is None:
+            self._size = self._scan_size()
+        self._size += len(data)
+        if self._size > self._max_bytes:
+            self.evict()
+
+    def _files(self) -> list[tuple[float, int, Path]]:
+        files = []
+        stale = time.time() - _TOUCH_INTERVAL
+        for directory in (self._blobs, self._refs):
+            for path in directory.glob("*/*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.name.startswith(".tmp-") and stat.st_mtime > stale:
+                    # Being written by some process; leftovers of crashes age out
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def evict(self) -> int:
+        """Delete least recently used files until under budget; returns bytes freed."""
+        if self._max_bytes is None:
+            return 0
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = int(self._max_bytes * _EVICT_TO)
+        freed = 0
+        for _, size, path in files:
+            if total - freed <= target:
+                break
+            path.unlink(missing_ok=True)
+            freed += size
+        self._size = total - freed
+        if freed:
+            logger.info(f"Evicted {freed} bytes from {self._root}, {self._size} bytes left")
+        return freed
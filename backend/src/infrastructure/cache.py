@@ -0,0 +1,165 @@
+"""
+In-process entity cache with cross-worker invalidation.
+Writes publish the changed entity keys with Postgres NOTIFY at commit; every
+worker's notification listener evicts them locally.
+"""
+
+import asyncio
+import copy
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.infrastructure.database import is_read_only_session
+from src.infrastructure.metrics import record_cache_lookup
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+# NOTIFY payloads must stay under 8000 bytes
+_MAX_PAYLOAD = 7000
+
+_PENDING_KEY = "cache_invalidations"
+
+
+class EntityCache:
+    """
+    LRU of domain entities keyed by "<entity type>:<id>".
+
+    The cache only serves while the notification listener is connected; it is
+    emptied whenever notifications may have been missed. Every invalidation
+    bumps a generation counter, and put() drops values loaded before the
+    latest one, so a slow read cannot re-insert a row that changed meanwhile.
+    When reads may come from a replica, keys are evicted a second time after
+    `replica_grace` seconds, by which point the replica has caught up.
+
+    Only read-only sessions are served from and fill the cache. A cached
+    copy may lag behind another worker's commit until its notification
+    arrives, so sessions that write always read the row from the primary.
+    """
+
+    def __init__(self, max_entries: int, replica_grace: float = 0.0):
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._max_entries = max_entries
+        self._replica_grace = replica_grace
+        self.enabled = False
+        self.generation = 0
+
+    def get(self, session: AsyncSession, entity_type: str, key: Any) -> Optional[Any]:
+        """Get a copy of a cached value, or None."""
+        if not self.enabled or not is_read_only_session(session):
+            return None
+        cache_key = f"{entity_type}:{key}"
+        value = self._entries.get(cache_key)
+        record_cache_lookup(entity_type, value is not None)
+        if value is None:
+            return None
+        self._entries.move_to_end(cache_key)
+        # Entities are mutable dataclasses; callers must not change the cached one
+        return copy.copy(value)
+
+    def put(
+        self, session: AsyncSession, entity_type: str, key: Any, value: Any, generation: int
+    ) -> None:
+        """Cache a value `session` loaded when the cache was at `generation`."""
+        if (
+            not self.enabled
+            or generation != self.generation
+            or not is_read_only_session(session)
+        ):
+            return
+        cache_key = f"{entity_type}:{key}"
+        self._entries[cache_key] = copy.copy(value)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """Evict "<entity type>:<id>" keys."""
+        keys = list(keys)
+        self._evict(keys)
+        if self._replica_grace:
+            asyncio.get_running_loop().call_later(self._replica_grace, self._evict, keys)
+
+    def _evict(self, keys: list[str]) -> None:
+        self.generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def on_notify(self, payload: str) -> None:
+        """Apply an invalidation notification from any worker."""
+        self.invalidate(payload.split(","))
+
+    def on_connect(self) -> None:
+        # Notifications sent while nobody listened are lost; start empty
+        self.clear()
+        self.enabled = True
+
+    def on_disconnect(self) -> None:
+        self.enabled = False
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def mark_changed(session: AsyncSession, entity_type: str, *ids: Any) -> None:
+    """Invalidate the entities in every worker's cache once the session commits."""
+    session.info.setdefault(_PENDING_KEY, set()).update(f"{entity_type}:{id_}" for id_ in ids)
+
+
+def _payloads(keys: set[str]) -> list[str]:
+    """Pack keys into comma-separated NOTIFY payloads."""
+    payloads: list[str] = []
+    current: list[str] = []
+    size = 0
+    for key in sorted(keys):
+        if current and size + len(key) + 1 > _MAX_PAYLOAD:
+            payloads.append(",".join(current))
+            current, size = [], 0
+        current.append(key)
+        size += len(key) + 1
+    if current:
+        payloads.append(",".join(current))
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_invalidations(session: Session) -> None:
+    # NOTIFY is transactional: delivered on commit, discarded on rollback
+    keys = session.info.get(_PENDING_KEY)
+    if keys:
+        session.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {"channel": INVALIDATION_CHANNEL, "payloads": _payloads(keys)},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session: Session) -> None:
+    # This worker evicts right away instead of waiting for its own notification
+    keys = session.info.pop(_PENDING_KEY, None)
+    if keys:
+        entity_cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+settings = get_settings()
+entity_cache = EntityCache(
+    max_entries=settings.cache_max_entries,
+    replica_grace=settings.replica_max_lag_seconds if settings.database_replica_url else 0.0,
+)
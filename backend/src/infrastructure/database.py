@@ -3,17 +3,28 @@ Database connection and session management.
 Async SQLAlchemy setup for PostgreSQL.
 """
 
+import asyncio
+import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from uuid import uuid4
 
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
 
-from src.config import get_settings
+from src.config import Settings, get_settings
+from src.infrastructure.metrics import instrument_engine
+from src.infrastructure.profiling import install_profiler
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -21,32 +32,252 @@ class Base(DeclarativeBase):
     pass
 
 
-# Create async engine
+def _connect_args(settings: Settings) -> dict:
+    """Build asyncpg connect arguments for the configured deployment mode."""
+    if settings.db_pgbouncer_mode:
+        # In transaction pooling mode every transaction may land on a different
+        # server connection, so statements prepared on one backend are missing
+        # on the next. Disable both statement caches and give each prepared
+        # statement a unique name so concurrent prepares never collide.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+
+
+def _pool_sizing(settings: Settings) -> tuple[int, int]:
+    """
+    Get (pool_size, max_overflow) for this process.
+
+    With DB_POOL_BUDGET set, the total connection budget is split evenly
+    across the WEB_CONCURRENCY worker processes.
+    """
+    if not settings.db_pool_budget:
+        return settings.db_pool_size, settings.db_max_overflow
+
+    per_worker = max(1, settings.db_pool_budget // max(1, settings.web_concurrency))
+    pool_size = max(1, per_worker // 2)
+    return pool_size, per_worker - pool_size
+
+
+def _create_engine(url: str, settings: Settings, name: str) -> AsyncEngine:
+    """Create an instrumented async engine with the configured pool options."""
+    pool_size, max_overflow = _pool_sizing(settings)
+    engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args=_connect_args(settings),
+    )
+    instrument_engine(engine, name)
+    if settings.sql_profiler_enabled:
+        install_profiler(engine, settings.slow_query_ms)
+    return engine
+
+
+# Session.info key marking sessions that never write
+_READ_ONLY_KEY = "read_only"
+
+
+def _create_session_factory(
+    engine: AsyncEngine, read_only: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    """Create a session factory bound to the engine."""
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        info={_READ_ONLY_KEY: True} if read_only else None,
+    )
+
+
+def is_read_only_session(session: AsyncSession) -> bool:
+    """Check whether the session comes from a read-only (primary or replica) factory."""
+    return bool(session.info.get(_READ_ONLY_KEY))
+
+
+# Engines and session factories are created lazily on first use, so that
+# importing the application in a server master process opens no
+# connections that forked workers would inherit.
 settings = get_settings()
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+_engine: Optional[AsyncEngine] = None
+_replica_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_read_only_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_replica_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Get the primary database engine."""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(settings.database_url, settings, "primary")
+    return _engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """Get the read replica engine, or None when no replica is configured."""
+    global _replica_engine
+    if _replica_engine is None and settings.database_replica_url:
+        _replica_engine = _create_engine(settings.database_replica_url, settings, "replica")
+    return _replica_engine
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the read-write session factory for the primary."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = _create_session_factory(get_engine())
+    return _session_factory
+
+
+def get_read_only_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Get the read-only session factory for the primary.
+
+    Transactions are opened as READ ONLY and ended with a rollback instead
+    of a COMMIT round trip.
+    """
+    global _read_only_session_factory
+    if _read_only_session_factory is None:
+        _read_only_session_factory = _create_session_factory(
+            get_engine().execution_options(postgresql_readonly=True), read_only=True
+        )
+    return _read_only_session_factory
+
+
+def get_replica_session_factory() -> Optional[async_sessionmaker[AsyncSession]]:
+    """Get the read-only session factory for the replica, if configured."""
+    global _replica_session_factory
+    replica_engine = get_replica_engine()
+    if _replica_session_factory is None and replica_engine is not None:
+        _replica_session_factory = _create_session_factory(
+            replica_engine.execution_options(postgresql_readonly=True), read_only=True
+        )
+    return _replica_session_factory
+
+
+# Methods that never write: served in read-only transactions
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Header carrying a client's last write position (a primary WAL LSN). Write
+# responses set it; clients send the highest value they have seen back on
+# every request, so any worker can tell whether the replica has caught up
+# with that client's own writes.
+DB_POSITION_HEADER = "X-DB-Position"
+
+_CURRENT_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+
+# Zero lag when the replica has replayed everything it received, otherwise
+# the age of the last replayed transaction; plus the replayed position.
+_REPLICA_STATUS_SQL = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END, pg_last_wal_replay_lsn()::text"
 )
 
-# Session factory
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    """Convert a PostgreSQL LSN like '16/B374D848' to an integer, or None if invalid."""
+    if not value:
+        return None
+    high, sep, low = value.strip().partition("/")
+    if not sep:
+        return None
+    try:
+        return (int(high, 16) << 32) | int(low, 16)
+    except ValueError:
+        return None
+
+
+def _is_read_only(request: Request) -> bool:
+    """Check whether the request only reads."""
+    return request.method in _SAFE_METHODS
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read can be served by the replica.
+
+    Reads go to the primary whenever the replica is unreachable or lagging,
+    and when the client's last write position (see DB_POSITION_HEADER) is
+    ahead of what the replica had replayed at the last check
+    (read-your-writes). The position travels with the client, so this
+    holds across worker processes and servers.
+    """
+
+    def __init__(self, max_lag_seconds: float, check_interval: float):
+        self._max_lag = max_lag_seconds
+        self._check_interval = check_interval
+        self._healthy = False
+        self._replayed: Optional[int] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def has_replayed(self, position: Optional[int]) -> bool:
+        """Check whether the replica had replayed the write position at the last check."""
+        if position is None:
+            return True
+        return self._replayed is not None and self._replayed >= position
+
+    async def is_replica_usable(self) -> bool:
+        """Check replica health and lag, caching the result between checks."""
+        replica_engine = get_replica_engine()
+        if replica_engine is None:
+            return False
+
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self._check_interval:
+            return self._healthy
+
+        async with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self._check_interval:
+                return self._healthy
+            try:
+                async with replica_engine.connect() as conn:
+                    lag, replayed = (await conn.execute(_REPLICA_STATUS_SQL)).one()
+                lag = float(lag)
+                healthy = lag <= self._max_lag
+                self._replayed = parse_lsn(replayed)
+                if not healthy:
+                    logger.warning(f"Replica lag {lag:.1f}s exceeds limit, reading from primary")
+            except Exception as e:
+                logger.warning(f"Replica health check failed, reading from primary: {e}")
+                healthy = False
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+            return healthy
+
+
+replica_router = ReplicaRouter(
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_interval=settings.replica_health_check_interval,
 )
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database session."""
-    async with async_session_factory() as session:
+@asynccontextmanager
+async def _session_scope(
+    factory: async_sessionmaker[AsyncSession], read_only: bool
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session, committing writes or rolling back read-only work."""
+    async with factory() as session:
         try:
             yield session
-            await session.commit()
+            if read_only:
+                # Nothing to persist; rollback is a no-op if no query ran
+                await session.rollback()
+            else:
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -54,10 +285,49 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database session."""
+    read_only = _is_read_only(request)
+    factory = get_read_only_session_factory() if read_only else get_session_factory()
+    async with _session_scope(factory, read_only) as session:
+        yield session
+    if not read_only and get_replica_engine() is not None:
+        await _record_write_position(request)
+
+
+async def _record_write_position(request: Request) -> None:
+    """Store the primary's WAL position after a write for DB_POSITION_HEADER."""
+    try:
+        async with get_engine().connect() as conn:
+            request.state.db_position = await conn.scalar(_CURRENT_LSN_SQL)
+    except Exception as e:
+        # The client's next reads may hit a lagging replica; the write stands
+        logger.warning(f"Could not read the write position: {e}")
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only routes.
+
+    Uses the replica unless it is unhealthy or has not yet replayed the
+    client's last write, in which case the primary serves the read.
+    """
+    factory = get_read_only_session_factory()
+    replica_factory = get_replica_session_factory()
+    if replica_factory is not None:
+        if await replica_router.is_replica_usable():
+            position = parse_lsn(request.headers.get(DB_POSITION_HEADER))
+            if replica_router.has_replayed(position):
+                factory = replica_factory
+
+    async with _session_scope(factory, read_only=True) as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
     """Context manager for database sessions (for use outside of FastAPI)."""
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
@@ -68,12 +338,13 @@ async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
 async def close_db() -> None:
     """Close database connections."""
-    await engine.dispose()
+    global _engine, _replica_engine
+    global _session_factory, _read_only_session_factory, _replica_session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+    _engine = _replica_engine = None
+    _session_factory = _read_only_session_factory = _replica_session_factory = None
@@ -0,0 +1,150 @@
+"""
+Image resizing and blurhash placeholders.
+CPU-bound; meant to run in worker processes.
+"""
+
+import io
+import math
+from dataclasses import dataclass
+
+from PIL import ExifTags, Image, ImageOps
+
+# Refuse images that would take more memory than a product photo needs.
+# Pillow raises DecompressionBombError above twice this many pixels.
+Image.MAX_IMAGE_PIXELS = 25_000_000
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# The placeholder is computed from a tiny copy; detail beyond this is lost anyway
+_BLURHASH_SIZE = 32
+
+_SRGB_TO_LINEAR = [
+    value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+    for value in (index / 255 for index in range(256))
+]
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    """Resized WebP copies of an image, by requested width, and its placeholder."""
+
+    width: int
+    height: int
+    blurhash: str
+    variants: dict[int, bytes]
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(
+        _BASE83[(value // 83 ** (length - position - 1)) % 83] for position in range(length)
+    )
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(image: Image.Image, x_components: int = 4, y_components: int = 3) -> str:
+    """Encode an image as a blurhash (https://blurha.sh)."""
+    small = image.convert("RGB")
+    small.thumbnail((_BLURHASH_SIZE, _BLURHASH_SIZE))
+    width, height = small.size
+    pixels = [
+        (_SRGB_TO_LINEAR[r], _SRGB_TO_LINEAR[g], _SRGB_TO_LINEAR[b])
+        for r, g, b in small.getdata()
+    ]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1.0 if i == 0 and j == 0 else 2.0
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = normalisation * cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = 1.0 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(channel) for factor in ac for channel in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1.0
+    result += _base83(quantised_max, 1)
+    result += _base83(
+        (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4
+    )
+    for factor in ac:
+        quantised = [
+            max(0, min(18, int(_sign_pow(channel / maximum, 0.5) * 9 + 9.5))) for channel in factor
+        ]
+        result += _base83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+    return result
+
+
+def process_image(data: bytes, widths: tuple[int, ...], quality: int = 80) -> ProcessedImage:
+    """
+    Decode an image and produce a WebP copy per width, plus its blurhash.
+
+    Images are never upscaled: widths above the original get the original
+    size. Raises ValueError for data Pillow cannot decode or that is too large.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale, far cheaper than a full decode.
+        # The box is in stored pixels, so a rotated photo (orientation 5-8) needs
+        # its requested width applied to the stored height.
+        largest = max(widths)
+        stored_width, stored_height = max(image.width, 1), max(image.height, 1)
+        if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+            box = (largest * stored_width // stored_height, largest)
+        else:
+            box = (largest, largest * stored_height // stored_width)
+        image.draft("RGB", box)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Cannot decode image: {e}") from e
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    width, height = image.size
+
+    variants: dict[int, bytes] = {}
+    encoded: dict[int, bytes] = {}
+    for requested in sorted(widths):
+        target = min(requested, width)
+        if target not in encoded:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, format="WEBP", quality=quality, method=4)
+            encoded[target] = buffer.getvalue()
+        variants[requested] = encoded[target]
+
+    components = (4, 3) if width >= height else (3, 4)
+    return ProcessedImage(
+        width=width,
+        height=height,
+        blurhash=blurhash(image, *components),
+        variants=variants,
+    )
@@ -0,0 +1,233 @@
+"""
+Product page metadata parsing.
+Reads OpenGraph/product meta tags and schema.org Product JSON-LD from a page.
+Uses the standard library only, so parser processes start quickly.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Iterator, Optional
+from urllib.parse import urljoin
+
+_MAX_TITLE = 255
+_MAX_DESCRIPTION = 2000
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+_CURRENCY_RE = re.compile(r"^[A-Z]{3}$")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_THOUSANDS_RE = re.compile(r"^\d{1,3}(?:,\d{3})+$")
+
+# Legacy codes some Russian stores still publish
+_CURRENCY_ALIASES = {"RUR": "RUB"}
+
+
+@dataclass(frozen=True)
+class LinkMetadata:
+    """What a product page says about itself."""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    price: Optional[float] = None
+    currency: Optional[str] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.title or self.description or self.image_url or self.price is not None)
+
+
+class _HeadParser(HTMLParser):
+    """Collects meta tags, the <title> text and JSON-LD blocks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, str] = {}
+        self.title = ""
+        self.image_src: Optional[str] = None
+        self.json_ld: list[str] = []
+        self._in_title = False
+        self._in_json_ld = False
+        self._script: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        values = {name: value or "" for name, value in attrs}
+        if tag == "meta":
+            key = (values.get("property") or values.get("name") or values.get("itemprop") or "").lower()
+            content = values.get("content", "").strip()
+            # The first tag wins, as in most link preview implementations
+            if key and content and key not in self.meta:
+                self.meta[key] = content
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "link" and values.get("rel", "").lower() == "image_src":
+            self.image_src = self.image_src or values.get("href")
+        elif tag == "script" and values.get("type", "").lower() == "application/ld+json":
+            self._in_json_ld = True
+            self._script = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script" and self._in_json_ld:
+            self._in_json_ld = False
+            self.json_ld.append("".join(self._script))
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif self._in_json_ld:
+            self._script.append(data)
+
+
+def _decode(body: bytes, charset: Optional[str]) -> str:
+    if not charset:
+        match = _CHARSET_RE.search(body[:4096])
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _clean(value: Any, limit: int) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = " ".join(value.split())
+    return value[:limit] or None
+
+
+def _parse_price(value: Any) -> Optional[float]:
+    """Parse '1 299,00', '1,299.00', '1299' and similar."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        price = float(value)
+    elif isinstance(value, str):
+        text = "".join(value.split())
+        if "," in text and "." in text:
+            # Whichever comes last is the decimal separator
+            if text.rfind(",") > text.rfind("."):
+                text = text.replace(".", "").replace(",", ".")
+            else:
+                text = text.replace(",", "")
+        elif "," in text:
+            text = text.replace(",", "") if _THOUSANDS_RE.match(text) else text.replace(",", ".")
+        match = _NUMBER_RE.search(text)
+        if not match:
+            return None
+        price = float(match.group())
+    else:
+        return None
+    return price if math.isfinite(price) and price >= 0 else None
+
+
+def _parse_currency(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    code = value.strip().upper()
+    code = _CURRENCY_ALIASES.get(code, code)
+    return code if _CURRENCY_RE.match(code) else None
+
+
+def _absolute_url(value: Any, base_url: str) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("url") or value.get("contentUrl")
+    if not isinstance(value, str) or not value.strip():
+        return None
+    url = urljoin(base_url, value.strip())
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def _walk(node: Any) -> Iterator[dict]:
+    """Every JSON-LD object, including those nested in lists and @graph."""
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+    elif isinstance(node, dict):
+        yield node
+        if "@graph" in node:
+            yield from _walk(node["@graph"])
+
+
+def _is_product(node: dict) -> bool:
+    types = node.get("@type")
+    if isinstance(types, str):
+        types = [types]
+    return isinstance(types, list) and any(
+        isinstance(type_, str) and type_.rsplit("/", 1)[-1] in ("Product", "ProductGroup")
+        for type_ in types
+    )
+
+
+def _find_product(blocks: list[str]) -> Optional[dict]:
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _walk(data):
+            if _is_product(node):
+                return node
+    return None
+
+
+def _offer_price(product: dict) -> tuple[Optional[float], Optional[str]]:
+    offers = product.get("offers")
+    if isinstance(offers, list):
+        offers = offers[0] if offers else None
+    if not isinstance(offers, dict):
+        return None, None
+    # AggregateOffer carries a price range instead of a price
+    price = offers.get("price", offers.get("lowPrice"))
+    spec = offers.get("priceSpecification")
+    if price is None and isinstance(spec, dict):
+        price = spec.get("price")
+        offers = {**spec, **offers}
+    return _parse_price(price), _parse_currency(offers.get("priceCurrency"))
+
+
+def parse_link_metadata(body: bytes, charset: Optional[str], base_url: str) -> LinkMetadata:
+    """
+    Extract title, description, image, price and currency from a page.
+
+    Price and currency come from schema.org Product data when present and
+    from product:/og: price tags otherwise; the rest prefers OpenGraph.
+    """
+    parser = _HeadParser()
+    try:
+        parser.feed(_decode(body, charset))
+        parser.close()
+    except Exception:
+        # Keep whatever was collected before the markup broke the parser
+        pass
+    meta = parser.meta
+    product = _find_product(parser.json_ld) or {}
+
+    price, currency = _offer_price(product)
+    if price is None:
+        price = _parse_price(meta.get("product:price:amount") or meta.get("og:price:amount"))
+    if currency is None:
+        currency = _parse_currency(
+            meta.get("product:price:currency") or meta.get("og:price:currency")
+        )
+
+    return LinkMetadata(
+        title=_clean(
+            meta.get("og:title") or product.get("name") or meta.get("twitter:title") or parser.title,
+            _MAX_TITLE,
+        ),
+        description=_clean(
+            meta.get("og:description") or product.get("description") or meta.get("description"),
+            _MAX_DESCRIPTION,
+        ),
+        image_url=(
+            _absolute_url(meta.get("og:image") or meta.get("og:image:url"), base_url)
+            or _absolute_url(product.get("image"), base_url)
+            or _absolute_url(meta.get("twitter:image") or parser.image_src, base_url)
+        ),
+        price=price,
+        currency=currency if price is not None else None,
+    )
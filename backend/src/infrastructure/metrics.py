@@ -0,0 +1,234 @@
+"""
+Prometheus metrics for the API.
+Works in a single process or, with PROMETHEUS_MULTIPROC_DIR set, across
+uvicorn worker processes (prometheus_client multiprocess mode).
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+)
+REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+STREAMS_OPEN = Gauge(
+    "http_streams_open",
+    "Streaming (Server-Sent Events) responses currently open",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+STREAM_DURATION = Histogram(
+    "http_stream_duration_seconds",
+    "How long streaming (Server-Sent Events) responses stayed open",
+    ["route"],
+    buckets=(1, 10, 30, 60, 300, 900, 1800, 3600, 7200),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Database statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent in database statements per HTTP request",
+    ["route"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual database statements",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total",
+    "New database connections opened by the pool",
+    ["engine"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss)",
+    ["cache", "result"],
+)
+OUTBOX_EVENTS_DELIVERED = Counter(
+    "outbox_events_delivered_total",
+    "Outbox events delivered to all sinks, by event type",
+    ["event_type"],
+)
+OUTBOX_DELIVERY_FAILURES = Counter(
+    "outbox_delivery_failures_total",
+    "Outbox batches that failed in a sink and will be retried",
+    ["sink"],
+)
+OUTBOX_DELIVERY_LAG = Histogram(
+    "outbox_delivery_lag_seconds",
+    "Time from an event's commit to its delivery",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+OUTBOX_PENDING = Gauge(
+    "outbox_pending_events",
+    "Events waiting in the outbox",
+    multiprocess_mode="livemax",
+)
+OUTBOX_OLDEST_PENDING = Gauge(
+    "outbox_oldest_pending_seconds",
+    "Age of the oldest event waiting in the outbox",
+    multiprocess_mode="livemax",
+)
+OUTBOX_DEAD = Gauge(
+    "outbox_dead_events",
+    "Events that exhausted their delivery attempts",
+    multiprocess_mode="livemax",
+)
+
+LINK_FETCHES = Counter(
+    "link_fetches_total",
+    "Product pages fetched for wish enrichment, by result",
+    ["result"],
+)
+LINK_FETCH_DURATION = Histogram(
+    "link_fetch_duration_seconds",
+    "Time to download a product page, including waits for a free slot",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+IMAGE_PROXY_REQUESTS = Counter(
+    "image_proxy_requests_total",
+    "Proxied image lookups by result (hit/miss/error)",
+    ["result"],
+)
+IMAGE_PROCESS_DURATION = Histogram(
+    "image_process_duration_seconds",
+    "Time to decode, resize and encode one source image in the process pool",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+AVATAR_REQUESTS = Counter(
+    "avatar_requests_total",
+    "Avatar lookups and uploads from the bot by result (hit/miss/stored/rejected)",
+    ["result"],
+)
+
+
+@dataclass
+class QueryStats:
+    """Database statement counters for the current request."""
+
+    count: int = 0
+    duration: float = 0.0
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> tuple[QueryStats, object]:
+    """Start counting statements for the current request."""
+    stats = QueryStats()
+    return stats, _query_stats.set(stats)
+
+
+def stop_query_stats(token: object) -> None:
+    """Stop counting statements for the current request."""
+    _query_stats.reset(token)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Record a cache hit or miss."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Attach statement timing and pool metrics to an engine."""
+    sync_engine = engine.sync_engine
+    query_duration = DB_QUERY_DURATION.labels(name)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    opened = DB_POOL_CONNECTIONS_OPENED.labels(name)
+    DB_POOL_SIZE.labels(name).set(sync_engine.pool.size())
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        query_duration.observe(elapsed)
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        opened.inc()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def is_multiprocess() -> bool:
+    """Check whether metrics are aggregated across worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> None:
+    """
+    Serve metrics in Prometheus text format on a separate port.
+
+    In multiprocess mode this must run once, in the server master process,
+    and aggregates the files written by all workers.
+    """
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, addr=host, registry=registry)
+    else:
+        start_http_server(port, addr=host)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,109 @@
+"""
+Startup schema check against Alembic migrations.
+Replaces create_all on boot with a single revision lookup.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI_PATH = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+MIGRATION_LOCK_KEY = 7_310_422_001
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised when the database revision does not match the migration head."""
+
+
+def _alembic_config() -> Config:
+    """Build Alembic config that leaves application logging untouched."""
+    config = Config(str(ALEMBIC_INI_PATH))
+    config.set_main_option("script_location", str(ALEMBIC_INI_PATH.parent / "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def get_head_revision() -> Optional[str]:
+    """Get the head revision from the migration scripts."""
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+async def get_current_revision(conn: AsyncConnection) -> Optional[str]:
+    """Get the revision recorded in the database, or None if unversioned."""
+    # A catalog query rather than to_regclass(): it reads through the statement
+    # snapshot, so it sees a table committed while we waited for the lock
+    exists = await conn.scalar(text(
+        "SELECT EXISTS (SELECT FROM pg_tables "
+        "WHERE schemaname = current_schema() AND tablename = 'alembic_version')"
+    ))
+    if not exists:
+        return None
+    return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+
+
+def _upgrade(connection: Connection) -> None:
+    """Run Alembic to head on the caller's connection and transaction."""
+    config = _alembic_config()
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+async def _upgrade_under_lock(engine: AsyncEngine, head: Optional[str]) -> None:
+    """
+    Run migrations to head in one transaction holding the advisory lock.
+
+    The lock is transaction-scoped, so behind PgBouncer in transaction
+    pooling mode it stays on the server connection that runs the migration
+    and is released by the commit.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        # Another worker may have migrated while we waited for the lock
+        current = await get_current_revision(conn)
+        if current == head:
+            logger.info(f"Database already migrated to {head} by another worker")
+            return
+
+        logger.info(f"Migrating database from {current} to {head}")
+        await conn.run_sync(_upgrade)
+
+
+async def ensure_schema(engine: AsyncEngine, policy: str) -> None:
+    """
+    Check the database revision against the migration head on startup.
+
+    Policies:
+    - fail: raise SchemaOutOfDateError when the revision differs
+    - warn: log a warning and continue
+    - migrate: upgrade to head; concurrent workers serialize on an advisory
+      lock and all but the first find the schema already current
+    """
+    started = time.perf_counter()
+    head = get_head_revision()
+
+    async with engine.connect() as conn:
+        current = await get_current_revision(conn)
+
+    if current != head:
+        message = f"Database revision {current} does not match migration head {head}"
+        if policy == "fail":
+            raise SchemaOutOfDateError(message)
+        if policy == "migrate":
+            await _upgrade_under_lock(engine, head)
+        else:
+            logger.warning(f"{message}; run 'alembic upgrade head'")
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Schema check ({policy}) finished in {elapsed_ms:.1f} ms")
@@ -1,5 +1,7 @@
 from .user import UserModel
 from .wishlist import WishlistModel
 from .wish import WishModel
+from .outbox import OutboxModel
+from .bot_notification import BotNotificationModel
 
-__all__ = ["UserModel", "WishlistModel", "WishModel"]
+__all__ = ["UserModel", "WishlistModel", "WishModel", "OutboxModel", "BotNotificationModel"]
@@ -0,0 +1,48 @@
+"""
+Bot notification ORM model for SQLAlchemy.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Identity, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.database import Base
+
+
+class BotNotificationModel(Base):
+    """Message queued for the bot to send; rows are deleted once the bot has it."""
+
+    __tablename__ = "bot_notifications"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+        primary_key=True,
+    )
+    # One message per outbox event, so a redelivered event is queued once
+    outbox_event_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        unique=True,
+    )
+    telegram_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+    claimed_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<BotNotification(id={self.id}, telegram_id={self.telegram_id})>"
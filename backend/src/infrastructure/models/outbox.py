@@ -0,0 +1,71 @@
+"""
+Outbox ORM model for SQLAlchemy.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Identity, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.database import Base
+
+
+class OutboxModel(Base):
+    """Outbox database model; rows are deleted once delivered."""
+
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+        primary_key=True,
+    )
+    event_type: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    aggregate_type: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+    )
+    aggregate_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        nullable=False,
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    # Sinks that already received the event; retries skip them
+    delivered_to: Mapped[list[str]] = mapped_column(
+        ARRAY(String(32)),
+        nullable=False,
+        default=list,
+        server_default="{}",
+    )
+    # Set while a relay is delivering the event; others skip it until then
+    claimed_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<Outbox(id={self.id}, event_type={self.event_type})>"
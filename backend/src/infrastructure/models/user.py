@@ -6,7 +6,18 @@ from datetime import datetime, date
 from uuid import uuid4
 
 
-from sqlalchemy import BigInteger, DateTime, String, Date, func, Table, Column, ForeignKey
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Table,
+    extract,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,6 +29,8 @@ user_friends = Table(
     Base.metadata,
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
     Column("friend_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
+    # Reverse edge: who follows a user
+    Index("ix_user_friends_friend_id", "friend_id", "user_id"),
 )
 
 
@@ -84,5 +97,14 @@ class UserModel(Base):
         lazy="selectin",
     )
 
+    __table_args__ = (
+        Index(
+            "ix_users_birth_month_day",
+            extract("month", birth_date),
+            extract("day", birth_date),
+            postgresql_where=birth_date.isnot(None),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, telegram_id={self.telegram_id}, username={self.username})>"
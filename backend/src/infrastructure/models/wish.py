@@ -5,13 +5,21 @@ Wish ORM model for SQLAlchemy.
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, Float, func, Enum as SQLAlchemyEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, String, Text, Float, func, text, Enum as SQLAlchemyEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infrastructure.database import Base
 from src.domain.entities.wish import WishPriority
 
+# Searchable text of a wish in both languages the app is used in, title
+# weighted above subtitle above description. Must match migration 015.
+WISH_SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (("title", "A"), ("subtitle", "B"), ("description", "C"))
+    for config in ("russian", "english")
+)
+
 
 class WishModel(Base):
     """Wish database model."""
@@ -45,6 +53,10 @@ class WishModel(Base):
         String(2048),
         nullable=True,
     )
+    store_domain: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+    )
     image_url: Mapped[str | None] = mapped_column(
         String(2048),
         nullable=True,
@@ -75,6 +87,11 @@ class WishModel(Base):
         default=WishPriority.JUST_WANT,
         index=True,
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(WISH_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -87,5 +104,14 @@ class WishModel(Base):
         nullable=False,
     )
 
+    __table_args__ = (
+        Index(
+            "ix_wishes_store_domain",
+            "store_domain",
+            postgresql_where=text("store_domain IS NOT NULL"),
+        ),
+        Index("ix_wishes_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def __repr__(self) -> str:
         return f"<Wish(id={self.id}, wishlist_id={self.wishlist_id}, title={self.title})>"
@@ -0,0 +1,106 @@
+"""
+Postgres LISTEN connection shared by in-process consumers.
+One dedicated connection per worker, outside the pool, reconnecting on loss.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Channel:
+    on_notify: Callable[[str], None]
+    on_connect: Callable[[], None]
+    on_disconnect: Callable[[], None]
+
+
+class PgNotificationListener:
+    """
+    Listens on several channels over one connection.
+
+    The connection is checked every `heartbeat_interval` seconds. Each
+    channel's on_connect runs once LISTEN is active and on_disconnect when the
+    connection is lost; notifications sent in between are gone, so consumers
+    must treat a reconnect as a gap.
+    """
+
+    def __init__(self, database_url: str, heartbeat_interval: float):
+        # asyncpg takes a plain postgresql:// DSN
+        self._dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._heartbeat_interval = heartbeat_interval
+        self._channels: dict[str, _Channel] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add_channel(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Callable[[], None],
+        on_disconnect: Callable[[], None],
+    ) -> None:
+        self._channels[channel] = _Channel(on_notify, on_connect, on_disconnect)
+
+    @property
+    def has_channels(self) -> bool:
+        return bool(self._channels)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="pg-notification-listener")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _dispatch(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self._channels[channel].on_notify(payload)
+        except Exception as e:
+            logger.exception(f"Handling notification on {channel} failed: {e}")
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            connection: Optional[asyncpg.Connection] = None
+            lost = asyncio.Event()
+            connected = False
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                connection.add_termination_listener(lambda _: lost.set())
+                for channel in self._channels:
+                    await connection.add_listener(channel, self._dispatch)
+                for handler in self._channels.values():
+                    handler.on_connect()
+                connected = True
+                backoff = 1.0
+                logger.info(f"Listening on {', '.join(self._channels)}")
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self._heartbeat_interval)
+                    except asyncio.TimeoutError:
+                        await asyncio.wait_for(
+                            connection.fetchval("SELECT 1"), self._heartbeat_interval
+                        )
+                logger.warning("Notification listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener failed: {e}")
+            finally:
+                if connected:
+                    for handler in self._channels.values():
+                        handler.on_disconnect()
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(backoff)
+            backoff = min(30.0, backoff * 2)
@@ -0,0 +1,178 @@
+"""
+Per-request SQL profiler.
+Records the statements issued while serving a request, flags N+1 patterns
+and slow queries, and enforces declared per-route query budgets in strict
+mode.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_QUERY_BUDGET_ATTR = "__query_budget__"
+
+EndpointT = TypeVar("EndpointT", bound=Callable)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a route issues more statements than declared."""
+
+
+class NPlusOneDetected(RuntimeError):
+    """Raised in strict mode, once the request is done, when a route ran an N+1 loop."""
+
+
+def query_budget(max_queries: int) -> Callable[[EndpointT], EndpointT]:
+    """
+    Declare the maximum number of SQL statements a route may issue.
+
+    Only enforced when the profiler runs in strict mode (SQL_PROFILER_STRICT),
+    which is meant for tests.
+    """
+    def decorator(endpoint: EndpointT) -> EndpointT:
+        setattr(endpoint, _QUERY_BUDGET_ATTR, max_queries)
+        return endpoint
+    return decorator
+
+
+def bind_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bind parameters by type only, so values never reach the logs."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else ()
+        return f"{len(parameters)} x {bind_shape(first)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass
+class StatementRecord:
+    """A single executed statement."""
+
+    statement: str
+    bind_shape: str
+    params_key: int
+    duration: float
+
+
+@dataclass
+class RequestProfile:
+    """Statements issued while serving one request."""
+
+    scope: dict
+    strict: bool = False
+    statements: list[StatementRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_time(self) -> float:
+        return sum(record.duration for record in self.statements)
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "")
+
+    def budget(self) -> Optional[int]:
+        """Get the query budget declared on the matched endpoint, if any."""
+        return getattr(self.scope.get("endpoint"), _QUERY_BUDGET_ATTR, None)
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Find statements executed at least `threshold` times with differing
+        parameters, the signature of an N+1 loop.
+        """
+        params_by_statement: dict[str, set[int]] = defaultdict(set)
+        counts: dict[str, int] = defaultdict(int)
+        for record in self.statements:
+            params_by_statement[record.statement].add(record.params_key)
+            counts[record.statement] += 1
+        return [
+            (statement, count)
+            for statement, count in counts.items()
+            if count >= threshold and len(params_by_statement[statement]) > 1
+        ]
+
+
+_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def start_profile(scope: dict, strict: bool) -> tuple[RequestProfile, object]:
+    """Start recording statements for the current request."""
+    profile = RequestProfile(scope=scope, strict=strict)
+    return profile, _profile.set(profile)
+
+
+def stop_profile(token: object) -> None:
+    """Stop recording statements for the current request."""
+    _profile.reset(token)
+
+
+def _params_key(parameters: Any) -> int:
+    try:
+        return hash(repr(parameters))
+    except Exception:
+        return id(parameters)
+
+
+def install_profiler(engine: AsyncEngine, slow_query_ms: float) -> None:
+    """Attach the per-request statement recorder to an engine."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _profile.get()
+        if profile is not None and profile.strict:
+            budget = profile.budget()
+            if budget is not None and profile.count >= budget:
+                raise QueryBudgetExceeded(
+                    f"{profile.route} exceeded its query budget of {budget} statements"
+                )
+        context._profiler_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profiler_started
+        shape = None
+        if elapsed * 1000 >= slow_query_ms:
+            shape = bind_shape(parameters, executemany)
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms): {statement} | binds: {shape}"
+            )
+
+        profile = _profile.get()
+        if profile is None:
+            return
+        profile.statements.append(
+            StatementRecord(
+                statement=statement,
+                bind_shape=shape or bind_shape(parameters, executemany),
+                params_key=_params_key(parameters),
+                duration=elapsed,
+            )
+        )
+
+
+def report_profile(profile: RequestProfile, n_plus_one_threshold: int) -> None:
+    """Log N+1 patterns found in a finished request; in strict mode, raise."""
+    repeated = profile.repeated_statements(n_plus_one_threshold)
+    for statement, count in repeated:
+        logger.warning(
+            f"Possible N+1 in {profile.route}: statement executed {count} times "
+            f"with different parameters: {statement}"
+        )
+    if repeated and profile.strict:
+        raise NPlusOneDetected(f"{profile.route} ran {len(repeated)} statement(s) in a loop")
@@ -0,0 +1,317 @@
+"""
+Product page fetching for wish enrichment.
+Downloads the pages behind wish links with global and per-domain limits,
+parses them in worker processes and caches the result by normalized URL.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import multiprocessing
+import socket
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+import httpcore
+import httpx
+
+from src.infrastructure.link_metadata import LinkMetadata, parse_link_metadata
+from src.infrastructure.metrics import LINK_FETCH_DURATION, LINK_FETCHES, record_cache_lookup
+from src.infrastructure.utils import extract_store_from_url, normalize_url
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "Mozilla/5.0 (compatible; WishlistBot/1.0; +link preview)"
+_MAX_REDIRECTS = 5
+
+
+class LinkFetchError(Exception):
+    """A URL could not be fetched, or is not one we should process."""
+
+    def __init__(self, message: str, result: str = "error"):
+        super().__init__(message)
+        self.result = result
+
+
+class LinkScraper:
+    """
+    Fetches link metadata for wishes.
+
+    At most `max_concurrency` pages are downloaded at once, and at most
+    `per_domain_concurrency` from one store, so a list full of links to the
+    same marketplace does not get the backend throttled there. Only the first
+    `max_bytes` of a page are read; stores put the tags we need in <head>.
+    HTML is parsed in a pool of `parse_processes` processes to keep the
+    event loop responsive. Results are cached per normalized URL for
+    `cache_ttl` seconds, failures for `error_ttl`, and concurrent requests
+    for one URL share a single download. Hosts resolving to private or
+    loopback addresses are refused unless `allow_private_hosts` is set.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_domain_concurrency: int,
+        timeout: float,
+        max_bytes: int,
+        parse_processes: int,
+        cache_size: int,
+        cache_ttl: float,
+        error_ttl: float = 300.0,
+        allow_private_hosts: bool = False,
+    ):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._per_domain_concurrency = per_domain_concurrency
+        self._domain_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._domain_users: dict[str, int] = {}
+        self._max_bytes = max_bytes
+        self._cache: OrderedDict[str, tuple[float, Optional[LinkMetadata]]] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._error_ttl = error_ttl
+        self._pending: dict[str, asyncio.Future] = {}
+        self._client = public_http_client(
+            allow_private_hosts,
+            timeout=timeout,
+            headers={"User-Agent": _USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+        )
+        # Spawned, not forked: the worker has an event loop, threads and sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=parse_processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def close(self) -> None:
+        for pending in list(self._pending.values()):
+            pending.cancel()
+        await self._client.aclose()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_metadata(self, url: str) -> Optional[LinkMetadata]:
+        """Metadata of the page at `url`, or None if it could not be read."""
+        key = normalize_url(url)
+        if key is None:
+            return None
+
+        entry = self._cache.get(key)
+        fresh = entry is not None and entry[0] > time.monotonic()
+        record_cache_lookup("link_metadata", fresh)
+        if fresh:
+            self._cache.move_to_end(key)
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # A caller giving up must not cancel the download for the others
+        return await asyncio.shield(pending)
+
+    async def _load(self, url: str) -> Optional[LinkMetadata]:
+        try:
+            body, charset, final_url = await self._download(url)
+        except (LinkFetchError, httpx.HTTPError) as e:
+            logger.debug(f"Could not fetch {url}: {e!r}")
+            self._store(url, None, self._error_ttl)
+            return None
+
+        try:
+            metadata = await asyncio.get_running_loop().run_in_executor(
+                self._executor, parse_link_metadata, body, charset, final_url
+            )
+        except Exception as e:
+            # Not cached: the pool may recover, the page is probably fine
+            logger.warning(f"Parsing {url} failed: {e!r}")
+            return None
+        self._store(url, metadata, self._cache_ttl)
+        return metadata
+
+    def _store(self, key: str, metadata: Optional[LinkMetadata], ttl: float) -> None:
+        self._cache[key] = (time.monotonic() + ttl, metadata)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @asynccontextmanager
+    async def _domain_slot(self, domain: str) -> AsyncIterator[None]:
+        semaphore = self._domain_semaphores.get(domain)
+        if semaphore is None:
+            semaphore = self._domain_semaphores[domain] = asyncio.Semaphore(
+                self._per_domain_concurrency
+            )
+        self._domain_users[domain] = self._domain_users.get(domain, 0) + 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self._domain_users[domain] -= 1
+            if not self._domain_users[domain]:
+                del self._domain_users[domain]
+                del self._domain_semaphores[domain]
+
+    async def _download(self, url: str) -> tuple[bytes, Optional[str], str]:
+        """Body prefix, declared charset and final URL of an HTML page."""
+        started = time.perf_counter()
+        result = "error"
+        try:
+            # Wait for the store's slot first so one busy store cannot hold global slots
+            store = extract_store_from_url(url) or urlparse(url).hostname or ""
+            async with self._domain_slot(store), self._semaphore:
+                page = await fetch_public_url(
+                    self._client,
+                    url,
+                    max_bytes=self._max_bytes,
+                    content_type="html",
+                )
+            result = "ok"
+            return page
+        except LinkFetchError as e:
+            result = e.result
+            raise
+        finally:
+            LINK_FETCHES.labels(result).inc()
+            LINK_FETCH_DURATION.observe(time.perf_counter() - started)
+
+
+class _PublicNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Opens connections to global addresses only.
+
+    The host is resolved, checked and dialled in one step, on the exact
+    address that passed the check, so a DNS answer that changes in between
+    (DNS rebinding) cannot point a fetch into our own network. TLS still
+    verifies the certificate against the host name.
+    """
+
+    def __init__(self) -> None:
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        error: Optional[Exception] = None
+        for address in await _public_addresses(host, port):
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error or LinkFetchError(f"Cannot resolve {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        raise LinkFetchError("Unix sockets are not fetched", "blocked")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _PublicHTTPTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connections go through _PublicNetworkBackend."""
+
+    def __init__(self, limits: httpx.Limits = httpx.Limits()) -> None:
+        # Not calling super().__init__(): it would build a default pool of its
+        # own, and the pool is all the inherited request and close methods use
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_PublicNetworkBackend(),
+        )
+
+
+def public_http_client(allow_private_hosts: bool = False, **kwargs: Any) -> httpx.AsyncClient:
+    """
+    httpx client for user-supplied URLs.
+
+    Unless `allow_private_hosts` is set, it refuses to connect to private,
+    loopback and other non-global addresses, whatever the URL's host name
+    resolves to at connection time.
+    """
+    if allow_private_hosts:
+        return httpx.AsyncClient(**kwargs)
+    return httpx.AsyncClient(transport=_PublicHTTPTransport(), **kwargs)
+
+
+async def fetch_public_url(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int,
+    content_type: str,
+    truncate: bool = True,
+) -> tuple[bytes, Optional[str], str]:
+    """
+    GET a user-supplied URL: body, declared charset and final URL.
+
+    `client` should come from public_http_client, which refuses private
+    addresses on every connection, redirects included; redirects are
+    followed here so each hop's scheme is checked too. Responses whose
+    Content-Type lacks `content_type` are refused. Bodies over `max_bytes`
+    are cut there, or refused when `truncate` is false.
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        _check_url(url)
+        async with client.stream("GET", url) as response:
+            location = response.headers.get("location")
+            if response.is_redirect and location:
+                url = urljoin(url, location)
+                continue
+            if response.status_code != 200:
+                raise LinkFetchError(f"HTTP {response.status_code}", "http_error")
+            declared_type = response.headers.get("content-type", "")
+            if declared_type and content_type not in declared_type:
+                raise LinkFetchError(f"Unexpected content type {declared_type}", "wrong_type")
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > max_bytes:
+                    if not truncate:
+                        raise LinkFetchError(f"Larger than {max_bytes} bytes", "too_large")
+                    break
+            return bytes(body[:max_bytes]), response.charset_encoding, url
+    raise LinkFetchError("Too many redirects")
+
+
+def _check_url(url: str) -> None:
+    """Refuse URLs that are not plain web pages."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise LinkFetchError(f"Unsupported URL {url}", "blocked")
+
+
+async def _public_addresses(host: str, port: int) -> list[str]:
+    """Addresses of `host`, refusing it if any of them is not global."""
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+    except socket.gaierror as e:
+        raise LinkFetchError(f"Cannot resolve {host}: {e}")
+    public: list[str] = []
+    for *_, sockaddr in addresses:
+        try:
+            address = ipaddress.ip_address(sockaddr[0])
+        except ValueError:
+            # e.g. a scoped IPv6 address; those are link-local anyway
+            address = None
+        if address is None or not address.is_global:
+            raise LinkFetchError(f"{host} resolves to {sockaddr[0]}", "blocked")
+        if sockaddr[0] not in public:
+            public.append(sockaddr[0])
+    return public
@@ -1,5 +1,5 @@
 """Infrastructure utilities."""
 
-from .url_parser import extract_store_from_url
+from .url_parser import extract_store_from_url, normalize_url
 
-__all__ = ["extract_store_from_url"]
+__all__ = ["extract_store_from_url", "normalize_url"]
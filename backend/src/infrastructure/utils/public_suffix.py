@@ -0,0 +1,134 @@
+"""
+Public suffix list lookups.
+Finds the registrable domain of a host (shop.nike.com -> nike.com,
+m.ozon.ru -> ozon.ru, shop.example.co.uk -> example.co.uk).
+"""
+
+import ipaddress
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Installed by the `publicsuffix` system package
+SYSTEM_LIST_PATH = Path("/usr/share/publicsuffix/public_suffix_list.dat")
+
+# Multi-label suffixes common in our users' links, used when the system list
+# is missing. Single-label TLDs need no rule: an unknown TLD is a suffix.
+_FALLBACK_RULES = (
+    "com.ru", "net.ru", "org.ru", "pp.ru", "msk.ru", "spb.ru",
+    "com.ua", "kiev.ua", "com.by", "com.kz", "org.kz",
+    "co.uk", "org.uk", "com.au", "co.jp", "co.kr", "com.cn", "com.tr",
+    "com.br", "com.mx", "com.ar", "co.in", "co.il", "co.nz", "co.za",
+    "github.io", "myshopify.com", "tilda.ws", "ucoz.ru", "narod.ru",
+)
+
+# Trie node keys that cannot be domain labels
+_END = "."
+_EXCEPTION = "!"
+
+
+class PublicSuffixList:
+    """
+    Public suffix rules compiled into a trie of reversed labels.
+
+    Follows the publicsuffix.org algorithm: the longest matching rule wins,
+    "*" matches any single label, "!" exceptions override wildcards, and a
+    host matching no rule has its last label as the suffix. Results are
+    memoized in an LRU of `cache_size` hosts, since links to a few large
+    stores dominate.
+    """
+
+    def __init__(self, rules: Iterable[str], cache_size: int = 10000):
+        self._root: dict = {}
+        for rule in rules:
+            self._add(rule)
+        self.registrable_domain = lru_cache(maxsize=cache_size)(self._registrable_domain)
+
+    @classmethod
+    def from_file(cls, path: Path, cache_size: int = 10000) -> "PublicSuffixList":
+        """Load a list in the publicsuffix.org format (ICANN and private sections)."""
+        with open(path, encoding="utf-8") as file:
+            rules = [
+                line.split()[0]
+                for line in file
+                if line.strip() and not line.startswith("//")
+            ]
+        return cls(rules, cache_size)
+
+    def _add(self, rule: str) -> None:
+        rule = rule.strip().lower()
+        exception = rule.startswith("!")
+        labels = rule.lstrip("!").split(".")[::-1]
+        node = self._root
+        for label in labels[:-1]:
+            node = node.setdefault(label, {})
+        if exception:
+            node[_EXCEPTION + labels[-1]] = True
+        else:
+            node.setdefault(labels[-1], {})[_END] = True
+
+    def _suffix_length(self, labels: list[str]) -> int:
+        """Number of trailing labels of a host that form its public suffix."""
+        best = 1
+        nodes = [self._root]
+        for depth, label in enumerate(labels, start=1):
+            next_nodes = []
+            for node in nodes:
+                if _EXCEPTION + label in node:
+                    # "!www.ck": the rule minus its leftmost label is the suffix
+                    return depth - 1
+                for key in (label, "*"):
+                    child = node.get(key)
+                    if child is not None:
+                        next_nodes.append(child)
+                        if _END in child:
+                            best = max(best, depth)
+            if not next_nodes:
+                break
+            nodes = next_nodes
+        return best
+
+    def public_suffix(self, host: str) -> str:
+        labels = _labels(host)
+        return ".".join(labels[:self._suffix_length(labels)][::-1])
+
+    def _registrable_domain(self, host: str) -> Optional[str]:
+        """Public suffix plus one label; the host itself for IPs; None for bare suffixes."""
+        host = host.strip().rstrip(".").lower()
+        if not host:
+            return None
+        try:
+            ipaddress.ip_address(host.strip("[]"))
+            return host
+        except ValueError:
+            pass
+        labels = _labels(host)
+        length = self._suffix_length(labels)
+        if len(labels) <= length:
+            return host if len(labels) == 1 else None
+        return ".".join(labels[:length + 1][::-1])
+
+
+def _labels(host: str) -> list[str]:
+    """Reversed labels of a host, with punycode decoded as the list is in Unicode."""
+    labels = host.strip().rstrip(".").lower().split(".")[::-1]
+    if any(label.startswith("xn--") for label in labels):
+        try:
+            labels = [label.encode("ascii").decode("idna") for label in labels]
+        except UnicodeError:
+            pass
+    return labels
+
+
+@lru_cache
+def get_public_suffix_list() -> PublicSuffixList:
+    """The system public suffix list, or a small built-in one if it is missing."""
+    if SYSTEM_LIST_PATH.exists():
+        return PublicSuffixList.from_file(SYSTEM_LIST_PATH)
+    logger.warning(
+        f"{SYSTEM_LIST_PATH} not found, using a built-in list of common suffixes"
+    )
+    return PublicSuffixList(_FALLBACK_RULES)
@@ -1,16 +1,27 @@
 """URL parsing utilities."""
 
-from urllib.parse import urlparse
+from urllib.parse import urlencode, urlparse, urlunparse, parse_qsl
 from typing import Optional
 
+from .public_suffix import get_public_suffix_list
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"gclid", "yclid", "ysclid", "fbclid", "_openstat"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
 
 def extract_store_from_url(url: Optional[str]) -> Optional[str]:
     """
     Extract store/domain name from URL.
 
+    The store is the registrable domain per the public suffix list, so
+    subdomains of one store count as the same store.
+
     Examples:
         'https://www.amazon.com/product/123' -> 'amazon.com'
         'https://shop.nike.com/shoes' -> 'nike.com'
+        'https://m.ozon.ru/item' -> 'ozon.ru'
+        'https://www.example.co.uk/item' -> 'example.co.uk'
         'http://ozon.ru/item' -> 'ozon.ru'
         None -> None
         'invalid-url' -> None
@@ -25,20 +36,57 @@ def extract_store_from_url(url: Optional[str]) -> Optional[str]:
         return None
 
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc or parsed.path.split('/')[0]
+        parsed = urlparse(url.strip())
+        if not parsed.netloc and not parsed.scheme:
+            # Pasted without a scheme: 'ozon.ru/item'
+            parsed = urlparse(f"//{url.strip()}")
+        domain = parsed.hostname
 
-        if not domain:
+        if not domain or "." not in domain:
             return None
 
-        # Remove 'www.' prefix if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
+        return get_public_suffix_list().registrable_domain(domain)
+    except ValueError:
+        return None
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of an http(s) URL, for use as a cache key.
+
+    Lower-cases the scheme and host, drops the default port, the fragment
+    and tracking parameters (utm_*, gclid, ...) and sorts the query.
+
+    Examples:
+        'HTTPS://Www.Ozon.ru:443/product/1/?utm_source=tg&b=2&a=1#reviews'
+            -> 'https://www.ozon.ru/product/1/?a=1&b=2'
+        'ftp://example.com/file' -> None
+
+    Args:
+        url: The URL to normalize
+
+    Returns:
+        The normalized URL or None if it is not a valid http(s) URL
+    """
+    if not url:
+        return None
+
+    try:
+        parsed = urlparse(url.strip())
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname
+        if scheme not in _DEFAULT_PORTS or not host:
+            return None
 
-        # Remove port if present
-        if ':' in domain:
-            domain = domain.split(':')[0]
+        netloc = host
+        if parsed.port is not None and parsed.port != _DEFAULT_PORTS[scheme]:
+            netloc = f"{host}:{parsed.port}"
 
-        return domain if domain else None
-    except Exception:
+        query = sorted(
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+        )
+        return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, urlencode(query), ""))
+    except ValueError:
         return None
@@ -2,26 +2,120 @@
 FastAPI application entry point.
 """
 
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
 from contextlib import asynccontextmanager
+from typing import Callable
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api.routes import users_router, wishlists_router, wishes_router
+from src.api.middleware import DbPositionMiddleware, MetricsMiddleware, SqlProfilerMiddleware
+from src.api.routes import (
+    avatars_router,
+    images_router,
+    notifications_router,
+    users_router,
+    wishlists_router,
+    wishes_router,
+)
 from src.config import get_settings
-from src.infrastructure.database import close_db, init_db
-
+from src.infrastructure.cache import INVALIDATION_CHANNEL, entity_cache
+from src.infrastructure.database import DB_POSITION_HEADER, close_db, get_engine
+from src.infrastructure.metrics import is_multiprocess, mark_worker_dead, start_metrics_server
+from src.infrastructure.migrations import ensure_schema
+from src.infrastructure.notifications import PgNotificationListener
+from src.services import create_outbox_relay, create_wish_enricher
+from src.services.images import image_proxy
+from src.services.live_updates import wishlist_hub
+from src.services.outbox import OUTBOX_CHANNEL
+
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _on_exit_signal(callback: Callable[[], None]) -> None:
+    """
+    Run callback as soon as SIGINT or SIGTERM arrives, then the server's handler.
+
+    uvicorn only runs lifespan shutdown after open responses have finished
+    (or shutdown_timeout ran out), so work that makes them finish must
+    start from the signal itself.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+
+        def handler(signum, frame, previous=previous):
+            loop.call_soon_threadsafe(callback)
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(sig, handler)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
-    await init_db()
+    await ensure_schema(get_engine(), settings.db_startup_policy)
+    if settings.metrics_enabled and not is_multiprocess():
+        if multiprocessing.parent_process() is None:
+            start_metrics_server(settings.metrics_port, settings.metrics_host)
+        else:
+            # A worker of a plain `uvicorn --workers N`: every worker would
+            # bind the same port, and each would only see its own share
+            logger.warning(
+                "Metrics are only served per process; run `python -m src.server` "
+                "to expose metrics aggregated across workers"
+            )
+    listener = PgNotificationListener(
+        settings.db_listen_url or settings.database_url,
+        heartbeat_interval=settings.db_listen_heartbeat_interval,
+    )
+    if settings.cache_enabled:
+        listener.add_channel(
+            INVALIDATION_CHANNEL,
+            entity_cache.on_notify,
+            entity_cache.on_connect,
+            entity_cache.on_disconnect,
+        )
+    if settings.live_updates_enabled:
+        listener.add_channel(
+            OUTBOX_CHANNEL,
+            wishlist_hub.on_notify,
+            wishlist_hub.on_connect,
+            wishlist_hub.on_disconnect,
+        )
+        wishlist_hub.start()
+        # Open streams would otherwise hold every shutdown for shutdown_timeout
+        _on_exit_signal(wishlist_hub.close_streams)
+    if listener.has_channels:
+        listener.start()
+    enricher = None
+    if settings.link_enrichment_enabled:
+        enricher = create_wish_enricher(settings)
+        enricher.start()
+    outbox_relay = None
+    if settings.outbox_relay_enabled:
+        outbox_relay = create_outbox_relay(settings, enricher)
+        outbox_relay.start()
     yield
     # Shutdown
+    if outbox_relay is not None:
+        await outbox_relay.close()
+    if enricher is not None:
+        await enricher.close()
+    await wishlist_hub.close()
+    await image_proxy.close()
+    await listener.close()
     await close_db()
+    mark_worker_dead()
 
 
 def create_app() -> FastAPI:
@@ -42,12 +136,32 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[DB_POSITION_HEADER],
     )
 
+    # Read-your-writes position for clients of a read replica
+    if settings.database_replica_url:
+        app.add_middleware(DbPositionMiddleware)
+
+    # SQL profiler middleware
+    if settings.sql_profiler_enabled:
+        app.add_middleware(
+            SqlProfilerMiddleware,
+            n_plus_one_threshold=settings.n_plus_one_threshold,
+            strict=settings.sql_profiler_strict,
+        )
+
+    # Metrics middleware (outermost, so it times the whole request)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
     # Include routers
     app.include_router(users_router, prefix="/api/v1")
     app.include_router(wishlists_router, prefix="/api/v1")
     app.include_router(wishes_router, prefix="/api/v1")
+    app.include_router(images_router, prefix="/api/v1")
+    app.include_router(avatars_router, prefix="/api/v1")
+    app.include_router(notifications_router, prefix="/api/v1")
 
     # Health check
     @app.get("/health", tags=["health"])
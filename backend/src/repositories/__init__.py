@@ -1,6 +1,8 @@
 from .user_repository import UserRepository
 from .wishlist_repository import WishlistRepository
+from .outbox_repository import OutboxRepository
+from .bot_notification_repository import BotNotificationRepository
 
 from .wish import WishRepository
 
-__all__ = ["UserRepository", "WishlistRepository", "WishRepository"]
+__all__ = ["UserRepository", "WishlistRepository", "WishRepository", "OutboxRepository", "BotNotificationRepository"]
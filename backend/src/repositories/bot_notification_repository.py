@@ -0,0 +1,85 @@
+"""
+Bot notification repository for database operations.
+Repository layer handles only database interactions.
+"""
+
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Text, column, delete, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import BotNotification
+from src.infrastructure.models import BotNotificationModel, UserModel
+
+
+class BotNotificationRepository:
+    """Repository for messages queued for the bot."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add_many(self, notices: list[tuple[int, UUID, str]]) -> None:
+        """
+        Queue (outbox event ID, user ID, text) messages in one statement.
+
+        Users that no longer exist are skipped, and so are events already
+        queued by an earlier delivery.
+        """
+        rows = values(
+            column("outbox_event_id", BigInteger),
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("text", Text),
+            name="notice",
+        ).data(notices)
+        stmt = (
+            insert(BotNotificationModel)
+            .from_select(
+                ["outbox_event_id", "telegram_id", "text"],
+                select(rows.c.outbox_event_id, UserModel.telegram_id, rows.c.text)
+                .join(UserModel, UserModel.id == rows.c.user_id),
+            )
+            .on_conflict_do_nothing(index_elements=["outbox_event_id"])
+        )
+        await self._session.execute(stmt)
+
+    async def claim(self, limit: int, claim_timeout: float) -> list[BotNotification]:
+        """
+        Claim the oldest unclaimed messages for `claim_timeout` seconds.
+
+        Messages the bot does not acknowledge in time are handed out again.
+        """
+        claimable = (
+            select(BotNotificationModel.id)
+            .where(
+                or_(
+                    BotNotificationModel.claimed_until.is_(None),
+                    BotNotificationModel.claimed_until < func.now(),
+                )
+            )
+            .order_by(BotNotificationModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(BotNotificationModel)
+            .where(BotNotificationModel.id.in_(claimable.scalar_subquery()))
+            .values(claimed_until=func.now() + timedelta(seconds=claim_timeout))
+            .returning(
+                BotNotificationModel.id,
+                BotNotificationModel.telegram_id,
+                BotNotificationModel.text,
+            )
+        )
+        result = await self._session.execute(stmt)
+        return sorted(
+            (BotNotification(id=row.id, telegram_id=row.telegram_id, text=row.text) for row in result),
+            key=lambda notification: notification.id,
+        )
+
+    async def delete(self, notification_ids: list[int]) -> None:
+        """Remove messages the bot has taken over."""
+        await self._session.execute(
+            delete(BotNotificationModel).where(BotNotificationModel.id.in_(notification_ids))
+        )
@@ -0,0 +1,127 @@
+"""
+Outbox repository for database operations.
+Repository layer handles only database interactions.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import OutboxEvent
+from src.infrastructure.models import OutboxModel
+
+
+class OutboxRepository:
+    """Repository for outbox events."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    def add(
+        self,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: UUID,
+        payload: dict[str, Any],
+    ) -> None:
+        """Record an event; it is written when the surrounding transaction flushes."""
+        self._session.add(
+            OutboxModel(
+                event_type=event_type,
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                payload=payload,
+            )
+        )
+
+    async def claim_batch(
+        self, limit: int, max_attempts: int, claim_timeout: float
+    ) -> list[OutboxEvent]:
+        """
+        Claim the oldest deliverable events for `claim_timeout` seconds.
+
+        The claim is a timestamp on the rows, so it holds once the
+        transaction commits and sinks can be called outside it. Rows being
+        claimed by another relay are skipped rather than waited on, and a
+        relay that dies mid-batch leaves its events to others once the
+        claim runs out.
+        """
+        claimable = (
+            select(OutboxModel.id)
+            .where(
+                OutboxModel.attempts < max_attempts,
+                or_(
+                    OutboxModel.claimed_until.is_(None),
+                    OutboxModel.claimed_until < func.now(),
+                ),
+            )
+            .order_by(OutboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxModel)
+            .where(OutboxModel.id.in_(claimable.scalar_subquery()))
+            .values(claimed_until=func.now() + timedelta(seconds=claim_timeout))
+            .returning(OutboxModel)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        models = sorted(result.scalars().all(), key=lambda model: model.id)
+        return [self._to_entity(model) for model in models]
+
+    async def delete(self, event_ids: list[int]) -> None:
+        """Remove events delivered to every sink."""
+        await self._session.execute(
+            delete(OutboxModel).where(OutboxModel.id.in_(event_ids))
+        )
+
+    async def mark_failed(self, failures: list[tuple[OutboxEvent, list[str], str]]) -> None:
+        """
+        Release events some sink failed on, counting the attempt.
+
+        Each failure is (event, sinks that have now received it, error);
+        the sinks are remembered so the retry goes only to the others.
+        """
+        await self._session.execute(
+            update(OutboxModel),
+            [
+                {
+                    "id": event.id,
+                    "attempts": event.attempts + 1,
+                    "delivered_to": delivered_to,
+                    "last_error": error[:1000],
+                    "claimed_until": None,
+                }
+                for event, delivered_to, error in failures
+            ],
+        )
+
+    async def get_stats(self, max_attempts: int) -> tuple[int, Optional[datetime], int]:
+        """Get (pending events, oldest pending created_at, dead events)."""
+        pending = OutboxModel.attempts < max_attempts
+        stmt = select(
+            func.count().filter(pending),
+            func.min(OutboxModel.created_at).filter(pending),
+            func.count().filter(~pending),
+        )
+        result = await self._session.execute(stmt)
+        count, oldest, dead = result.one()
+        return count, oldest, dead
+
+    @staticmethod
+    def _to_entity(model: OutboxModel) -> OutboxEvent:
+        """Convert ORM model to domain entity."""
+        return OutboxEvent(
+            id=model.id,
+            event_type=model.event_type,
+            aggregate_type=model.aggregate_type,
+            aggregate_id=model.aggregate_id,
+            payload=model.payload,
+            attempts=model.attempts,
+            created_at=model.created_at,
+            delivered_to=list(model.delivered_to),
+        )
@@ -3,15 +3,37 @@ User repository for database operations.
 Repository layer handles only database interactions.
 """
 
+from datetime import datetime
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    and_,
+    extract,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, noload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.entities import User, UserCreate, UserUpdate
-from src.infrastructure.models import UserModel
+from src.domain.entities import (
+    DEFAULT_WISHLIST_DESCRIPTION,
+    DEFAULT_WISHLIST_TITLE,
+    User,
+    UserCreate,
+    UserUpdate,
+)
+from src.infrastructure.cache import entity_cache, mark_changed
+from src.infrastructure.models import UserModel, WishlistModel, WishModel
+from src.infrastructure.models.user import user_friends
 
 
 class UserRepository:
@@ -22,17 +44,42 @@ class UserRepository:
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by UUID."""
+        cached = entity_cache.get(self._session, "user", user_id)
+        if cached is not None:
+            return cached
+
+        generation = entity_cache.generation
         stmt = select(UserModel).where(UserModel.id == user_id)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        user = self._to_entity(model)
+        self._cache(user, generation)
+        return user
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID."""
+        # telegram_id never changes, so its mapping to the UUID is never invalidated
+        user_id = entity_cache.get(self._session, "user_tg", telegram_id)
+        if user_id is not None:
+            cached = entity_cache.get(self._session, "user", user_id)
+            if cached is not None:
+                return cached
+
+        generation = entity_cache.generation
         stmt = select(UserModel).where(UserModel.telegram_id == telegram_id)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        user = self._to_entity(model)
+        self._cache(user, generation)
+        return user
+
+    def _cache(self, user: User, generation: int) -> None:
+        entity_cache.put(self._session, "user", user.id, user, generation)
+        entity_cache.put(self._session, "user_tg", user.telegram_id, user.id, generation)
 
     async def create(self, data: UserCreate) -> User:
         """Create a new user."""
@@ -49,6 +96,110 @@ class UserRepository:
         await self._session.refresh(model)
         return self._to_entity(model)
 
+    async def upsert(self, data: UserCreate) -> tuple[User, bool]:
+        """Insert or update one user by telegram_id; see upsert_many."""
+        return (await self.upsert_many([data]))[0]
+
+    async def upsert_many(self, items: list[UserCreate]) -> list[tuple[User, bool]]:
+        """
+        Insert or update users by telegram_id in a single statement.
+
+        Nullable fields that are None keep their stored value. Rows that would
+        not change are not rewritten, so repeated /start presses leave neither
+        dead tuples nor a new updated_at. New users get their default wishlist
+        from a second CTE of the same statement; ON CONFLICT lets only one of
+        several concurrent inserts of a telegram_id see its row as new.
+
+        Returns each user with True if the row was inserted. Telegram IDs must
+        be unique within `items`.
+        """
+        if not items:
+            return []
+
+        users = UserModel.__table__
+        wishlists = WishlistModel.__table__
+
+        insert_users = pg_insert(users).values([
+            {
+                "id": uuid4(),
+                "telegram_id": item.telegram_id,
+                "username": item.username,
+                "first_name": item.first_name,
+                "last_name": item.last_name,
+                "avatar_url": item.avatar_url,
+                "birth_date": item.birth_date,
+            }
+            for item in items
+        ])
+        excluded = insert_users.excluded
+        new_values = {
+            "username": func.coalesce(excluded.username, users.c.username),
+            "first_name": excluded.first_name,
+            "last_name": func.coalesce(excluded.last_name, users.c.last_name),
+            "avatar_url": func.coalesce(excluded.avatar_url, users.c.avatar_url),
+            "birth_date": func.coalesce(excluded.birth_date, users.c.birth_date),
+        }
+        upserted = (
+            insert_users.on_conflict_do_update(
+                index_elements=[users.c.telegram_id],
+                set_={**new_values, "updated_at": func.now()},
+                where=tuple_(*(users.c[name] for name in new_values)).is_distinct_from(
+                    tuple_(*new_values.values())
+                ),
+            )
+            # xmax is 0 only for rows this statement inserted
+            .returning(*users.c, literal_column("xmax = 0").label("is_new"))
+            .cte("upserted")
+        )
+
+        default_wishlists = (
+            pg_insert(wishlists)
+            .from_select(
+                ["id", "user_id", "title", "description", "is_public", "is_default"],
+                select(
+                    func.gen_random_uuid(),
+                    upserted.c.id,
+                    literal(DEFAULT_WISHLIST_TITLE),
+                    literal(DEFAULT_WISHLIST_DESCRIPTION),
+                    true(),
+                    true(),
+                ).where(upserted.c.is_new),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[wishlists.c.user_id],
+                index_where=wishlists.c.is_default,
+            )
+            .cte("default_wishlists")
+        )
+
+        # Unchanged rows are skipped by DO UPDATE ... WHERE and return nothing
+        telegram_ids = [item.telegram_id for item in items]
+        unchanged = select(*users.c, false().label("is_new"), false().label("written")).where(
+            users.c.telegram_id.in_(telegram_ids),
+            users.c.telegram_id.not_in(select(upserted.c.telegram_id)),
+        )
+        stmt = (
+            select(upserted, true().label("written"))
+            .union_all(unchanged)
+            .add_cte(default_wishlists)
+        )
+
+        result = await self._session.execute(stmt)
+        fetched = result.all()
+        rows = [(self._to_entity(row), row.is_new) for row in fetched]
+        # Only inserted or updated rows invalidate other workers' caches
+        mark_changed(self._session, "user", *(row.id for row in fetched if row.written))
+
+        if len(rows) < len(items):
+            # A concurrent insert committed after this statement's snapshot was taken
+            seen = {user.telegram_id for user, _ in rows}
+            for telegram_id in telegram_ids:
+                if telegram_id not in seen:
+                    user = await self.get_by_telegram_id(telegram_id)
+                    if user is not None:
+                        rows.append((user, False))
+        return rows
+
     async def update(self, user_id: UUID, data: UserUpdate) -> Optional[User]:
         """Update an existing user."""
         update_data = {}
@@ -76,7 +227,10 @@ class UserRepository:
         )
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        mark_changed(self._session, "user", model.id)
+        return self._to_entity(model)
 
     async def update_by_telegram_id(
         self, telegram_id: int, data: UserUpdate
@@ -107,7 +261,10 @@ class UserRepository:
         )
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        mark_changed(self._session, "user", model.id)
+        return self._to_entity(model)
 
     async def get_friends(self, user_id: UUID) -> list[User]:
         """
@@ -126,6 +283,100 @@ class UserRepository:
             
         return [self._to_entity(friend) for friend in user.friends]
 
+    async def get_birthday_followers(
+        self,
+        month_days: list[tuple[int, int]],
+        after_telegram_id: int,
+        limit: int,
+    ) -> list[tuple[int, User]]:
+        """
+        Followers of users whose birthday falls on one of `month_days`.
+
+        Pages by follower: returns (follower telegram_id, birthday user) pairs
+        for the first `limit` followers with telegram_id above
+        `after_telegram_id`, ordered by follower. Uses the (month, day)
+        expression index and the reverse user_friends index.
+        """
+        month = extract("month", UserModel.birth_date)
+        day = extract("day", UserModel.birth_date)
+        celebrants = (
+            select(UserModel.id)
+            .where(
+                UserModel.birth_date.is_not(None),
+                or_(*(and_(month == m, day == d) for m, d in month_days)),
+            )
+            .cte("celebrants")
+        )
+
+        follower = aliased(UserModel, name="follower")
+        recipients = (
+            select(follower.id, follower.telegram_id)
+            .join(user_friends, user_friends.c.user_id == follower.id)
+            .where(
+                user_friends.c.friend_id.in_(select(celebrants.c.id)),
+                follower.telegram_id > after_telegram_id,
+            )
+            .distinct()
+            .order_by(follower.telegram_id)
+            .limit(limit)
+            .cte("recipients")
+        )
+
+        stmt = (
+            select(recipients.c.telegram_id, UserModel)
+            .select_from(recipients)
+            .join(user_friends, user_friends.c.user_id == recipients.c.id)
+            .join(UserModel, UserModel.id == user_friends.c.friend_id)
+            .where(UserModel.id.in_(select(celebrants.c.id)))
+            .order_by(recipients.c.telegram_id, UserModel.first_name)
+            .options(noload(UserModel.friends))
+        )
+        result = await self._session.execute(stmt)
+        return [(telegram_id, self._to_entity(model)) for telegram_id, model in result.all()]
+
+    async def get_active_users(
+        self,
+        since: datetime,
+        stale_avatar_prefix: str,
+        after_telegram_id: int,
+        limit: int,
+    ) -> list[tuple[int, Optional[str]]]:
+        """
+        (telegram_id, avatar_url) of users active since `since`, by telegram_id.
+
+        A user is active when their profile or one of their wishlists or
+        wishes changed since then. Users whose avatar_url still starts with
+        `stale_avatar_prefix` are included regardless, so old links get
+        replaced once.
+        """
+        wish_activity = (
+            select(WishModel.id)
+            .join(WishlistModel, WishlistModel.id == WishModel.wishlist_id)
+            .where(WishlistModel.user_id == UserModel.id, WishModel.updated_at >= since)
+            .exists()
+        )
+        wishlist_activity = (
+            select(WishlistModel.id)
+            .where(WishlistModel.user_id == UserModel.id, WishlistModel.updated_at >= since)
+            .exists()
+        )
+        stmt = (
+            select(UserModel.telegram_id, UserModel.avatar_url)
+            .where(
+                UserModel.telegram_id > after_telegram_id,
+                or_(
+                    UserModel.updated_at >= since,
+                    UserModel.avatar_url.startswith(stale_avatar_prefix, autoescape=True),
+                    wishlist_activity,
+                    wish_activity,
+                ),
+            )
+            .order_by(UserModel.telegram_id)
+            .limit(limit)
+        )
+        result = await self._session.execute(stmt)
+        return [(telegram_id, avatar_url) for telegram_id, avatar_url in result.all()]
+
     async def add_friend(self, user_id: UUID, friend_id: UUID) -> bool:
         """Subscribe to a user."""
         if user_id == friend_id:
@@ -190,6 +441,17 @@ class UserRepository:
             
         return any(f.id == friend_id for f in user.friends)
 
+    async def get_friend_ids(self, user_id: UUID, candidate_ids: list[UUID]) -> set[UUID]:
+        """Get which of the candidates the user is subscribed to, in one query."""
+        if not candidate_ids:
+            return set()
+        stmt = select(user_friends.c.friend_id).where(
+            user_friends.c.user_id == user_id,
+            user_friends.c.friend_id.in_(candidate_ids),
+        )
+        result = await self._session.execute(stmt)
+        return set(result.scalars().all())
+
     async def search_users(self, query: str, exclude_user_id: Optional[UUID] = None) -> list[User]:
         """Search users by username or name."""
         stmt = select(UserModel)
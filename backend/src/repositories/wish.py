@@ -2,15 +2,19 @@
 Wish repository implementation.
 """
 
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import and_, select, delete, func, literal_column, update, case, or_, text, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.entities.wish import Wish
+from src.domain.entities.wish import StoreStats, Wish, WishSearchHit
+from src.infrastructure.cache import entity_cache, mark_changed
 from src.infrastructure.models.wish import WishModel
 from src.infrastructure.models.wishlist import WishlistModel
+from src.infrastructure.models.user import UserModel, user_friends
+from src.infrastructure.utils import extract_store_from_url
 
 
 class WishRepository:
@@ -28,6 +32,7 @@ class WishRepository:
             subtitle=wish.subtitle,
             description=wish.description,
             link=wish.link,
+            store_domain=extract_store_from_url(wish.link),
             image_url=wish.image_url,
             price=wish.price,
             currency=wish.currency,
@@ -41,16 +46,31 @@ class WishRepository:
         await self._session.flush()
         return wish
 
-    async def get_by_id(self, wish_id: UUID) -> Optional[Wish]:
-        """Get wish by ID."""
+    async def get_by_id(self, wish_id: UUID, for_update: bool = False) -> Optional[Wish]:
+        """
+        Get wish by ID.
+
+        With `for_update`, the row is locked until the transaction ends, so
+        a change based on it cannot overwrite a concurrent one.
+        """
+        cached = None if for_update else entity_cache.get(self._session, "wish", wish_id)
+        if cached is not None:
+            return cached
+
+        generation = entity_cache.generation
         stmt = select(WishModel).where(WishModel.id == wish_id)
+        if for_update:
+            # Refresh a copy this session loaded before taking the lock
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
 
         if not model:
             return None
 
-        return self._to_entity(model)
+        wish = self._to_entity(model)
+        entity_cache.put(self._session, "wish", wish_id, wish, generation)
+        return wish
 
     async def get_by_wishlist_id(self, wishlist_id: UUID) -> List[Wish]:
         """Get all wishes for a wishlist, sorted by priority and creation date."""
@@ -76,8 +96,164 @@ class WishRepository:
         result = await self._session.execute(stmt)
         return result.scalar_one() or 0
 
+    async def count_by_user_ids(self, user_ids: list[UUID]) -> dict[UUID, int]:
+        """Count wishes per user for several users in one query; users without wishes are omitted."""
+        if not user_ids:
+            return {}
+        stmt = (
+            select(WishlistModel.user_id, func.count(WishModel.id))
+            .join(WishlistModel, WishModel.wishlist_id == WishlistModel.id)
+            .where(WishlistModel.user_id.in_(user_ids))
+            .group_by(WishlistModel.user_id)
+        )
+        result = await self._session.execute(stmt)
+        return {user_id: count for user_id, count in result.all()}
+
+    async def get_friends_top_stores(self, user_id: UUID, limit: int) -> list[StoreStats]:
+        """
+        Stores most linked from the wishes of the users `user_id` follows,
+        ranked by how many of them want something there, then by wish count.
+        """
+        wish_count = func.count(WishModel.id).label("wish_count")
+        friend_count = func.count(func.distinct(WishlistModel.user_id)).label("friend_count")
+        stmt = (
+            select(WishModel.store_domain, wish_count, friend_count)
+            .select_from(user_friends)
+            .join(WishlistModel, WishlistModel.user_id == user_friends.c.friend_id)
+            .join(WishModel, WishModel.wishlist_id == WishlistModel.id)
+            .where(user_friends.c.user_id == user_id, WishModel.store_domain.is_not(None))
+            .group_by(WishModel.store_domain)
+            .order_by(friend_count.desc(), wish_count.desc(), WishModel.store_domain)
+            .limit(limit)
+        )
+        result = await self._session.execute(stmt)
+        return [
+            StoreStats(store_domain=store, wish_count=wishes, friend_count=friends)
+            for store, wishes, friends in result.all()
+        ]
+
+    async def search_friends_wishes(
+        self,
+        user_id: UUID,
+        query: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        is_booked: Optional[bool] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[WishSearchHit]:
+        """
+        Wishes on public wishlists of the users `user_id` follows matching
+        a web-search style `query`, most relevant first.
+
+        The query is parsed with both the Russian and English configurations
+        and either may match, as in the search_vector column. Matching runs
+        on its GIN index; price and booking filters apply in the same query.
+        """
+        parsed = func.websearch_to_tsquery(literal_column("'russian'::regconfig"), query).op("||")(
+            func.websearch_to_tsquery(literal_column("'english'::regconfig"), query)
+        )
+        search = select(parsed.label("query")).subquery("search")
+        rank = func.ts_rank_cd(WishModel.search_vector, search.c.query).label("rank")
+
+        stmt = (
+            select(WishModel, UserModel.telegram_id, UserModel.first_name, UserModel.username, rank)
+            .select_from(user_friends)
+            .join(UserModel, UserModel.id == user_friends.c.friend_id)
+            .join(
+                WishlistModel,
+                and_(WishlistModel.user_id == user_friends.c.friend_id, WishlistModel.is_public),
+            )
+            .join(WishModel, WishModel.wishlist_id == WishlistModel.id)
+            .join(search, true())
+            .where(
+                user_friends.c.user_id == user_id,
+                WishModel.search_vector.op("@@")(search.c.query),
+            )
+            .order_by(rank.desc(), WishModel.created_at.desc(), WishModel.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        if min_price is not None:
+            stmt = stmt.where(WishModel.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(WishModel.price <= max_price)
+        if is_booked is not None:
+            stmt = stmt.where(WishModel.is_booked.is_(is_booked))
+
+        result = await self._session.execute(stmt)
+        return [
+            WishSearchHit(
+                wish=self._to_entity(model),
+                owner_telegram_id=telegram_id,
+                owner_first_name=first_name,
+                owner_username=username,
+                rank=score,
+            )
+            for model, telegram_id, first_name, username, score in result.all()
+        ]
+
+    async def get_links_without_store(
+        self, after_id: Optional[UUID], limit: int
+    ) -> list[tuple[UUID, str]]:
+        """(id, link) of wishes with a link but no store_domain, in id order after `after_id`."""
+        stmt = (
+            select(WishModel.id, WishModel.link)
+            .where(WishModel.link.is_not(None), WishModel.store_domain.is_(None))
+            .order_by(WishModel.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(WishModel.id > after_id)
+        result = await self._session.execute(stmt)
+        return [(wish_id, link) for wish_id, link in result.all()]
+
+    async def set_store_domains(self, store_domains: dict[UUID, str]) -> int:
+        """Set store_domain for many wishes in one statement; returns rows updated."""
+        if not store_domains:
+            return 0
+        result = await self._session.execute(
+            text(
+                "UPDATE wishes SET store_domain = v.store_domain "
+                "FROM unnest(CAST(:ids AS uuid[]), CAST(:domains AS text[])) "
+                "AS v(id, store_domain) "
+                "WHERE wishes.id = v.id"
+            ),
+            {"ids": list(store_domains), "domains": list(store_domains.values())},
+        )
+        return result.rowcount
+
+    async def book(self, wish_id: UUID, user_id: UUID, booked_at: datetime) -> Optional[Wish]:
+        """
+        Book a wish unless someone else already has; None if not booked.
+
+        The check and the write are one conditional UPDATE, so two users
+        booking at once cannot both succeed.
+        """
+        stmt = (
+            update(WishModel)
+            .where(
+                WishModel.id == wish_id,
+                or_(WishModel.is_booked.is_(False), WishModel.booked_by_user_id == user_id),
+            )
+            .values(is_booked=True, booked_by_user_id=user_id, updated_at=booked_at)
+            .returning(WishModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self._session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if model is None:
+            return None
+        mark_changed(self._session, "wish", wish_id)
+        return self._to_entity(model)
+
     async def update(self, wish: Wish) -> Wish:
-        """Update an existing wish."""
+        """
+        Update an existing wish.
+
+        Only columns that differ from the stored row are written; load the
+        wish with get_by_id(for_update=True) so that row is current.
+        """
         stmt = select(WishModel).where(WishModel.id == wish.id)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
@@ -89,6 +265,8 @@ class WishRepository:
         model.title = wish.title
         model.subtitle = wish.subtitle
         model.description = wish.description
+        if model.link != wish.link:
+            model.store_domain = extract_store_from_url(wish.link)
         model.link = wish.link
         model.image_url = wish.image_url
         model.price = wish.price
@@ -107,12 +285,68 @@ class WishRepository:
         # But for now, updating wishlist_id is definitely missing.
 
         await self._session.flush()
+        mark_changed(self._session, "wish", wish.id)
         return wish
 
+    async def fill_missing(
+        self,
+        wish_id: UUID,
+        link: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        image_url: Optional[str] = None,
+        price: Optional[float] = None,
+        currency: Optional[str] = None,
+    ) -> Optional[Wish]:
+        """
+        Set the given fields only where the wish has no value, provided its
+        link is still `link`. The title counts as missing when it is the link
+        itself; the currency is only set together with a price.
+        Returns the updated wish, or None when there was nothing to fill.
+        """
+        values = {}
+        missing = []
+        if title:
+            values["title"] = case((WishModel.title == WishModel.link, title), else_=WishModel.title)
+            missing.append(WishModel.title == WishModel.link)
+        if description:
+            values["description"] = func.coalesce(func.nullif(WishModel.description, ""), description)
+            missing.append(func.coalesce(WishModel.description, "") == "")
+        if image_url:
+            values["image_url"] = func.coalesce(func.nullif(WishModel.image_url, ""), image_url)
+            missing.append(func.coalesce(WishModel.image_url, "") == "")
+        if price is not None:
+            values["price"] = func.coalesce(WishModel.price, price)
+            if currency:
+                # SET expressions see the old row, so this checks the price before the fill
+                values["currency"] = case(
+                    (WishModel.price.is_(None), currency), else_=WishModel.currency
+                )
+            missing.append(WishModel.price.is_(None))
+        if not values:
+            return None
+
+        # A single statement, so an edit made meanwhile is never overwritten
+        stmt = (
+            update(WishModel)
+            .where(WishModel.id == wish_id, WishModel.link == link, or_(*missing))
+            .values(**values, updated_at=datetime.now(timezone.utc))
+            .returning(WishModel)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
+
+        mark_changed(self._session, "wish", wish_id)
+        return self._to_entity(model)
+
     async def delete(self, wish_id: UUID) -> None:
         """Delete a wish."""
         stmt = delete(WishModel).where(WishModel.id == wish_id)
         await self._session.execute(stmt)
+        mark_changed(self._session, "wish", wish_id)
 
     def _to_entity(self, model: WishModel) -> Wish:
         """Convert ORM model to domain entity."""
@@ -10,7 +10,8 @@ from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.entities import Wishlist, WishlistCreate, WishlistUpdate, UNSET
-from src.infrastructure.models import WishlistModel
+from src.infrastructure.cache import entity_cache, mark_changed
+from src.infrastructure.models import WishlistModel, WishModel
 
 
 class WishlistRepository:
@@ -21,10 +22,19 @@ class WishlistRepository:
 
     async def get_by_id(self, wishlist_id: UUID) -> Optional[Wishlist]:
         """Get wishlist by UUID."""
+        cached = entity_cache.get(self._session, "wishlist", wishlist_id)
+        if cached is not None:
+            return cached
+
+        generation = entity_cache.generation
         stmt = select(WishlistModel).where(WishlistModel.id == wishlist_id)
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        wishlist = self._to_entity(model)
+        entity_cache.put(self._session, "wishlist", wishlist_id, wishlist, generation)
+        return wishlist
 
     async def get_by_user_id(self, user_id: UUID) -> list[Wishlist]:
         """Get all wishlists for a specific user."""
@@ -37,6 +47,17 @@ class WishlistRepository:
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    async def get_default_by_user_ids(self, user_ids: list[UUID]) -> list[Wishlist]:
+        """Get the default wishlists of the given users."""
+        if not user_ids:
+            return []
+        stmt = select(WishlistModel).where(
+            WishlistModel.user_id.in_(user_ids),
+            WishlistModel.is_default,
+        )
+        result = await self._session.execute(stmt)
+        return [self._to_entity(model) for model in result.scalars().all()]
+
     async def create(self, data: WishlistCreate) -> Wishlist:
         """Create a new wishlist."""
         model = WishlistModel(
@@ -87,12 +108,23 @@ class WishlistRepository:
         )
         result = await self._session.execute(stmt)
         model = result.scalar_one_or_none()
-        return self._to_entity(model) if model else None
+        if not model:
+            return None
+        mark_changed(self._session, "wishlist", wishlist_id)
+        return self._to_entity(model)
 
     async def delete(self, wishlist_id: UUID) -> bool:
         """Delete a wishlist."""
+        # Its wishes go with it (ON DELETE CASCADE) and must leave the cache too
+        wish_ids = await self._session.execute(
+            select(WishModel.id).where(WishModel.wishlist_id == wishlist_id)
+        )
+        mark_changed(self._session, "wish", *wish_ids.scalars().all())
+
         stmt = delete(WishlistModel).where(WishlistModel.id == wishlist_id)
         result = await self._session.execute(stmt)
+        if result.rowcount > 0:
+            mark_changed(self._session, "wishlist", wishlist_id)
         return result.rowcount > 0
 
     @staticmethod
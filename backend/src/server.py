@@ -0,0 +1,73 @@
+"""
+Production server entry point.
+Runs the API under uvicorn with one worker process per CPU by default.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_workers(configured: int) -> int:
+    """Get the worker count, defaulting to the number of CPUs."""
+    if configured > 0:
+        return configured
+    return os.cpu_count() or 1
+
+
+def _prepare_multiprocess_metrics() -> None:
+    """
+    Point prometheus_client at a clean shared directory for worker metrics.
+
+    Must run before prometheus_client is imported in this process; the
+    workers inherit the environment variable.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        for stale in Path(directory).glob("*.db"):
+            stale.unlink()
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def main() -> None:
+    """Run the multi-worker production server."""
+    settings = get_settings()
+    workers = resolve_workers(settings.web_concurrency)
+
+    # Workers are spawned with this environment and use it to take their
+    # share of the database connection budget (see DB_POOL_BUDGET).
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    logger.info(f"Starting {workers} worker(s) on {settings.host}:{settings.port}")
+
+    if settings.metrics_enabled:
+        _prepare_multiprocess_metrics()
+        from src.infrastructure.metrics import start_metrics_server
+
+        start_metrics_server(settings.metrics_port, settings.metrics_host)
+        logger.info(f"Serving metrics on {settings.metrics_host}:{settings.metrics_port}")
+
+    # The app is passed as an import string so that every worker imports it
+    # (and creates its engine) after the process has started. On SIGTERM
+    # uvicorn stops accepting connections and drains in-flight requests for
+    # up to shutdown_timeout seconds before running lifespan shutdown.
+    uvicorn.run(
+        "src.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.shutdown_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
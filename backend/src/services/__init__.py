@@ -1,6 +1,11 @@
 from .user_service import UserService
 from .wishlist_service import WishlistService
+from .enrichment import WishEnricher, create_wish_enricher
+from .outbox import OutboxRelay, create_outbox_relay
 
 from .wish import WishService
 
-__all__ = ["UserService", "WishlistService", "WishService"]
+__all__ = [
+    "UserService", "WishlistService", "WishService", "OutboxRelay", "create_outbox_relay",
+    "WishEnricher", "create_wish_enricher",
+]
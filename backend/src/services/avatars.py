@@ -0,0 +1,80 @@
+"""
+Mirrored Telegram avatars.
+The bot uploads each profile photo once; the API serves it from the blob store.
+"""
+
+import asyncio
+import re
+from pathlib import Path
+from typing import Optional
+
+from src.config import get_settings
+from src.infrastructure.blob_store import BlobStore
+from src.infrastructure.metrics import AVATAR_REQUESTS
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+class AvatarRejectedError(Exception):
+    """The upload is not a JPEG or exceeds the size limit."""
+
+
+class AvatarStore:
+    """
+    Profile photos uploaded by the bot, keyed by Telegram's file_unique_id.
+
+    A photo is stored once as a content-addressed blob, with a ref from its
+    file_unique_id so the bot can tell it is already mirrored before
+    downloading it from Telegram. Users link to /avatars/<digest>.jpg,
+    which never changes and is served as immutable, so the blob store must
+    not evict. Telegram profile photos are always JPEG; anything else is
+    refused. Only the bot can add files: the upload route checks its
+    request signature.
+    """
+
+    def __init__(self, store: BlobStore, max_bytes: int):
+        self._store = store
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def avatar_path(digest: str) -> str:
+        """Path, relative to the API root, an avatar is served at."""
+        return f"/avatars/{digest}.jpg"
+
+    def blob_path(self, digest: str) -> Optional[Path]:
+        """File of a stored avatar, or None if unknown."""
+        if not _DIGEST.fullmatch(digest) or not self._store.has(digest):
+            return None
+        return self._store.blob_path(digest)
+
+    async def lookup(self, file_unique_id: str) -> Optional[str]:
+        """Path of an already mirrored photo, or None if it must be uploaded."""
+        ref = await asyncio.to_thread(self._store.get_ref, f"telegram:{file_unique_id}")
+        if ref is None or not await asyncio.to_thread(self._store.has, ref["digest"]):
+            AVATAR_REQUESTS.labels("miss").inc()
+            return None
+        AVATAR_REQUESTS.labels("hit").inc()
+        return self.avatar_path(ref["digest"])
+
+    async def save(self, file_unique_id: str, data: bytes) -> str:
+        """Store an uploaded photo; returns the path it is served at."""
+        if len(data) > self.max_bytes or not data.startswith(_JPEG_MAGIC):
+            AVATAR_REQUESTS.labels("rejected").inc()
+            raise AvatarRejectedError(f"Avatar must be a JPEG of at most {self.max_bytes} bytes")
+        digest = await asyncio.to_thread(self._save, file_unique_id, data)
+        AVATAR_REQUESTS.labels("stored").inc()
+        return self.avatar_path(digest)
+
+    def _save(self, file_unique_id: str, data: bytes) -> str:
+        digest = self._store.put(data)
+        self._store.set_ref(f"telegram:{file_unique_id}", {"digest": digest})
+        return digest
+
+
+settings = get_settings()
+# Users link to stored avatars, so nothing is evicted
+avatar_store = AvatarStore(
+    BlobStore(Path(settings.avatar_cache_dir), max_bytes=None),
+    max_bytes=settings.avatar_max_bytes,
+)
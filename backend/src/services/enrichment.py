@@ -0,0 +1,112 @@
+"""
+Wish enrichment.
+Fills empty wish fields from the product page behind the wish link.
+"""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import Settings
+from src.infrastructure.database import get_session_factory
+from src.infrastructure.scraper import LinkScraper
+from src.repositories import OutboxRepository, WishlistRepository, WishRepository
+from src.services.wish import WishService
+
+logger = logging.getLogger(__name__)
+
+
+class WishEnricher:
+    """
+    Background queue of wishes whose links should be scraped.
+
+    Wishes are submitted by the outbox relay after they are created or
+    changed, so a request never waits for a store's page. The scraper bounds
+    and caches the downloads; the fill itself only touches fields that are
+    still empty and publishes a wish update, so open lists show the result.
+    A full queue drops submissions: enrichment is best effort.
+    """
+
+    def __init__(
+        self,
+        scraper: LinkScraper,
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int,
+        queue_size: int,
+    ):
+        self._scraper = scraper
+        self._session_factory = session_factory
+        self._workers = workers
+        self._queue: asyncio.Queue[tuple[UUID, str]] = asyncio.Queue(maxsize=queue_size)
+        self._queued: set[UUID] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"wish-enricher-{index}")
+            for index in range(self._workers)
+        ]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._scraper.close()
+
+    def submit(self, wish_id: UUID, link: str) -> bool:
+        """Queue a wish for enrichment; False if it was dropped."""
+        if wish_id in self._queued:
+            return True
+        try:
+            self._queue.put_nowait((wish_id, link))
+        except asyncio.QueueFull:
+            logger.warning(f"Enrichment queue full, skipping wish {wish_id}")
+            return False
+        self._queued.add(wish_id)
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            wish_id, link = await self._queue.get()
+            self._queued.discard(wish_id)
+            try:
+                await self.enrich(wish_id, link)
+            except Exception as e:
+                logger.exception(f"Enriching wish {wish_id} failed: {e}")
+
+    async def enrich(self, wish_id: UUID, link: str) -> bool:
+        """Scrape a wish's link and fill its empty fields; True if any were filled."""
+        metadata = await self._scraper.get_metadata(link)
+        if metadata is None or metadata.is_empty:
+            return False
+        async with self._session_factory() as session:
+            async with session.begin():
+                service = WishService(
+                    WishRepository(session), WishlistRepository(session), OutboxRepository(session)
+                )
+                enriched = await service.apply_link_metadata(wish_id, link, metadata)
+        if enriched is not None:
+            logger.debug(f"Filled wish {wish_id} from {link}")
+        return enriched is not None
+
+
+def create_wish_enricher(settings: Settings) -> WishEnricher:
+    """Build an enricher with the scraper limits from settings."""
+    scraper = LinkScraper(
+        max_concurrency=settings.scraper_max_concurrency,
+        per_domain_concurrency=settings.scraper_per_domain_concurrency,
+        timeout=settings.scraper_timeout,
+        max_bytes=settings.scraper_max_bytes,
+        parse_processes=settings.scraper_parse_processes,
+        cache_size=settings.scraper_cache_size,
+        cache_ttl=settings.scraper_cache_ttl,
+        allow_private_hosts=settings.scraper_allow_private_hosts,
+    )
+    return WishEnricher(
+        scraper,
+        get_session_factory(),
+        workers=settings.scraper_max_concurrency,
+        queue_size=settings.enrichment_queue_size,
+    )
@@ -0,0 +1,208 @@
+"""
+Wish image proxy.
+Serves external wish images as small WebP copies with blurhash placeholders.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from src.config import get_settings
+from src.infrastructure.blob_store import BlobStore
+from src.infrastructure.images import ProcessedImage, process_image
+from src.infrastructure.metrics import IMAGE_PROCESS_DURATION, IMAGE_PROXY_REQUESTS
+from src.infrastructure.scraper import LinkFetchError, fetch_public_url, public_http_client
+from src.infrastructure.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Failed sources kept before the oldest is forgotten
+_MAX_FAILURES = 10_000
+
+
+class ImageProxyError(Exception):
+    """The source image could not be fetched or decoded."""
+
+
+@dataclass(frozen=True)
+class ProxiedImage:
+    """A processed source image: its size, placeholder and WebP blob per width."""
+
+    width: int
+    height: int
+    blurhash: str
+    variants: dict[int, str]
+
+
+class ImageProxy:
+    """
+    Fetches each wish image once and keeps resized WebP copies of it.
+
+    Every configured width is produced in one pass in a process pool and
+    stored in the content-addressed blob store, together with a ref from
+    the normalized source URL to the blobs and the blurhash. Workers share
+    the store directory, so an image processed by one is served by all.
+    Proxy URLs carry an HMAC of the source URL, so the endpoint only serves
+    images the API itself linked to.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        secret: str,
+        widths: list[int],
+        max_source_bytes: int,
+        fetch_timeout: float,
+        max_concurrency: int,
+        process_workers: int,
+        error_ttl: float = 300.0,
+        allow_private_hosts: bool = False,
+    ):
+        self._store = store
+        self._secret = secret.encode("utf-8")
+        self.widths = tuple(sorted(widths))
+        self._max_source_bytes = max_source_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._error_ttl = error_ttl
+        self._failures: OrderedDict[str, float] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._client = public_http_client(allow_private_hosts, timeout=fetch_timeout)
+        self._process_workers = process_workers
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._process_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def sign(self, url: str) -> str:
+        return hmac.new(self._secret, url.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def verify(self, url: str, signature: str) -> bool:
+        return hmac.compare_digest(self.sign(url), signature)
+
+    def proxy_path(self, url: Optional[str]) -> Optional[str]:
+        """Path, relative to the API root, of the thumbnail endpoint for `url`."""
+        if not url:
+            return None
+        return "/images/thumbnail?" + urlencode({"src": url, "sig": self.sign(url)})
+
+    def snap_width(self, width: int) -> int:
+        """The smallest configured width covering `width`."""
+        return next((w for w in self.widths if w >= width), self.widths[-1])
+
+    async def get_image(self, url: str) -> ProxiedImage:
+        """Sizes, placeholder and blobs of a source image, processing it on first use."""
+        key = normalize_url(url)
+        if key is None:
+            raise ImageProxyError(f"Unsupported image URL {url}")
+
+        ref = await asyncio.to_thread(self._store.get_ref, key)
+        if ref is not None and all(str(width) in ref["variants"] for width in self.widths):
+            IMAGE_PROXY_REQUESTS.labels("hit").inc()
+            return ProxiedImage(
+                width=ref["width"],
+                height=ref["height"],
+                blurhash=ref["blurhash"],
+                variants={int(width): digest for width, digest in ref["variants"].items()},
+            )
+        return await self._load(key)
+
+    async def get_thumbnail(self, url: str, width: int) -> tuple[ProxiedImage, str, Path]:
+        """Image, blob digest and file of the WebP copy for a requested width."""
+        image = await self.get_image(url)
+        digest = image.variants[self.snap_width(width)]
+        if not await asyncio.to_thread(self._store.has, digest):
+            # The blob was evicted while its ref survived
+            image = await self._load(normalize_url(url))
+            digest = image.variants[self.snap_width(width)]
+        return image, digest, self._store.blob_path(digest)
+
+    async def _load(self, key: str) -> ProxiedImage:
+        failed_until = self._failures.get(key)
+        if failed_until is not None and failed_until > time.monotonic():
+            IMAGE_PROXY_REQUESTS.labels("error").inc()
+            raise ImageProxyError(f"{key} failed recently")
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._process(key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _process(self, key: str) -> ProxiedImage:
+        try:
+            async with self._semaphore:
+                data, _, _ = await fetch_public_url(
+                    self._client,
+                    key,
+                    max_bytes=self._max_source_bytes,
+                    content_type="image/",
+                    truncate=False,
+                )
+            started = time.perf_counter()
+            processed: ProcessedImage = await asyncio.get_running_loop().run_in_executor(
+                self._executor, process_image, data, self.widths
+            )
+            IMAGE_PROCESS_DURATION.observe(time.perf_counter() - started)
+        except BrokenProcessPool as e:
+            # A worker died (out of memory, most likely); not the source's fault
+            logger.warning(f"Image worker crashed on {key}, restarting the pool")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            IMAGE_PROXY_REQUESTS.labels("error").inc()
+            raise ImageProxyError(str(e)) from e
+        except (LinkFetchError, httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Cannot proxy image {key}: {e!r}")
+            self._failures[key] = time.monotonic() + self._error_ttl
+            self._failures.move_to_end(key)
+            while len(self._failures) > _MAX_FAILURES:
+                self._failures.popitem(last=False)
+            IMAGE_PROXY_REQUESTS.labels("error").inc()
+            raise ImageProxyError(str(e)) from e
+
+        image = await asyncio.to_thread(self._save, key, processed)
+        IMAGE_PROXY_REQUESTS.labels("miss").inc()
+        return image
+
+    def _save(self, key: str, processed: ProcessedImage) -> ProxiedImage:
+        variants = {width: self._store.put(data) for width, data in processed.variants.items()}
+        self._store.set_ref(key, {
+            "width": processed.width,
+            "height": processed.height,
+            "blurhash": processed.blurhash,
+            "variants": {str(width): digest for width, digest in variants.items()},
+        })
+        return ProxiedImage(processed.width, processed.height, processed.blurhash, variants)
+
+
+settings = get_settings()
+if not (settings.image_proxy_secret or settings.telegram_bot_token):
+    logger.warning("No IMAGE_PROXY_SECRET or bot token set; image proxy URLs are forgeable")
+image_proxy = ImageProxy(
+    BlobStore(Path(settings.image_cache_dir), settings.image_cache_max_bytes),
+    secret=settings.image_proxy_secret or settings.telegram_bot_token or "development",
+    widths=settings.image_widths,
+    max_source_bytes=settings.image_max_source_bytes,
+    fetch_timeout=settings.image_fetch_timeout,
+    max_concurrency=settings.image_max_concurrency,
+    process_workers=settings.image_process_workers,
+    allow_private_hosts=settings.scraper_allow_private_hosts,
+)
@@ -0,0 +1,291 @@
+"""
+Live wishlist updates.
+Fans wish changes from the outbox notification channel out to SSE streams.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from src.config import get_settings
+from src.domain.entities import WishEvents
+from src.domain.entities.wish import Wish
+from src.infrastructure.database import get_read_only_session_factory
+from src.repositories import WishRepository
+from src.services.images import image_proxy
+
+logger = logging.getLogger(__name__)
+
+# Wish events and the delta type sent to viewers of the wish's wishlist
+_DELTA_TYPES = {
+    WishEvents.CREATED: "created",
+    WishEvents.UPDATED: "updated",
+    WishEvents.BOOKED: "booked",
+    WishEvents.UNBOOKED: "unbooked",
+    WishEvents.FULFILLED: "updated",
+    WishEvents.DELETED: "deleted",
+}
+
+# Client reconnect delay, sent once per stream
+_RETRY = "retry: 3000\n\n"
+_HEARTBEAT = ": ping\n\n"
+# Tells the client to re-fetch the list: updates were dropped
+_RESET = 'event: reset\ndata: {}\n\n'
+
+
+class HubFullError(RuntimeError):
+    """Raised when a worker already serves its maximum number of streams."""
+
+
+class WishlistSubscription:
+    """One open stream: a small bounded buffer and a waiter for new messages."""
+
+    __slots__ = ("wishlist_id", "viewer_id", "_buffer", "_max_buffer", "_waiter", "overflowed", "closed")
+
+    def __init__(self, wishlist_id: UUID, viewer_id: Optional[UUID], max_buffer: int):
+        self.wishlist_id = wishlist_id
+        self.viewer_id = viewer_id
+        self._buffer: list[str] = []
+        self._max_buffer = max_buffer
+        self._waiter: Optional[asyncio.Future] = None
+        self.overflowed = False
+        self.closed = False
+
+    @property
+    def idle(self) -> bool:
+        return not self._buffer
+
+    def push(self, message: str) -> None:
+        if len(self._buffer) >= self._max_buffer:
+            # A slow client; drop its backlog and have it re-fetch instead
+            self.reset()
+            return
+        self._buffer.append(message)
+        self._wake()
+
+    def reset(self) -> None:
+        self.overflowed = True
+        self._wake()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def next_messages(self) -> list[str]:
+        """Wait for buffered messages and take them all."""
+        while not self._buffer and not self.overflowed and not self.closed:
+            # A future per wait is lighter than keeping an Event per subscriber
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        messages, self._buffer = self._buffer, []
+        return messages
+
+
+def _wish_message(delta_type: str, wish: Wish, booked_by_me: bool) -> str:
+    data = wish.to_dict()
+    data["booked_by_me"] = booked_by_me
+    data["image_thumbnail_url"] = image_proxy.proxy_path(wish.image_url)
+    payload = json.dumps({"type": delta_type, "wish": data}, separators=(",", ":"), ensure_ascii=False)
+    return f"event: wish\ndata: {payload}\n\n"
+
+
+def _deleted_message(wish_id: str) -> str:
+    payload = json.dumps({"type": "deleted", "id": wish_id}, separators=(",", ":"))
+    return f"event: wish\ndata: {payload}\n\n"
+
+
+class WishlistHub:
+    """
+    In-process fan-out of wish changes to the streams of each wishlist.
+
+    Changes arrive as outbox notifications. Events for wishlists nobody in
+    this worker watches are ignored; otherwise the wish is read once and one
+    serialized message goes to every stream of its wishlist. Idle streams get
+    a keep-alive comment from a single hub-wide timer. A stream whose client
+    falls `buffer_size` messages behind, or that was open during a gap in
+    notifications, is told to reset and re-fetch the list.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int,
+        heartbeat_interval: float,
+        max_subscribers: int,
+    ):
+        self._buffer_size = buffer_size
+        self._heartbeat_interval = heartbeat_interval
+        self._max_subscribers = max_subscribers
+        self._subscriptions: dict[UUID, set[WishlistSubscription]] = {}
+        self._count = 0
+        self._events: asyncio.Queue[dict] = asyncio.Queue(maxsize=10_000)
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._dispatch(), name="wishlist-hub-dispatch"),
+            asyncio.create_task(self._heartbeat(), name="wishlist-hub-heartbeat"),
+        ]
+
+    async def close(self) -> None:
+        self.close_streams()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def close_streams(self) -> None:
+        """
+        End every open stream and refuse new ones.
+
+        Called as soon as the server is told to stop: it waits for open
+        responses to finish before shutting the app down, and a stream
+        never finishes on its own. Clients reconnect to another worker.
+        """
+        self._closing = True
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def subscribe(self, wishlist_id: UUID, viewer_id: Optional[UUID]) -> WishlistSubscription:
+        if self._closing:
+            raise HubFullError("Worker is shutting down")
+        if self._count >= self._max_subscribers:
+            raise HubFullError("Too many live streams on this worker")
+        subscription = WishlistSubscription(wishlist_id, viewer_id, self._buffer_size)
+        self._subscriptions.setdefault(wishlist_id, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: WishlistSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.wishlist_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.wishlist_id]
+        self._count -= 1
+
+    async def stream(self, subscription: WishlistSubscription) -> AsyncIterator[str]:
+        """SSE body for a subscription; unsubscribes when the client goes away."""
+        try:
+            yield _RETRY
+            while True:
+                messages = await subscription.next_messages()
+                if messages:
+                    yield "".join(messages)
+                if subscription.overflowed:
+                    yield _RESET
+                    return
+                if subscription.closed:
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    def broadcast(self, wishlist_id: UUID, message: str) -> None:
+        """Push a serialized message to every stream of a wishlist."""
+        for subscription in self._subscriptions.get(wishlist_id, ()):
+            subscription.push(message)
+
+    def reset_all(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.reset()
+
+    def on_notify(self, payload: str) -> None:
+        event = json.loads(payload)
+        if event.get("type") != "wish" or event.get("event") not in _DELTA_TYPES:
+            return
+        watched = any(
+            UUID(event[key]) in self._subscriptions
+            for key in ("wishlist_id", "previous_wishlist_id")
+            if event.get(key)
+        )
+        if not watched:
+            return
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Live update queue full, resetting all streams")
+            self.reset_all()
+
+    def on_connect(self) -> None:
+        # Streams opened before a reconnect may have missed changes
+        self.reset_all()
+
+    def on_disconnect(self) -> None:
+        pass
+
+    async def _dispatch(self) -> None:
+        while True:
+            event = await self._events.get()
+            try:
+                await self._publish(event)
+            except Exception as e:
+                logger.exception(f"Publishing live update failed: {e}")
+
+    async def _publish(self, event: dict) -> None:
+        wish_id = event["id"]
+        wishlist_id = UUID(event["wishlist_id"]) if event.get("wishlist_id") else None
+        previous_id = (
+            UUID(event["previous_wishlist_id"]) if event.get("previous_wishlist_id") else None
+        )
+
+        if event["event"] == WishEvents.DELETED:
+            if wishlist_id is not None:
+                self.broadcast(wishlist_id, _deleted_message(wish_id))
+            return
+
+        if previous_id is not None and previous_id != wishlist_id:
+            # Moved to another wishlist: gone from the old one, new in the other
+            self.broadcast(previous_id, _deleted_message(wish_id))
+            delta_type = "created"
+        else:
+            delta_type = _DELTA_TYPES[event["event"]]
+
+        if wishlist_id not in self._subscriptions:
+            return
+        # Read from the primary: the replica may not have the change yet
+        async with get_read_only_session_factory()() as session:
+            wish = await WishRepository(session).get_by_id(UUID(wish_id))
+        if wish is None:
+            # Deleted since; its own event follows
+            return
+
+        message = _wish_message(delta_type, wish, booked_by_me=False)
+        booker_message = (
+            _wish_message(delta_type, wish, booked_by_me=True) if wish.booked_by_user_id else None
+        )
+        for subscription in self._subscriptions.get(wishlist_id, ()):
+            if booker_message and subscription.viewer_id == wish.booked_by_user_id:
+                subscription.push(booker_message)
+            else:
+                subscription.push(message)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            for subscriptions in list(self._subscriptions.values()):
+                for subscription in subscriptions:
+                    if subscription.idle:
+                        subscription.push(_HEARTBEAT)
+
+
+settings = get_settings()
+wishlist_hub = WishlistHub(
+    buffer_size=settings.live_buffer_size,
+    heartbeat_interval=settings.live_heartbeat_interval,
+    max_subscribers=settings.live_max_subscribers,
+)
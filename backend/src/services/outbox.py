@@ -0,0 +1,337 @@
+"""
+Outbox relay.
+Drains events committed to the outbox table and delivers them to sinks.
+"""
+
+import asyncio
+import html
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Protocol
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.config import Settings
+from src.domain.entities import OutboxEvent, WishEvents
+from src.infrastructure.database import get_engine, get_session_factory
+from src.infrastructure.metrics import (
+    OUTBOX_DEAD,
+    OUTBOX_DELIVERY_FAILURES,
+    OUTBOX_DELIVERY_LAG,
+    OUTBOX_EVENTS_DELIVERED,
+    OUTBOX_OLDEST_PENDING,
+    OUTBOX_PENDING,
+)
+from src.repositories import BotNotificationRepository, OutboxRepository
+from src.services.enrichment import WishEnricher
+
+logger = logging.getLogger(__name__)
+analytics_logger = logging.getLogger("analytics")
+
+# Postgres channel carrying compact change notifications
+OUTBOX_CHANNEL = "outbox_events"
+
+# Seconds between outbox size/lag checks
+_STATS_INTERVAL = 15.0
+
+
+class OutboxSink(Protocol):
+    """
+    Destination for outbox events. Must tolerate receiving an event twice.
+
+    `name` is recorded on events the sink has received, so it must stay
+    stable across deploys.
+    """
+
+    name: str
+
+    async def deliver(self, events: list[OutboxEvent]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class AnalyticsSink:
+    """Writes every event as a JSON line to the `analytics` logger."""
+
+    name = "analytics"
+
+    async def deliver(self, events: list[OutboxEvent]) -> None:
+        for event in events:
+            analytics_logger.info(json.dumps({
+                "event": event.event_type,
+                "aggregate_type": event.aggregate_type,
+                "aggregate_id": str(event.aggregate_id),
+                "occurred_at": event.created_at.isoformat(),
+                "payload": event.payload,
+            }, ensure_ascii=False))
+
+    async def close(self) -> None:
+        pass
+
+
+class NotifySink:
+    """
+    Publishes a compact notification per event on a Postgres channel.
+
+    Payloads carry only the event and entity ids (NOTIFY is limited to 8000
+    bytes), so listeners such as live wishlist views re-read what they need.
+    """
+
+    name = "notify"
+
+    def __init__(self, engine: AsyncEngine, channel: str = OUTBOX_CHANNEL):
+        self._engine = engine
+        self._channel = channel
+
+    async def deliver(self, events: list[OutboxEvent]) -> None:
+        payloads = [
+            json.dumps({
+                "event": event.event_type,
+                "type": event.aggregate_type,
+                "id": str(event.aggregate_id),
+                "wishlist_id": event.payload.get("wishlist_id"),
+                "previous_wishlist_id": event.payload.get("previous_wishlist_id"),
+            }, separators=(",", ":"))
+            for event in events
+        ]
+        async with self._engine.connect() as conn:
+            await conn.execute(
+                text(
+                    "SELECT pg_notify(:channel, payload) "
+                    "FROM unnest(CAST(:payloads AS text[])) AS payload"
+                ),
+                {"channel": self._channel, "payloads": payloads},
+            )
+            await conn.commit()
+
+    async def close(self) -> None:
+        pass
+
+
+class BotNotifierSink:
+    """
+    Tells the user who booked a wish when its owner fulfils or deletes it.
+
+    Messages are queued in the bot_notifications table, which the bot drains
+    through /notifications/bot/claim and sends with its own rate limiting
+    and retries, so the relay never waits on Telegram. Texts are HTML, as
+    the bot sends them. An event delivered twice is queued once.
+    """
+
+    name = "bot"
+
+    _MESSAGES = {
+        WishEvents.FULFILLED: "🎉 Желание «{title}», которое вы забронировали, исполнилось!",
+        WishEvents.DELETED: "Желание «{title}», которое вы забронировали, удалено владельцем.",
+    }
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def deliver(self, events: list[OutboxEvent]) -> None:
+        notices = [
+            (event.id,
+             UUID(event.payload["previous_booked_by_user_id"]),
+             self._MESSAGES[event.event_type].format(title=html.escape(event.payload["title"])))
+            for event in events
+            if event.event_type in self._MESSAGES
+            and event.payload.get("previous_booked_by_user_id")
+        ]
+        if not notices:
+            return
+
+        async with self._session_factory() as session:
+            async with session.begin():
+                await BotNotificationRepository(session).add_many(notices)
+
+    async def close(self) -> None:
+        pass
+
+
+class EnrichmentSink:
+    """
+    Queues created or edited wishes with a link and empty fields for enrichment.
+
+    Queuing never fails the batch. The update published after a fill comes
+    back here too; it is answered from the scraper's cache and fills nothing.
+    """
+
+    name = "enrich"
+
+    _EVENTS = (WishEvents.CREATED, WishEvents.UPDATED)
+
+    def __init__(self, enricher: WishEnricher):
+        self._enricher = enricher
+
+    async def deliver(self, events: list[OutboxEvent]) -> None:
+        for event in events:
+            payload = event.payload
+            if event.event_type not in self._EVENTS or not payload.get("link"):
+                continue
+            missing = (
+                payload.get("title") == payload["link"]
+                or not payload.get("description")
+                or not payload.get("image_url")
+                or payload.get("price") is None
+            )
+            if missing:
+                self._enricher.submit(event.aggregate_id, payload["link"])
+
+    async def close(self) -> None:
+        pass
+
+
+class OutboxRelay:
+    """
+    Delivers outbox events to every sink, at least once.
+
+    Each batch is claimed for `claim_timeout` seconds with FOR UPDATE SKIP
+    LOCKED in a short transaction, so relays in several workers share the
+    outbox and no transaction stays open while sinks do I/O. The batch goes
+    to every sink; events that reached them all are deleted. When a sink
+    fails, its events stay in the outbox with their attempt count raised and
+    the sinks that did receive them recorded, and the retry goes only to the
+    sinks still missing. After `max_attempts` failures an event is left in
+    the table as dead. Events of one aggregate may be delivered out of order
+    across relays.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sinks: list[OutboxSink],
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        max_lag_seconds: float,
+        claim_timeout: float,
+    ):
+        self._session_factory = session_factory
+        self._sinks = sinks
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._max_lag_seconds = max_lag_seconds
+        self._claim_timeout = claim_timeout
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        for sink in self._sinks:
+            await sink.close()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        failures = 0
+        next_stats = 0.0
+        while True:
+            if loop.time() >= next_stats:
+                next_stats = loop.time() + _STATS_INTERVAL
+                try:
+                    await self._update_stats()
+                except Exception as e:
+                    logger.warning(f"Outbox stats query failed: {e}")
+
+            try:
+                delivered = await self.relay_once()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Outbox delivery failed ({failures} in a row): {e}")
+                await asyncio.sleep(min(60.0, self._poll_interval * 2 ** failures))
+                continue
+
+            # A full batch means more is probably waiting
+            if delivered < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def relay_once(self) -> int:
+        """Deliver one batch; returns the number of events delivered to every sink."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                events = await OutboxRepository(session).claim_batch(
+                    self._batch_size, self._max_attempts, self._claim_timeout
+                )
+        if not events:
+            return 0
+
+        delivered = {event.id: list(event.delivered_to) for event in events}
+        errors: dict[int, str] = {}
+        first_error: Optional[Exception] = None
+        for sink in self._sinks:
+            pending = [event for event in events if sink.name not in event.delivered_to]
+            if not pending:
+                continue
+            try:
+                await sink.deliver(pending)
+            except Exception as e:
+                OUTBOX_DELIVERY_FAILURES.labels(sink.name).inc()
+                first_error = first_error or e
+                for event in pending:
+                    errors.setdefault(event.id, f"{sink.name}: {e}")
+                continue
+            for event in pending:
+                delivered[event.id].append(sink.name)
+
+        done = [event for event in events if event.id not in errors]
+        async with self._session_factory() as session:
+            async with session.begin():
+                repository = OutboxRepository(session)
+                if done:
+                    await repository.delete([event.id for event in done])
+                if errors:
+                    await repository.mark_failed([
+                        (event, delivered[event.id], errors[event.id])
+                        for event in events
+                        if event.id in errors
+                    ])
+
+        now = datetime.now(timezone.utc)
+        for event in done:
+            OUTBOX_EVENTS_DELIVERED.labels(event.event_type).inc()
+            OUTBOX_DELIVERY_LAG.observe((now - event.created_at).total_seconds())
+        if first_error is not None:
+            raise first_error
+        return len(done)
+
+    async def _update_stats(self) -> None:
+        async with self._session_factory() as session:
+            pending, oldest, dead = await OutboxRepository(session).get_stats(self._max_attempts)
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+        OUTBOX_PENDING.set(pending)
+        OUTBOX_OLDEST_PENDING.set(lag)
+        OUTBOX_DEAD.set(dead)
+        if lag > self._max_lag_seconds:
+            logger.warning(f"Outbox lag {lag:.0f}s with {pending} events pending")
+        if dead:
+            logger.warning(f"Outbox has {dead} dead events")
+
+
+def create_outbox_relay(settings: Settings, enricher: Optional[WishEnricher] = None) -> OutboxRelay:
+    """Build a relay with the sinks enabled in settings."""
+    sinks: list[OutboxSink] = []
+    if "analytics" in settings.outbox_sinks:
+        sinks.append(AnalyticsSink())
+    if "notify" in settings.outbox_sinks:
+        sinks.append(NotifySink(get_engine()))
+    if "bot" in settings.outbox_sinks:
+        sinks.append(BotNotifierSink(get_session_factory()))
+    if "enrich" in settings.outbox_sinks and enricher is not None:
+        sinks.append(EnrichmentSink(enricher))
+    return OutboxRelay(
+        get_session_factory(),
+        sinks,
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+        max_attempts=settings.outbox_max_attempts,
+        max_lag_seconds=settings.outbox_max_lag_seconds,
+        claim_timeout=settings.outbox_claim_timeout,
+    )
@@ -3,14 +3,20 @@ User service containing business logic.
 Service layer orchestrates domain logic and repository calls.
 """
 
+import calendar
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from src.domain.entities import User, UserCreate, UserUpdate
-from src.repositories import UserRepository
+from src.domain.entities import BirthdayReminder, User, UserCreate, UserUpdate, WishlistEvents
+from src.repositories import OutboxRepository, UserRepository, WishlistRepository
 
 
-# Analytics event names (placeholders for future implementation)
+# Avatar links the bot stored before avatars were mirrored
+TELEGRAM_FILE_URL_PREFIX = "https://api.telegram.org/file/"
+
+
+# Analytics event names
 class AnalyticsEvents:
     BOT_START = "bot_start"
     USER_REGISTERED = "user_registered"
@@ -20,8 +26,15 @@ class AnalyticsEvents:
 class UserService:
     """Service for user-related business logic."""
 
-    def __init__(self, repository: UserRepository):
+    def __init__(
+        self,
+        repository: UserRepository,
+        outbox_repository: Optional[OutboxRepository] = None,
+        wishlist_repository: Optional[WishlistRepository] = None,
+    ):
         self._repository = repository
+        self._outbox_repository = outbox_repository
+        self._wishlist_repository = wishlist_repository
 
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by internal UUID."""
@@ -69,6 +82,51 @@ class UserService:
 
         return sorted(users, key=lambda u: days_until_birthday(u.birth_date))
 
+    async def get_birthday_reminders(
+        self,
+        days_ahead: int,
+        after_telegram_id: int = 0,
+        limit: int = 500,
+    ) -> tuple[date, list[BirthdayReminder]]:
+        """
+        Birthdays `days_ahead` days from today, grouped by follower to notify.
+
+        Feb 29 birthdays are celebrated on Feb 28 in non-leap years, as in
+        get_friends. Each recipient appears once per page with all the birthdays
+        they follow; pages are keyed by recipient telegram_id.
+        """
+        target = date.today() + timedelta(days=days_ahead)
+        month_days = [(target.month, target.day)]
+        if (target.month, target.day) == (2, 28) and not calendar.isleap(target.year):
+            month_days.append((2, 29))
+
+        pairs = await self._repository.get_birthday_followers(
+            month_days, after_telegram_id, limit
+        )
+        reminders: list[BirthdayReminder] = []
+        for telegram_id, user in pairs:
+            if not reminders or reminders[-1].recipient_telegram_id != telegram_id:
+                reminders.append(BirthdayReminder(recipient_telegram_id=telegram_id))
+            reminders[-1].birthdays.append(user)
+        return target, reminders
+
+    async def get_active_users(
+        self,
+        days: int,
+        after_telegram_id: int = 0,
+        limit: int = 500,
+    ) -> list[tuple[int, Optional[str]]]:
+        """
+        (telegram_id, avatar_url) of users whose avatars are worth refreshing.
+
+        That is users active in the last `days` days, plus users whose avatar
+        is still a Bot API file link: those carry the bot token and expire.
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return await self._repository.get_active_users(
+            since, TELEGRAM_FILE_URL_PREFIX, after_telegram_id, limit
+        )
+
     async def subscribe(self, user_id: UUID, target_id: UUID) -> bool:
         """Subscribe to a user."""
         return await self._repository.add_friend(user_id, target_id)
@@ -81,6 +139,10 @@ class UserService:
         """Check subscription status."""
         return await self._repository.is_friend(user_id, target_id)
 
+    async def get_subscribed_ids(self, user_id: UUID, target_ids: list[UUID]) -> set[UUID]:
+        """Get which of the targets the user is subscribed to."""
+        return await self._repository.get_friend_ids(user_id, target_ids)
+
     async def search_users(self, query: str, current_user_id: Optional[UUID] = None) -> list[User]:
         """Search users (excluding current user)."""
         return await self._repository.search_users(query, exclude_user_id=current_user_id)
@@ -89,62 +151,73 @@ class UserService:
         """
         Register a new user or update existing one.
 
-        Implements idempotent registration logic:
-        - If user does not exist -> create new user
-        - If user exists -> update profile fields
+        Implements idempotent registration logic in a single upsert:
+        - If user does not exist -> create new user and the default wishlist
+        - If user exists -> update profile fields that changed
 
         Returns:
             Tuple of (User, is_new_user)
         """
-        existing_user = await self._repository.get_by_telegram_id(data.telegram_id)
-
-        if existing_user is None:
-            # Create new user
-            user = await self._repository.create(data)
-            
-            # Create default "My Wishes" wishlist
-            # We need a session, but repositories take session in init.
-            # UserService takes UserRepository which has session.
-            # We can reuse the session from UserRepository
-            from src.repositories import WishlistRepository
-            from src.domain.entities.wishlist import WishlistCreate
-            
-            wishlist_repo = WishlistRepository(self._repository._session)
-            await wishlist_repo.create(
-                WishlistCreate(
-                    user_id=user.id,
-                    title="Мои желания",
-                    description="Мой основной список желаний",
-                    is_public=True,
-                    is_default=True
+        user, is_new = await self._repository.upsert(data)
+        if is_new:
+            self._track_event(AnalyticsEvents.USER_REGISTERED, user)
+            await self._emit_default_wishlists_created([user])
+        return user, is_new
+
+    async def register_many(self, items: list[UserCreate]) -> list[tuple[User, bool]]:
+        """
+        Register or update a batch of users.
+
+        Same semantics as register_or_update_user, in one statement for the
+        whole batch. Repeated telegram_ids are merged, later non-empty fields
+        winning.
+        """
+        merged: dict[int, UserCreate] = {}
+        for item in items:
+            previous = merged.get(item.telegram_id)
+            if previous is not None:
+                item = UserCreate(
+                    telegram_id=item.telegram_id,
+                    username=item.username if item.username is not None else previous.username,
+                    first_name=item.first_name or previous.first_name,
+                    last_name=item.last_name if item.last_name is not None else previous.last_name,
+                    avatar_url=item.avatar_url if item.avatar_url is not None else previous.avatar_url,
+                    birth_date=item.birth_date if item.birth_date is not None else previous.birth_date,
                 )
-            )
+            merged[item.telegram_id] = item
 
-            # Placeholder: track analytics event
+        results = await self._repository.upsert_many(list(merged.values()))
+        new_users = [user for user, is_new in results if is_new]
+        for user in new_users:
             self._track_event(AnalyticsEvents.USER_REGISTERED, user)
-            return user, True
-
-        # Update existing user with new profile data
-        update_data = UserUpdate(
-            username=data.username,
-            first_name=data.first_name,
-            last_name=data.last_name,
-            avatar_url=data.avatar_url,
-            birth_date=data.birth_date,
-        )
-        updated_user = await self._repository.update_by_telegram_id(
-            data.telegram_id, update_data
+        await self._emit_default_wishlists_created(new_users)
+        return results
+
+    async def _emit_default_wishlists_created(self, users: list[User]) -> None:
+        """
+        Record wishlist_created for the default wishlists of new users.
+
+        The upsert creates them inside its own statement, bypassing
+        WishlistService, so the event is emitted here instead.
+        """
+        if not users or self._outbox_repository is None or self._wishlist_repository is None:
+            return
+        wishlists = await self._wishlist_repository.get_default_by_user_ids(
+            [user.id for user in users]
         )
-        return updated_user or existing_user, False
+        for wishlist in wishlists:
+            self._outbox_repository.add(
+                WishlistEvents.CREATED, "wishlist", wishlist.id, wishlist.to_dict()
+            )
 
     def _track_event(self, event_name: str, user: User) -> None:
         """
-        Placeholder for analytics tracking.
+        Record an analytics event in the outbox.
 
-        Events to track:
-        - bot_start: User started the bot
-        - user_registered: New user was registered
-        - miniapp_opened: User opened the Mini App
+        The event commits or rolls back with the change that caused it and is
+        delivered to the analytics sink by the outbox relay. Services built on
+        the read session have no outbox and track nothing.
         """
-        # TODO: Implement actual analytics tracking
-        pass
+        if self._outbox_repository is None:
+            return
+        self._outbox_repository.add(event_name, "user", user.id, user.to_dict())
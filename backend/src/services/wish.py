@@ -3,12 +3,18 @@ Wish service implementation.
 """
 
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, List, Optional
 from uuid import UUID, uuid4
 
-from src.domain.entities.wish import Wish, WishCreate, WishUpdate
+from src.domain.entities.event import WishEvents
+from src.domain.entities.wish import Wish, WishCreate, WishSearchHit, WishUpdate
 from src.domain.entities.wishlist import WishlistCreate
-from src.repositories import WishlistRepository, WishRepository
+from src.infrastructure.link_metadata import LinkMetadata
+from src.repositories import OutboxRepository, WishlistRepository, WishRepository
+
+
+class WishAlreadyBookedError(ValueError):
+    """The wish is booked by another user."""
 
 
 class WishService:
@@ -18,9 +24,19 @@ class WishService:
         self,
         wish_repository: WishRepository,
         wishlist_repository: WishlistRepository,
+        outbox_repository: Optional[OutboxRepository] = None,
     ):
         self._wish_repository = wish_repository
         self._wishlist_repository = wishlist_repository
+        self._outbox_repository = outbox_repository
+
+    def _emit(self, event_type: str, wish: Wish, **extra: Any) -> None:
+        """Record a wish event in the outbox, committed together with the change."""
+        if self._outbox_repository is None:
+            return
+        payload = wish.to_dict()
+        payload.update({key: str(value) if value else None for key, value in extra.items()})
+        self._outbox_repository.add(event_type, "wish", wish.id, payload)
 
     async def create_wish(self, data: WishCreate) -> Wish:
         """Create a new wish."""
@@ -47,7 +63,9 @@ class WishService:
             updated_at=now,
         )
 
-        return await self._wish_repository.create(wish)
+        created = await self._wish_repository.create(wish)
+        self._emit(WishEvents.CREATED, created)
+        return created
 
     async def get_wishlist_wishes(self, wishlist_id: UUID) -> List[Wish]:
         """Get all wishes for a wishlist."""
@@ -58,11 +76,27 @@ class WishService:
 
         return await self._wish_repository.get_by_wishlist_id(wishlist_id)
 
+    async def search_friends_wishes(
+        self,
+        user_id: UUID,
+        query: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        is_booked: Optional[bool] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[WishSearchHit]:
+        """Search the wishes on friends' public wishlists, most relevant first."""
+        return await self._wish_repository.search_friends_wishes(
+            user_id, query, min_price, max_price, is_booked, limit, offset
+        )
+
     async def update_wish(self, wish_id: UUID, data: WishUpdate) -> Wish:
         """Update an existing wish."""
-        wish = await self._wish_repository.get_by_id(wish_id)
+        wish = await self._wish_repository.get_by_id(wish_id, for_update=True)
         if not wish:
             raise ValueError(f"Wish with id {wish_id} not found")
+        previous_wishlist_id = wish.wishlist_id
 
         if data.title is not None:
             if not data.title.strip():
@@ -102,19 +136,39 @@ class WishService:
 
         wish.updated_at = datetime.now(timezone.utc)
 
-        return await self._wish_repository.update(wish)
+        updated = await self._wish_repository.update(wish)
+        self._emit(WishEvents.UPDATED, updated, previous_wishlist_id=previous_wishlist_id)
+        return updated
+
+    async def apply_link_metadata(
+        self, wish_id: UUID, link: str, metadata: LinkMetadata
+    ) -> Optional[Wish]:
+        """Fill a wish's empty fields from the page behind its link; None if nothing changed."""
+        enriched = await self._wish_repository.fill_missing(
+            wish_id,
+            link,
+            title=metadata.title,
+            description=metadata.description,
+            image_url=metadata.image_url,
+            price=metadata.price,
+            currency=metadata.currency,
+        )
+        if enriched is not None:
+            self._emit(WishEvents.UPDATED, enriched)
+        return enriched
 
     async def delete_wish(self, wish_id: UUID) -> None:
         """Delete a wish."""
-        wish = await self._wish_repository.get_by_id(wish_id)
+        wish = await self._wish_repository.get_by_id(wish_id, for_update=True)
         if not wish:
             raise ValueError(f"Wish with id {wish_id} not found")
 
         await self._wish_repository.delete(wish_id)
+        self._emit(WishEvents.DELETED, wish, previous_booked_by_user_id=wish.booked_by_user_id)
 
     async def fulfill_wish(self, wish_id: UUID, user_id: UUID) -> Wish:
         """Mark a wish as fulfilled by moving it to 'Fulfilled Dreams' wishlist."""
-        wish = await self._wish_repository.get_by_id(wish_id)
+        wish = await self._wish_repository.get_by_id(wish_id, for_update=True)
         if not wish:
             raise ValueError(f"Wish with id {wish_id} not found")
 
@@ -142,28 +196,40 @@ class WishService:
             )
 
         # Move wish
+        booked_by_user_id = wish.booked_by_user_id
+        previous_wishlist_id = wish.wishlist_id
         wish.wishlist_id = fulfilled_wishlist.id
         wish.is_booked = False  # Reset booking status as it is now fulfilled
         wish.booked_by_user_id = None
         wish.updated_at = datetime.now(timezone.utc)
 
-        return await self._wish_repository.update(wish)
+        fulfilled = await self._wish_repository.update(wish)
+        self._emit(
+            WishEvents.FULFILLED,
+            fulfilled,
+            previous_booked_by_user_id=booked_by_user_id,
+            previous_wishlist_id=previous_wishlist_id,
+        )
+        return fulfilled
 
     async def book_wish(self, wish_id: UUID, booker_id: UUID) -> Wish:
-        """Book a wish by a non-owner user."""
-        wish = await self._wish_repository.get_by_id(wish_id)
-        if not wish:
-            raise ValueError(f"Wish with id {wish_id} not found")
+        """
+        Book a wish by a non-owner user.
 
-        wish.is_booked = True
-        wish.booked_by_user_id = booker_id
-        wish.updated_at = datetime.now(timezone.utc)
+        Raises WishAlreadyBookedError if someone else booked it first.
+        """
+        booked = await self._wish_repository.book(wish_id, booker_id, datetime.now(timezone.utc))
+        if booked is None:
+            if await self._wish_repository.get_by_id(wish_id) is None:
+                raise ValueError(f"Wish with id {wish_id} not found")
+            raise WishAlreadyBookedError("Wish already booked by someone else")
 
-        return await self._wish_repository.update(wish)
+        self._emit(WishEvents.BOOKED, booked)
+        return booked
 
     async def unbook_wish(self, wish_id: UUID, requester_id: UUID) -> Wish:
         """Cancel a booking. Only the user who booked it can cancel."""
-        wish = await self._wish_repository.get_by_id(wish_id)
+        wish = await self._wish_repository.get_by_id(wish_id, for_update=True)
         if not wish:
             raise ValueError(f"Wish with id {wish_id} not found")
 
@@ -174,4 +240,6 @@ class WishService:
         wish.booked_by_user_id = None
         wish.updated_at = datetime.now(timezone.utc)
 
-        return await self._wish_repository.update(wish)
+        unbooked = await self._wish_repository.update(wish)
+        self._emit(WishEvents.UNBOOKED, unbooked, previous_booked_by_user_id=requester_id)
+        return unbooked
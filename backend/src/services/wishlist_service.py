@@ -6,15 +6,34 @@ Service layer orchestrates domain logic and repository calls.
 from typing import Optional
 from uuid import UUID
 
-from src.domain.entities import Wishlist, WishlistCreate, WishlistUpdate
-from src.repositories import WishlistRepository
+from src.domain.entities import (
+    WishEvents,
+    Wishlist,
+    WishlistCreate,
+    WishlistEvents,
+    WishlistUpdate,
+)
+from src.repositories import OutboxRepository, WishlistRepository, WishRepository
 
 
 class WishlistService:
     """Service for wishlist-related business logic."""
 
-    def __init__(self, repository: WishlistRepository):
+    def __init__(
+        self,
+        repository: WishlistRepository,
+        wish_repository: Optional[WishRepository] = None,
+        outbox_repository: Optional[OutboxRepository] = None,
+    ):
         self._repository = repository
+        self._wish_repository = wish_repository
+        self._outbox_repository = outbox_repository
+
+    def _emit(self, event_type: str, wishlist: Wishlist) -> None:
+        """Record a wishlist event in the outbox, committed together with the change."""
+        if self._outbox_repository is None:
+            return
+        self._outbox_repository.add(event_type, "wishlist", wishlist.id, wishlist.to_dict())
 
     async def get_wishlist_by_id(self, wishlist_id: UUID) -> Optional[Wishlist]:
         """Get wishlist by ID."""
@@ -26,14 +45,36 @@ class WishlistService:
 
     async def create_wishlist(self, data: WishlistCreate) -> Wishlist:
         """Create a new wishlist."""
-        return await self._repository.create(data)
+        wishlist = await self._repository.create(data)
+        self._emit(WishlistEvents.CREATED, wishlist)
+        return wishlist
 
     async def update_wishlist(
         self, wishlist_id: UUID, data: WishlistUpdate
     ) -> Optional[Wishlist]:
         """Update an existing wishlist."""
-        return await self._repository.update(wishlist_id, data)
+        wishlist = await self._repository.update(wishlist_id, data)
+        if wishlist is not None:
+            self._emit(WishlistEvents.UPDATED, wishlist)
+        return wishlist
 
     async def delete_wishlist(self, wishlist_id: UUID) -> bool:
-        """Delete a wishlist."""
-        return await self._repository.delete(wishlist_id)
+        """Delete a wishlist and, by cascade, its wishes."""
+        wishlist = await self._repository.get_by_id(wishlist_id)
+        if wishlist is None:
+            return False
+
+        if self._outbox_repository is not None and self._wish_repository is not None:
+            # The cascade removes the wishes without going through WishService,
+            # so their deletions are recorded here, e.g. for bookers to hear of
+            for wish in await self._wish_repository.get_by_wishlist_id(wishlist_id):
+                payload = wish.to_dict()
+                payload["previous_booked_by_user_id"] = (
+                    str(wish.booked_by_user_id) if wish.booked_by_user_id else None
+                )
+                self._outbox_repository.add(WishEvents.DELETED, "wish", wish.id, payload)
+
+        deleted = await self._repository.delete(wishlist_id)
+        if deleted:
+            self._emit(WishlistEvents.DELETED, wishlist)
+        return deleted
@@ -0,0 +1,221 @@
+"""
+Fake Telegram for webhook throughput tests.
+
+Usage (from bot/), with the bot started as
+    BOT_MODE=webhook WEBHOOK_SECRET=test TELEGRAM_API_URL=http://localhost:8081 \\
+    TELEGRAM_BOT_TOKEN=1:fake python -m src.main
+run
+    python -m scripts.fake_telegram --chats 2000 --connections 40 --secret test
+
+The script plays both sides of Telegram. It serves a fake Bot API on
+--api-port that answers every method and records the messages the bot sends.
+It also posts webhook updates to --webhook-url. Each chat sends /start and
+then «Пропустить», one after the other, with at most --connections requests
+in flight, like Telegram's max_connections. A 503 is retried after
+Retry-After.
+
+The report covers webhook accept latency, 503 counts and end-to-end flow
+times. It also checks ordering: a chat whose reply to «Пропустить» is missing
+or arrives before the birth-date prompt had its updates reordered.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+import aiohttp
+from aiohttp import web
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+PROMPT_MARK = "день рождения"
+WELCOME_MARK = "Добро пожаловать"
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile in milliseconds."""
+    if not sorted_samples:
+        return None
+    rank = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return round(sorted_samples[rank] * 1000, 2)
+
+
+class FakeBotAPI:
+    """
+    Minimal Bot API server recording sendMessage calls per chat.
+
+    With `global_rate` or `chat_interval` set it enforces flood limits like
+    Telegram and answers 429 with retry_after when they are exceeded.
+    """
+
+    def __init__(self, global_rate: float = 0.0, chat_interval: float = 0.0) -> None:
+        self.sent: dict[int, list[str]] = defaultdict(list)
+        self.sent_at: dict[int, list[float]] = defaultdict(list)
+        self.completed: dict[int, float] = {}
+        self.calls: dict[str, int] = defaultdict(int)
+        self.rate_limited = 0
+        self._message_id = 0
+        self._global_rate = global_rate
+        self._chat_interval = chat_interval
+        self._window: list[float] = []
+        self._last_in_chat: dict[int, float] = {}
+
+    def _flood_wait(self, chat_id: int) -> int:
+        """retry_after for this send, 0 if it is within the limits."""
+        now = time.monotonic()
+        if self._global_rate:
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self._global_rate:
+                return 1
+        if self._chat_interval and now - self._last_in_chat.get(chat_id, -1e9) < self._chat_interval:
+            return max(1, round(self._chat_interval))
+        self._window.append(now)
+        self._last_in_chat[chat_id] = now
+        return 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params: dict[str, Any] = dict(await request.post())
+        result: Any = True
+
+        if method == "sendMessage":
+            retry_after = self._flood_wait(int(params["chat_id"]))
+            if retry_after:
+                self.rate_limited += 1
+                return web.json_response({
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {retry_after}",
+                    "parameters": {"retry_after": retry_after},
+                })
+
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+        elif method == "getUserProfilePhotos":
+            result = {"total_count": 0, "photos": []}
+        elif method == "sendMessage":
+            chat_id = int(params["chat_id"])
+            text = str(params.get("text", ""))
+            self.sent[chat_id].append(text)
+            self.sent_at[chat_id].append(time.perf_counter())
+            if WELCOME_MARK in text:
+                self.completed[chat_id] = time.perf_counter()
+            self._message_id += 1
+            result = {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": text,
+            }
+        return web.json_response({"ok": True, "result": result})
+
+    def in_order(self, chat_id: int) -> bool:
+        """The prompt came before the welcome messages."""
+        texts = self.sent.get(chat_id, [])
+        prompt = next((i for i, t in enumerate(texts) if PROMPT_MARK in t), None)
+        welcome = next((i for i, t in enumerate(texts) if WELCOME_MARK in t), None)
+        return prompt is not None and welcome is not None and prompt < welcome
+
+
+def _update(update_id: int, chat_id: int, text: str) -> dict[str, Any]:
+    user = {"id": chat_id, "is_bot": False, "first_name": "Load", "username": f"load{chat_id}"}
+    message: dict[str, Any] = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private", "first_name": "Load"},
+        "from": user,
+        "text": text,
+    }
+    if text.startswith("/"):
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+    return {"update_id": update_id, "message": message}
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive the bot webhook with fake Telegram traffic")
+    parser.add_argument("--webhook-url", default="http://localhost:8080/webhook")
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--secret", default="")
+    parser.add_argument("--chats", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=40)
+    parser.add_argument("--chat-id-base", type=int, default=9_200_000_000)
+    parser.add_argument("--settle", type=float, default=30.0,
+                        help="Seconds to wait for the bot's replies after the last update")
+    args = parser.parse_args(argv)
+
+    api = FakeBotAPI()
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", api.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", args.api_port).start()
+
+    headers = {SECRET_HEADER: args.secret} if args.secret else {}
+    semaphore = asyncio.Semaphore(args.connections)
+    latencies: list[float] = []
+    rejected = 0
+    failed = 0
+    started_at: dict[int, float] = {}
+    update_ids = iter(range(1, 2 * args.chats + 1))
+
+    async def deliver(http: aiohttp.ClientSession, payload: dict[str, Any]) -> None:
+        nonlocal rejected, failed
+        while True:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    async with http.post(args.webhook_url, json=payload, headers=headers) as response:
+                        status = response.status
+                        retry_after = float(response.headers.get("Retry-After", "1"))
+                except aiohttp.ClientError:
+                    status, retry_after = 0, 1.0
+                latencies.append(time.perf_counter() - started)
+            if status == 200:
+                return
+            if status == 503:
+                rejected += 1
+            else:
+                failed += 1
+            await asyncio.sleep(retry_after)
+
+    async def chat_flow(http: aiohttp.ClientSession, chat_id: int) -> None:
+        started_at[chat_id] = time.perf_counter()
+        await deliver(http, _update(next(update_ids), chat_id, "/start"))
+        await deliver(http, _update(next(update_ids), chat_id, "Пропустить"))
+
+    chat_ids = [args.chat_id_base + i for i in range(args.chats)]
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    started = time.perf_counter()
+    try:
+        async with aiohttp.ClientSession(connector=connector) as http:
+            await asyncio.gather(*(chat_flow(http, chat_id) for chat_id in chat_ids))
+        sent_elapsed = time.perf_counter() - started
+
+        deadline = time.perf_counter() + args.settle
+        while len(api.completed) < args.chats and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+    finally:
+        await runner.cleanup()
+
+    latencies.sort()
+    flows = sorted(api.completed[c] - started_at[c] for c in api.completed if c in started_at)
+    print(json.dumps({
+        "updates": 2 * args.chats,
+        "updates_per_s": round(2 * args.chats / sent_elapsed, 1),
+        "webhook_p50_ms": _percentile(latencies, 50),
+        "webhook_p99_ms": _percentile(latencies, 99),
+        "rejected_503": rejected,
+        "failed": failed,
+        "flows_completed": len(api.completed),
+        "flow_p50_ms": _percentile(flows, 50),
+        "flow_p99_ms": _percentile(flows, 99),
+        "out_of_order_chats": sum(1 for c in chat_ids if not api.in_order(c)),
+        "api_calls": dict(api.calls),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
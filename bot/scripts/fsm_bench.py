@@ -0,0 +1,120 @@
+"""
+Per-update overhead of the FSM storage.
+
+Usage (from bot/):
+    python -m scripts.fsm_bench --users 2000 --concurrency 50
+    python -m scripts.fsm_bench --storage-url redis://localhost:6379/0
+
+Replays the storage calls aiogram makes for the registration flow: every
+update takes the event-isolation lock and reads the raw state, /start then
+sets waiting_for_birth_date, and the birth-date reply clears it. Prints
+latency percentiles per update and, for Redis, the bytes held per user
+while the flow is open.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage, StorageKey
+
+from src.config import Settings
+from src.handlers.start import RegistrationStates
+from src.storage import create_fsm_storage
+
+BOT_ID = 1
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile in microseconds."""
+    if not sorted_samples:
+        return None
+    rank = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return round(sorted_samples[rank] * 1_000_000, 1)
+
+
+async def _update(
+    storage: BaseStorage,
+    isolation: Optional[BaseEventIsolation],
+    key: StorageKey,
+    new_state: Optional[str],
+) -> float:
+    """One update through the FSM middleware and handler; returns its duration."""
+    started = time.perf_counter()
+    if isolation is not None:
+        async with isolation.lock(key):
+            await storage.get_state(key)
+            await storage.set_state(key, new_state)
+            if new_state is None:
+                await storage.set_data(key, {})
+    else:
+        await storage.get_state(key)
+        await storage.set_state(key, new_state)
+        if new_state is None:
+            await storage.set_data(key, {})
+    return time.perf_counter() - started
+
+
+async def _key_bytes(storage: BaseStorage, key: StorageKey) -> Optional[int]:
+    """Memory held by one user's keys, if the backend can report it."""
+    redis = getattr(storage, "redis", None)
+    if redis is None:
+        return None
+    total = 0
+    for part in ("state", "data"):
+        usage = await redis.memory_usage(storage.key_builder.build(key, part))
+        total += usage or 0
+    return total
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure FSM storage overhead per update")
+    parser.add_argument("--storage-url", default="", help="redis:// URL; empty benchmarks memory storage")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--user-id-base", type=int, default=9_100_000_000)
+    args = parser.parse_args(argv)
+
+    settings = Settings(telegram_bot_token=f"{BOT_ID}:bench", fsm_storage_url=args.storage_url)
+    storage, isolation = create_fsm_storage(settings)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    waiting = RegistrationStates.waiting_for_birth_date.state
+    samples: list[float] = []
+    key_bytes: Optional[int] = None
+
+    async def flow(index: int) -> None:
+        nonlocal key_bytes
+        user_id = args.user_id_base + index
+        key = StorageKey(bot_id=BOT_ID, chat_id=user_id, user_id=user_id)
+        async with semaphore:
+            samples.append(await _update(storage, isolation, key, waiting))
+            if key_bytes is None:
+                key_bytes = await _key_bytes(storage, key)
+            samples.append(await _update(storage, isolation, key, None))
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(flow(i) for i in range(args.users)))
+    finally:
+        await storage.close()
+        if isolation is not None:
+            await isolation.close()
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    print(json.dumps({
+        "storage": type(storage).__name__,
+        "updates": len(samples),
+        "updates_per_s": round(len(samples) / elapsed, 1),
+        "mean_us": round(sum(samples) / len(samples) * 1_000_000, 1),
+        "p50_us": _percentile(samples, 50),
+        "p95_us": _percentile(samples, 95),
+        "p99_us": _percentile(samples, 99),
+        "bytes_per_open_flow": key_bytes,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Outbound sender against a rate-limited fake Bot API.
+
+Usage (from bot/):
+    python -m scripts.sender_bench --bulk 600 --chats 300 --interactive 50
+
+Starts FakeBotAPI with Telegram-like flood limits (--api-rate messages/s in
+total, one message per --api-chat-interval seconds per chat). The bot session
+uses the production RateLimitMiddleware and OutboundSender. --bulk
+notifications are spread over --chats chats, and --interactive replies are
+sent directly while the bulk lane drains. Reports throughput, 429s, and the
+time interactive replies waited.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+from scripts.fake_telegram import FakeBotAPI, _percentile
+from src.services import (
+    Lane,
+    MemoryRetryStore,
+    OutboundSender,
+    PriorityTokenBucket,
+    RateLimitMiddleware,
+)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the outbound sender")
+    parser.add_argument("--api-port", type=int, default=8082)
+    parser.add_argument("--api-rate", type=float, default=30.0)
+    parser.add_argument("--api-chat-interval", type=float, default=1.0)
+    parser.add_argument("--rate", type=float, default=25.0, help="Sender's global rate")
+    parser.add_argument("--bulk", type=int, default=600)
+    parser.add_argument("--chats", type=int, default=300)
+    parser.add_argument("--interactive", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    api = FakeBotAPI(global_rate=args.api_rate, chat_interval=args.api_chat_interval)
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", api.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.api_port).start()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{args.api_port}"))
+    session.middleware(RateLimitMiddleware(PriorityTokenBucket(args.rate, int(args.rate))))
+    bot = Bot(token="1:bench", session=session)
+    sender = OutboundSender(
+        bot,
+        MemoryRetryStore(),
+        workers=args.workers,
+        max_pending=args.bulk,
+        chat_interval=args.api_chat_interval,
+        group_interval=3.0,
+        max_attempts=5,
+        retry_backoff=1.0,
+    )
+    sender.start()
+
+    started = time.perf_counter()
+    for index in range(args.bulk):
+        await sender.enqueue(1_000_000 + index % args.chats, f"bulk {index}", lane=Lane.BULK)
+
+    interactive_waits: list[float] = []
+
+    async def reply(index: int) -> None:
+        await asyncio.sleep(index * 0.2)
+        sent = time.perf_counter()
+        await bot.send_message(2_000_000 + index, f"reply {index}")
+        interactive_waits.append(time.perf_counter() - sent)
+
+    await asyncio.gather(*(reply(i) for i in range(args.interactive)))
+    while sender.depth or sum(len(v) for k, v in api.sent.items() if k < 2_000_000) < args.bulk:
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    await sender.close(timeout=1.0)
+    await bot.session.close()
+    await runner.cleanup()
+
+    interactive_waits.sort()
+    print(json.dumps({
+        "bulk_sent": sum(len(v) for k, v in api.sent.items() if k < 2_000_000),
+        "interactive_sent": len(interactive_waits),
+        "elapsed_s": round(elapsed, 2),
+        "messages_per_s": round((args.bulk + args.interactive) / elapsed, 1),
+        "api_429": api.rate_limited,
+        "interactive_p50_ms": _percentile(interactive_waits, 50),
+        "interactive_p99_ms": _percentile(interactive_waits, 99),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,3 @@
-from .client import BackendAPIClient
+from .client import BackendAPIClient, BackendAPIError
 
-__all__ = ["BackendAPIClient"]
+__all__ = ["BackendAPIClient", "BackendAPIError"]
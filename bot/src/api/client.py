@@ -3,13 +3,17 @@ Backend API client for bot-to-backend communication.
 Handles all HTTP requests to the backend service.
 """
 
+import hashlib
+import hmac
+import json
 import logging
+import time
 from dataclasses import dataclass
 from datetime import date
 from typing import Optional
+from urllib.parse import quote
 
-import aiohttp
-
+from src.api.transport import BackendTransport, CallStats, TransportError, TransportResponse
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -35,6 +39,59 @@ class RegisterResult:
     is_new_user: bool
 
 
+@dataclass
+class BirthdayPerson:
+    """User whose birthday is coming up."""
+
+    telegram_id: int
+    username: Optional[str]
+    first_name: str
+    last_name: Optional[str]
+    birth_date: date
+
+
+@dataclass
+class BirthdayReminder:
+    """Birthdays to tell one follower about."""
+
+    recipient_telegram_id: int
+    birthdays: list[BirthdayPerson]
+
+
+@dataclass
+class BirthdayReminderPage:
+    """One page of birthday reminders."""
+
+    target_date: date
+    reminders: list[BirthdayReminder]
+    next_after: Optional[int]
+
+
+@dataclass
+class ActiveUser:
+    """User whose avatar the refresh job keeps current."""
+
+    telegram_id: int
+    avatar_url: Optional[str]
+
+
+@dataclass
+class ActiveUserPage:
+    """One page of active users."""
+
+    users: list[ActiveUser]
+    next_after: Optional[int]
+
+
+@dataclass
+class BackendNotification:
+    """Message the backend queued for the bot to send."""
+
+    id: int
+    telegram_id: int
+    text: str
+
+
 class BackendAPIError(Exception):
     """Exception for backend API errors."""
 
@@ -48,25 +105,47 @@ class BackendAPIClient:
 
     def __init__(self):
         self._settings = get_settings()
-        self._base_url = self._settings.backend_api_url.rstrip("/")
-        self._timeout = aiohttp.ClientTimeout(
-            total=self._settings.backend_api_timeout
-        )
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=self._timeout,
-                headers={"Content-Type": "application/json"},
-            )
-        return self._session
+        self._transport = BackendTransport(self._settings)
 
     async def close(self) -> None:
         """Close the HTTP session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        await self._transport.close()
+
+    @property
+    def stats(self) -> dict[str, CallStats]:
+        """Per-call timing statistics."""
+        return self._transport.stats
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        name: str,
+        idempotent: bool,
+        json: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        """Send a request, mapping transport failures to BackendAPIError."""
+        try:
+            return await self._transport.request(
+                method, path, name=name, idempotent=idempotent,
+                json=json, data=data, headers=headers,
+            )
+        except TransportError as e:
+            logger.error(f"Backend API connection error: {e}")
+            raise BackendAPIError(f"Connection error: {e}")
+
+    def _signed_headers(self, method: str, path: str, body: bytes = b"") -> dict[str, str]:
+        """Headers proving to the backend's internal routes that the bot sent the request."""
+        key = (self._settings.bot_api_secret or self._settings.telegram_bot_token).encode()
+        timestamp = str(int(time.time()))
+        message = b"\n".join([
+            timestamp.encode(), method.encode(), path.encode(), hashlib.sha256(body).hexdigest().encode(),
+        ])
+        signature = hmac.new(key, message, hashlib.sha256).hexdigest()
+        return {"X-Bot-Timestamp": timestamp, "X-Bot-Signature": signature}
 
     async def register_user(
         self,
@@ -89,9 +168,6 @@ class BackendAPIClient:
         Returns:
             RegisterResult with user data and is_new_user flag
         """
-        session = await self._get_session()
-        url = f"{self._base_url}/api/v1/users/register"
-
         payload = {
             "telegram_id": telegram_id,
             "username": username,
@@ -100,76 +176,294 @@ class BackendAPIClient:
             "avatar_url": avatar_url,
         }
 
-        try:
-            async with session.post(url, json=payload) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    logger.error(
-                        f"Backend API error: {response.status} - {text}"
-                    )
-                    raise BackendAPIError(
-                        f"Registration failed: {text}",
-                        status_code=response.status,
-                    )
-
-                data = await response.json()
-
-                user_data = data["user"]
-                return RegisterResult(
-                    user=UserData(
-                        id=user_data["id"],
-                        telegram_id=user_data["telegram_id"],
-                        username=user_data.get("username"),
-                        first_name=user_data["first_name"],
-                        last_name=user_data.get("last_name"),
-                        avatar_url=user_data.get("avatar_url"),
-                    ),
-                    is_new_user=data["is_new_user"],
-                )
+        # Registration is an idempotent upsert, so it is safe to retry
+        response = await self._request(
+            "POST", "/api/v1/users/register",
+            name="register_user", idempotent=True, json=payload,
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Registration failed: {response.body}",
+                status_code=response.status,
+            )
 
-        except aiohttp.ClientError as e:
-            logger.error(f"Backend API connection error: {e}")
-            raise BackendAPIError(f"Connection error: {e}")
+        data = response.body
+        user_data = data["user"]
+        return RegisterResult(
+            user=UserData(
+                id=user_data["id"],
+                telegram_id=user_data["telegram_id"],
+                username=user_data.get("username"),
+                first_name=user_data["first_name"],
+                last_name=user_data.get("last_name"),
+                avatar_url=user_data.get("avatar_url"),
+            ),
+            is_new_user=data["is_new_user"],
+        )
+
+    async def register_users_bulk(self, users: list[dict]) -> tuple[int, int]:
+        """
+        Register or update a batch of users in one request.
+
+        Args:
+            users: Registration payloads as accepted by register_user
+
+        Returns:
+            Tuple of (registered, updated) counts
+        """
+        response = await self._request(
+            "POST", "/api/v1/users/register/bulk",
+            name="register_users_bulk", idempotent=True, json={"users": users},
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error in bulk registration: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Bulk registration failed: {response.body}",
+                status_code=response.status,
+            )
+        return response.body["registered"], response.body["updated"]
+
+    async def get_birthday_reminders(
+        self,
+        days_ahead: int,
+        after: int = 0,
+        limit: int = 1000,
+    ) -> BirthdayReminderPage:
+        """
+        Get one page of followers to notify about upcoming birthdays.
+
+        Args:
+            days_ahead: How many days from today the birthdays are
+            after: next_after of the previous page, 0 for the first
+            limit: Recipients per page
+
+        Returns:
+            BirthdayReminderPage
+        """
+        path = f"/api/v1/users/birthdays/upcoming?days_ahead={days_ahead}&after={after}&limit={limit}"
+        response = await self._request(
+            "GET", path, name="get_birthday_reminders", idempotent=True,
+            headers=self._signed_headers("GET", path),
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error getting birthdays: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Birthday reminders failed: {response.body}",
+                status_code=response.status,
+            )
+
+        data = response.body
+        return BirthdayReminderPage(
+            target_date=date.fromisoformat(data["target_date"]),
+            reminders=[
+                BirthdayReminder(
+                    recipient_telegram_id=item["recipient_telegram_id"],
+                    birthdays=[
+                        BirthdayPerson(
+                            telegram_id=person["telegram_id"],
+                            username=person.get("username"),
+                            first_name=person["first_name"],
+                            last_name=person.get("last_name"),
+                            birth_date=date.fromisoformat(person["birth_date"]),
+                        )
+                        for person in item["birthdays"]
+                    ],
+                )
+                for item in data["reminders"]
+            ],
+            next_after=data.get("next_after"),
+        )
 
     async def update_user_profile(
         self,
         telegram_id: int,
-        birth_date: date,
+        birth_date: Optional[date] = None,
+        avatar_url: Optional[str] = None,
     ) -> None:
         """
-        Update user profile with birth_date.
+        Update user profile fields. Fields left as None are not changed.
 
         Args:
             telegram_id: Telegram user ID
             birth_date: User's date of birth
+            avatar_url: User's avatar URL
         """
-        session = await self._get_session()
-        url = f"{self._base_url}/api/v1/users/telegram/{telegram_id}/profile"
+        payload = {}
+        if birth_date is not None:
+            payload["birth_date"] = birth_date.isoformat()
+        if avatar_url is not None:
+            payload["avatar_url"] = avatar_url
+
+        response = await self._request(
+            "PATCH", f"/api/v1/users/telegram/{telegram_id}/profile",
+            name="update_user_profile", idempotent=True, json=payload,
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error updating profile: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Profile update failed: {response.body}",
+                status_code=response.status,
+            )
 
-        payload = {"birth_date": birth_date.isoformat()}
+    async def get_active_users(
+        self,
+        days: int,
+        after: int = 0,
+        limit: int = 500,
+    ) -> ActiveUserPage:
+        """
+        Get one page of users whose avatars should be refreshed.
 
-        try:
-            async with session.patch(url, json=payload) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    logger.error(
-                        f"Backend API error updating profile: {response.status} - {text}"
-                    )
-                    raise BackendAPIError(
-                        f"Profile update failed: {text}",
-                        status_code=response.status,
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Backend API connection error: {e}")
-            raise BackendAPIError(f"Connection error: {e}")
+        Args:
+            days: Users active within this many days
+            after: next_after of the previous page, 0 for the first
+            limit: Users per page
+
+        Returns:
+            ActiveUserPage
+        """
+        path = f"/api/v1/users/active?days={days}&after={after}&limit={limit}"
+        response = await self._request(
+            "GET", path, name="get_active_users", idempotent=True,
+            headers=self._signed_headers("GET", path),
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error getting active users: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Active users failed: {response.body}",
+                status_code=response.status,
+            )
+
+        data = response.body
+        return ActiveUserPage(
+            users=[
+                ActiveUser(telegram_id=item["telegram_id"], avatar_url=item.get("avatar_url"))
+                for item in data["users"]
+            ],
+            next_after=data.get("next_after"),
+        )
+
+    async def claim_notifications(self, limit: int = 100) -> list[BackendNotification]:
+        """
+        Claim messages the backend queued for the bot.
+
+        Claimed messages are handed out again unless acknowledged with
+        ack_notifications in time.
+
+        Args:
+            limit: Messages per claim
+
+        Returns:
+            list of BackendNotification, oldest first
+        """
+        path = f"/api/v1/notifications/bot/claim?limit={limit}"
+        # A retried claim would take another batch, leaving the first to time out
+        response = await self._request(
+            "POST", path, name="claim_notifications", idempotent=False,
+            headers=self._signed_headers("POST", path),
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error claiming notifications: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Notification claim failed: {response.body}",
+                status_code=response.status,
+            )
+        return [
+            BackendNotification(id=item["id"], telegram_id=item["telegram_id"], text=item["text"])
+            for item in response.body["notifications"]
+        ]
+
+    async def ack_notifications(self, ids: list[int]) -> None:
+        """
+        Tell the backend that claimed messages are queued for sending.
+
+        Args:
+            ids: IDs of the claimed messages
+        """
+        path = "/api/v1/notifications/bot/ack"
+        body = json.dumps({"ids": ids}).encode()
+        response = await self._request(
+            "POST", path, name="ack_notifications", idempotent=True, data=body,
+            headers={"Content-Type": "application/json", **self._signed_headers("POST", path, body)},
+        )
+        if response.status != 204:
+            logger.error(
+                f"Backend API error acknowledging notifications: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Notification ack failed: {response.body}",
+                status_code=response.status,
+            )
+
+    async def get_avatar(self, file_unique_id: str) -> Optional[str]:
+        """
+        Find an already mirrored profile photo.
+
+        Args:
+            file_unique_id: Telegram file_unique_id of the photo
+
+        Returns:
+            Avatar URL to store on the user, or None if it must be uploaded
+        """
+        response = await self._request(
+            "GET", f"/api/v1/avatars/telegram/{quote(file_unique_id)}",
+            name="get_avatar", idempotent=True,
+        )
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise BackendAPIError(
+                f"Avatar lookup failed: {response.body}",
+                status_code=response.status,
+            )
+        return response.body["url"]
+
+    async def upload_avatar(self, file_unique_id: str, data: bytes) -> str:
+        """
+        Mirror a profile photo to the backend.
+
+        Args:
+            file_unique_id: Telegram file_unique_id of the photo
+            data: The JPEG downloaded from Telegram
+
+        Returns:
+            Avatar URL to store on the user
+        """
+        path = f"/api/v1/avatars/telegram/{quote(file_unique_id)}"
+        # Storing the same photo again is a no-op, so the upload may be retried
+        response = await self._request(
+            "PUT", path, name="upload_avatar", idempotent=True, data=data,
+            headers={"Content-Type": "image/jpeg", **self._signed_headers("PUT", path, data)},
+        )
+        if response.status != 200:
+            logger.error(
+                f"Backend API error uploading avatar: {response.status} - {response.body}"
+            )
+            raise BackendAPIError(
+                f"Avatar upload failed: {response.body}",
+                status_code=response.status,
+            )
+        return response.body["url"]
 
     async def health_check(self) -> bool:
         """Check if backend is healthy."""
-        session = await self._get_session()
-        url = f"{self._base_url}/health"
-
         try:
-            async with session.get(url) as response:
-                return response.status == 200
-        except aiohttp.ClientError:
+            response = await self._transport.request(
+                "GET", "/health", name="health_check", idempotent=True
+            )
+        except TransportError:
             return False
+        return response.status == 200
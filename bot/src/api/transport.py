@@ -0,0 +1,239 @@
+"""
+HTTP transport for backend calls.
+Pooled connections, retries with jittered backoff for idempotent calls,
+a circuit breaker and per-call timing statistics.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import aiohttp
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: the backend (or the proxy in front) is briefly unavailable
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class TransportError(Exception):
+    """Backend could not be reached or kept failing."""
+
+
+class CircuitOpenError(TransportError):
+    """Backend is considered down; the call was not attempted."""
+
+
+class BackendOverloadedError(TransportError):
+    """Too many calls in flight; the call waited too long for a slot."""
+
+
+@dataclass
+class TransportResponse:
+    """Status and body of a completed backend call."""
+
+    status: int
+    body: Any
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the backend is down.
+
+    Opens after `failure_threshold` consecutive failures. After
+    `reset_timeout` seconds one trial call is let through (half-open);
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a call may be attempted now."""
+        if self._opened_at is None:
+            return True
+        if time.monotonic() - self._opened_at < self._reset_timeout or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def end_trial(self) -> None:
+        """Free the half-open slot when the trial ended without an outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Backend circuit closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"Backend circuit opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+
+
+@dataclass
+class CallStats:
+    """Timing statistics for one call name."""
+
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class BackendTransport:
+    """Pooled, resilient aiohttp transport for the backend API."""
+
+    def __init__(self, settings: Settings):
+        self._settings = settings
+        self._base_url = settings.backend_api_url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(
+            total=settings.backend_api_timeout,
+            connect=settings.backend_connect_timeout,
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots = asyncio.Semaphore(settings.backend_max_concurrency)
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.backend_circuit_failure_threshold,
+            reset_timeout=settings.backend_circuit_reset_timeout,
+        )
+        self.stats: dict[str, CallStats] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled aiohttp session."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._settings.backend_max_connections,
+                limit_per_host=self._settings.backend_max_connections,
+                ttl_dns_cache=self._settings.backend_dns_cache_ttl,
+                keepalive_timeout=self._settings.backend_keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = min(
+            self._settings.backend_retry_backoff_max,
+            self._settings.backend_retry_backoff_base * (2 ** attempt),
+        )
+        return random.uniform(0, cap)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        name: str,
+        idempotent: bool,
+        json: Optional[dict] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        """
+        Call the backend with a JSON body, or a raw `data` body.
+
+        Connection errors, timeouts and 502/503/504 responses are retried
+        with backoff when the call is idempotent. Other statuses are
+        returned to the caller as-is.
+        """
+        try:
+            await asyncio.wait_for(
+                self._slots.acquire(), timeout=self._settings.backend_queue_timeout
+            )
+        except asyncio.TimeoutError:
+            raise BackendOverloadedError(f"No free backend slot for {name}")
+
+        # Only an open circuit hands out a trial, and then to one call at a time
+        trial = self._breaker.is_open
+        if not self._breaker.allow():
+            self._slots.release()
+            raise CircuitOpenError(f"Backend unavailable, skipping {name}")
+
+        stats = self.stats.setdefault(name, CallStats())
+        attempts = self._settings.backend_retry_attempts if idempotent else 1
+        started = time.perf_counter()
+        try:
+            for attempt in range(attempts):
+                if attempt:
+                    stats.retries += 1
+                    await asyncio.sleep(self._backoff(attempt))
+                try:
+                    response = await self._send(method, path, json, data, headers)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error: Exception = e
+                    logger.warning(f"Backend call {name} failed (attempt {attempt + 1}): {e}")
+                    continue
+                if response.status in RETRYABLE_STATUSES:
+                    error = TransportError(f"Backend returned {response.status}")
+                    logger.warning(
+                        f"Backend call {name} got {response.status} (attempt {attempt + 1})"
+                    )
+                    continue
+                self._breaker.record_success()
+                return response
+
+            self._breaker.record_failure()
+            stats.failures += 1
+            raise TransportError(f"{name} failed after {attempts} attempt(s): {error}")
+        finally:
+            if trial:
+                # Cancelled or failed with an unexpected error: let the next call try
+                self._breaker.end_trial()
+            self._slots.release()
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            logger.debug(f"Backend call {name} took {elapsed * 1000:.1f} ms")
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[dict],
+        data: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        session = self._get_session()
+        async with session.request(
+            method, f"{self._base_url}{path}", json=json, data=data, headers=headers
+        ) as response:
+            if response.content_type == "application/json":
+                body = await response.json()
+            else:
+                body = await response.text()
+            return TransportResponse(status=response.status, body=body)
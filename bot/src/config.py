@@ -3,7 +3,9 @@ Bot configuration module.
 Environment-based configuration with validation.
 """
 
+from datetime import time
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -29,9 +31,253 @@ class Settings(BaseSettings):
         default="http://localhost:8000",
         description="Backend API base URL"
     )
-    backend_api_timeout: int = Field(
+    bot_api_secret: str = Field(
+        default="",
+        description="Key signing calls to the backend's internal routes (defaults to the bot token)"
+    )
+    backend_api_timeout: float = Field(
+        default=5.0,
+        description="Backend API request timeout in seconds (per attempt)"
+    )
+    backend_connect_timeout: float = Field(
+        default=2.0,
+        description="Backend API connect timeout in seconds"
+    )
+    backend_max_connections: int = Field(
+        default=100,
+        description="Maximum pooled connections to the backend"
+    )
+    backend_keepalive_timeout: float = Field(
+        default=30.0,
+        description="Seconds an idle backend connection is kept alive"
+    )
+    backend_dns_cache_ttl: int = Field(
+        default=300,
+        description="Seconds to cache backend DNS lookups"
+    )
+    backend_max_concurrency: int = Field(
+        default=50,
+        description="Maximum backend calls in flight; further calls wait"
+    )
+    backend_queue_timeout: float = Field(
+        default=2.0,
+        description="Seconds a call may wait for an in-flight slot"
+    )
+    backend_retry_attempts: int = Field(
+        default=3,
+        description="Attempts for idempotent backend calls"
+    )
+    backend_retry_backoff_base: float = Field(
+        default=0.2,
+        description="Base delay in seconds for retry backoff"
+    )
+    backend_retry_backoff_max: float = Field(
+        default=2.0,
+        description="Maximum delay in seconds between retries"
+    )
+    backend_circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failures that open the circuit breaker"
+    )
+    backend_circuit_reset_timeout: float = Field(
+        default=30.0,
+        description="Seconds the circuit stays open before a trial call"
+    )
+
+    # Avatars
+    avatar_cache_ttl: float = Field(
+        default=3600.0,
+        description="Seconds before a user's profile photo is checked again"
+    )
+    avatar_cache_size: int = Field(
+        default=100_000,
+        description="Maximum users kept in the avatar cache"
+    )
+    avatar_refresh_enabled: bool = Field(
+        default=False,
+        description="Periodically re-check avatars of active users; enable in one bot process only"
+    )
+    avatar_refresh_interval: float = Field(
+        default=86400.0,
+        description="Seconds between avatar refresh runs"
+    )
+    avatar_refresh_active_days: int = Field(
         default=30,
-        description="Backend API request timeout in seconds"
+        description="Users active within this many days are refreshed"
+    )
+    avatar_refresh_rate: float = Field(
+        default=5.0,
+        description="Users checked per second by the refresh job (each costs 1-3 Bot API calls)"
+    )
+    avatar_refresh_page_size: int = Field(
+        default=500,
+        description="Users fetched from the backend per request"
+    )
+
+    # Write-behind registration
+    registration_write_behind: bool = Field(
+        default=False,
+        description="Buffer /start registrations and send them in batches"
+    )
+    registration_queue_size: int = Field(
+        default=10000,
+        description="Users buffered before submits wait for a flush"
+    )
+    registration_batch_size: int = Field(
+        default=200,
+        description="Users per bulk registration request (backend accepts up to 500)"
+    )
+    registration_flush_interval: float = Field(
+        default=0.5,
+        description="Seconds between flushes of a partial batch"
+    )
+    registration_retry_max: float = Field(
+        default=30.0,
+        description="Maximum seconds between retries of a failed batch"
+    )
+    registration_drain_timeout: float = Field(
+        default=10.0,
+        description="Seconds to flush buffered registrations on shutdown"
+    )
+
+    # Birthday reminders
+    birthday_reminders_enabled: bool = Field(
+        default=False,
+        description="Send daily birthday reminders; enable in one bot process only"
+    )
+    birthday_reminder_days_ahead: int = Field(
+        default=1,
+        description="Remind followers this many days before a birthday"
+    )
+    birthday_reminder_time: time = Field(
+        default=time(7, 0),
+        description="UTC time of the daily reminder run"
+    )
+    birthday_reminder_page_size: int = Field(
+        default=1000,
+        description="Recipients fetched from the backend per request"
+    )
+
+    # Notifications queued by the backend
+    backend_notifications_enabled: bool = Field(
+        default=True,
+        description="Send messages the backend queues, such as fulfilled or deleted booked wishes"
+    )
+    backend_notifications_interval: float = Field(
+        default=2.0,
+        description="Seconds between polls of the backend's message queue when it is empty"
+    )
+    backend_notifications_batch_size: int = Field(
+        default=100,
+        description="Messages claimed from the backend per request"
+    )
+
+    # Outbound messages
+    telegram_send_rate: float = Field(
+        default=25.0,
+        description="Messages per second across all chats (Telegram allows ~30)"
+    )
+    telegram_send_burst: int = Field(
+        default=25,
+        description="Messages that may be sent at once after an idle period"
+    )
+    sender_workers: int = Field(
+        default=8,
+        description="Concurrent outbound send workers"
+    )
+    sender_max_pending: int = Field(
+        default=5000,
+        description="Queued notifications before enqueue waits"
+    )
+    sender_chat_interval: float = Field(
+        default=1.0,
+        description="Minimum seconds between notifications to one private chat"
+    )
+    sender_group_interval: float = Field(
+        default=3.0,
+        description="Minimum seconds between notifications to one group (20/min)"
+    )
+    sender_max_attempts: int = Field(
+        default=5,
+        description="Send attempts before a message is given up"
+    )
+    sender_retry_backoff: float = Field(
+        default=5.0,
+        description="Seconds before the first retry; doubles on each attempt"
+    )
+    sender_drain_timeout: float = Field(
+        default=10.0,
+        description="Seconds to send queued messages on shutdown before persisting them"
+    )
+
+    # Metrics
+    metrics_enabled: bool = Field(
+        default=True,
+        description="Expose Prometheus metrics"
+    )
+    metrics_port: int = Field(
+        default=9100,
+        description="Internal port for /metrics"
+    )
+
+    # FSM Storage
+    fsm_storage_url: str = Field(
+        default="",
+        description="redis:// URL for shared FSM state; empty keeps state in memory"
+    )
+    fsm_state_ttl: int = Field(
+        default=86400,
+        description="Seconds before an untouched FSM state and its data expire"
+    )
+    fsm_key_prefix: str = Field(
+        default="fsm",
+        description="Prefix of FSM keys in Redis"
+    )
+
+    # Update delivery
+    bot_mode: Literal["polling", "webhook"] = Field(
+        default="polling",
+        description="How updates are received from Telegram"
+    )
+    telegram_api_url: str = Field(
+        default="",
+        description="Custom Bot API server URL (local server or a fake for load tests)"
+    )
+    webhook_base_url: str = Field(
+        default="",
+        description="Public HTTPS base URL; if set, the webhook is registered on startup"
+    )
+    webhook_path: str = Field(
+        default="/webhook",
+        description="Path Telegram posts updates to"
+    )
+    webhook_secret: str = Field(
+        default="",
+        description="Secret token Telegram sends in X-Telegram-Bot-Api-Secret-Token"
+    )
+    webhook_host: str = Field(
+        default="0.0.0.0",
+        description="Webhook server bind host"
+    )
+    webhook_port: int = Field(
+        default=8080,
+        description="Webhook server bind port"
+    )
+    webhook_max_connections: int = Field(
+        default=40,
+        description="Concurrent connections Telegram may open to the webhook"
+    )
+    webhook_workers: int = Field(
+        default=16,
+        description="Update workers; updates of one chat always go to the same worker"
+    )
+    webhook_queue_size: int = Field(
+        default=1000,
+        description="Updates queued across all workers before answering 503"
+    )
+    webhook_drain_timeout: float = Field(
+        default=10.0,
+        description="Seconds to finish queued updates on shutdown"
     )
 
     # Bot Settings
@@ -5,6 +5,7 @@ Handles /start command and user registration flow with optional birth date colle
 
 import logging
 from datetime import datetime
+from typing import Optional
 
 from aiogram import Router
 from aiogram.filters import CommandStart
@@ -13,6 +14,7 @@ from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message
 
 from src.api import BackendAPIClient
+from src.services import AvatarResolver, RegistrationQueue
 from src.keyboards import get_main_keyboard, get_remove_keyboard, get_skip_keyboard
 
 logger = logging.getLogger(__name__)
@@ -35,14 +37,21 @@ class RegistrationStates(StatesGroup):
 
 
 @router.message(CommandStart())
-async def handle_start(message: Message, state: FSMContext, api_client: BackendAPIClient) -> None:
+async def handle_start(
+    message: Message,
+    state: FSMContext,
+    api_client: BackendAPIClient,
+    avatar_resolver: AvatarResolver,
+    registration_queue: Optional[RegistrationQueue],
+) -> None:
     """
     Handle /start command.
 
     Flow:
     1. Extract user data from message
     2. Register/update user in backend
-    3. Ask for birth date (optional)
+    3. Schedule avatar resolution in the background
+    4. Ask for birth date (optional)
     """
     user = message.from_user
     if not user:
@@ -55,36 +64,39 @@ async def handle_start(message: Message, state: FSMContext, api_client: BackendA
     first_name = user.first_name or "User"
     last_name = user.last_name
 
-    # Get user avatar URL (optional)
-    avatar_url = None
-    try:
-        photos = await message.bot.get_user_profile_photos(telegram_id, limit=1)
-        if photos.photos and photos.photos[0]:
-            file = await message.bot.get_file(photos.photos[0][0].file_id)
-            if file.file_path:
-                avatar_url = f"https://api.telegram.org/file/bot{message.bot.token}/{file.file_path}"
-    except Exception as e:
-        logger.debug(f"Could not get avatar: {e}")
-
     # Register user in backend
+    known_avatar_url = None
     try:
-        result = await api_client.register_user(
-            telegram_id=telegram_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            avatar_url=avatar_url,
-        )
-        logger.info(
-            f"User {'registered' if result.is_new_user else 'updated'}: "
-            f"{telegram_id} (@{username})"
-        )
+        if registration_queue is not None:
+            # Write-behind: sent to the backend with the next batch
+            await registration_queue.submit(
+                telegram_id=telegram_id,
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+            )
+        else:
+            result = await api_client.register_user(
+                telegram_id=telegram_id,
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+            )
+            known_avatar_url = result.user.avatar_url
+            logger.info(
+                f"User {'registered' if result.is_new_user else 'updated'}: "
+                f"{telegram_id} (@{username})"
+            )
     except Exception as e:
         logger.error(f"Failed to register user {telegram_id}: {e}")
         # Continue anyway - show welcome message even if registration fails
 
-    # Save telegram_id for the next step and set FSM state
-    await state.set_data({"telegram_id": telegram_id})
+    # Resolve the avatar in the background, off the reply path
+    avatar_resolver.schedule(
+        message.bot, registration_queue or api_client, telegram_id, known_avatar_url
+    )
+
+    # Only the state is stored: the user is already part of the FSM key
     await state.set_state(RegistrationStates.waiting_for_birth_date)
 
     await message.answer(
@@ -97,13 +109,18 @@ async def handle_start(message: Message, state: FSMContext, api_client: BackendA
 
 
 @router.message(RegistrationStates.waiting_for_birth_date)
-async def handle_birth_date(message: Message, state: FSMContext, api_client: BackendAPIClient) -> None:
+async def handle_birth_date(
+    message: Message,
+    state: FSMContext,
+    api_client: BackendAPIClient,
+    registration_queue: Optional[RegistrationQueue],
+) -> None:
     """
     Handle birth date input after /start.
     Accepts DD.MM.YYYY format or 'Пропустить'.
     """
-    data = await state.get_data()
-    telegram_id = data.get("telegram_id")
+    user = message.from_user
+    telegram_id = user.id if user else None
 
     text = (message.text or "").strip()
 
@@ -120,7 +137,16 @@ async def handle_birth_date(message: Message, state: FSMContext, api_client: Bac
 
         if telegram_id:
             try:
-                await api_client.update_user_profile(telegram_id=telegram_id, birth_date=birth_date)
+                if registration_queue is not None:
+                    await registration_queue.submit(
+                        telegram_id=telegram_id,
+                        username=user.username,
+                        first_name=user.first_name or "User",
+                        last_name=user.last_name,
+                        birth_date=birth_date,
+                    )
+                else:
+                    await api_client.update_user_profile(telegram_id=telegram_id, birth_date=birth_date)
                 logger.info(f"Birth date saved for user {telegram_id}: {birth_date}")
             except Exception as e:
                 logger.error(f"Failed to save birth date for user {telegram_id}: {e}")
@@ -1,3 +1,15 @@
-from .main import get_main_keyboard, get_miniapp_button, get_remove_keyboard, get_skip_keyboard
+from .main import (
+    get_gift_keyboard,
+    get_main_keyboard,
+    get_miniapp_button,
+    get_remove_keyboard,
+    get_skip_keyboard,
+)
 
-__all__ = ["get_main_keyboard", "get_miniapp_button", "get_remove_keyboard", "get_skip_keyboard"]
+__all__ = [
+    "get_gift_keyboard",
+    "get_main_keyboard",
+    "get_miniapp_button",
+    "get_remove_keyboard",
+    "get_skip_keyboard",
+]
@@ -49,3 +49,18 @@ def get_main_keyboard() -> InlineKeyboardMarkup:
             [get_miniapp_button()],
         ]
     )
+
+
+def get_gift_keyboard() -> InlineKeyboardMarkup:
+    """Create keyboard for birthday reminders that opens the Mini App."""
+    settings = get_settings()
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="Выбрать подарок 🎁",
+                    web_app=WebAppInfo(url=settings.miniapp_url),
+                )
+            ],
+        ]
+    )
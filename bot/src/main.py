@@ -4,12 +4,29 @@ import sys
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 from aiogram.types import BotCommand
 
 from src.api.client import BackendAPIClient
 from src.config import get_settings
 from src.handlers import start
+from src.metrics import start_metrics_server
+from src.services import (
+    AvatarRefreshJob,
+    AvatarResolver,
+    BackendNotificationJob,
+    BirthdayReminderJob,
+    MemoryRetryStore,
+    OutboundSender,
+    PriorityTokenBucket,
+    RateLimitMiddleware,
+    RedisRetryStore,
+    RegistrationQueue,
+)
+from src.storage import create_fsm_storage
+from src.webhook import run_webhook
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
@@ -34,16 +51,85 @@ async def main() -> None:
     settings = get_settings()
 
     # Initialize bot
+    session = None
+    if settings.telegram_api_url:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.telegram_api_url))
     bot = Bot(
         token=settings.telegram_bot_token,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    # Every send* call shares the global rate limit; handler replies go first
+    bot.session.middleware(RateLimitMiddleware(
+        PriorityTokenBucket(settings.telegram_send_rate, settings.telegram_send_burst)
+    ))
 
     # Initialize dispatcher
-    dp = Dispatcher()
+    storage, events_isolation = create_fsm_storage(settings)
+    dp = Dispatcher(storage=storage, events_isolation=events_isolation)
+
+    # Failed notifications survive restarts when Redis is configured
+    redis = getattr(storage, "redis", None)
+    retry_store = (
+        RedisRetryStore(redis, key=f"{settings.fsm_key_prefix}:outbound:retry")
+        if redis is not None else MemoryRetryStore()
+    )
+    sender = OutboundSender(
+        bot,
+        retry_store,
+        workers=settings.sender_workers,
+        max_pending=settings.sender_max_pending,
+        chat_interval=settings.sender_chat_interval,
+        group_interval=settings.sender_group_interval,
+        max_attempts=settings.sender_max_attempts,
+        retry_backoff=settings.sender_retry_backoff,
+    )
 
     # Initialize API client
     api_client = BackendAPIClient()
+    avatar_resolver = AvatarResolver(
+        api_client,
+        ttl=settings.avatar_cache_ttl,
+        max_entries=settings.avatar_cache_size,
+    )
+    registration_queue = None
+    if settings.registration_write_behind:
+        registration_queue = RegistrationQueue(
+            api_client,
+            max_pending=settings.registration_queue_size,
+            batch_size=settings.registration_batch_size,
+            flush_interval=settings.registration_flush_interval,
+            retry_backoff_max=settings.registration_retry_max,
+        )
+    birthday_job = None
+    if settings.birthday_reminders_enabled:
+        birthday_job = BirthdayReminderJob(
+            sender,
+            api_client,
+            days_ahead=settings.birthday_reminder_days_ahead,
+            run_at=settings.birthday_reminder_time,
+            page_size=settings.birthday_reminder_page_size,
+        )
+    notification_job = None
+    if settings.backend_notifications_enabled:
+        notification_job = BackendNotificationJob(
+            sender,
+            api_client,
+            interval=settings.backend_notifications_interval,
+            batch_size=settings.backend_notifications_batch_size,
+        )
+    avatar_refresh_job = None
+    if settings.avatar_refresh_enabled:
+        avatar_refresh_job = AvatarRefreshJob(
+            avatar_resolver,
+            bot,
+            api_client,
+            registration_queue or api_client,
+            interval=settings.avatar_refresh_interval,
+            active_days=settings.avatar_refresh_active_days,
+            rate=settings.avatar_refresh_rate,
+            page_size=settings.avatar_refresh_page_size,
+        )
 
     # Register routers
     dp.include_router(start.router)
@@ -51,7 +137,13 @@ async def main() -> None:
     # Inject dependencies into handlers
     # We pass api_client via workflow_data (kwarg injection)
     # This works because dp.start_polling(..., api_client=api_client) passes it
-    
+    workflow_data = {
+        "api_client": api_client,
+        "avatar_resolver": avatar_resolver,
+        "registration_queue": registration_queue,
+        "sender": sender,
+    }
+
     logger.info(f"Starting {settings.bot_name}...")
 
     try:
@@ -74,9 +166,42 @@ async def main() -> None:
         else:
             logger.warning("Backend API is not responding")
 
-        # Start polling
-        await dp.start_polling(bot, api_client=api_client)
+        if settings.metrics_enabled:
+            start_metrics_server(settings.metrics_port)
+
+        sender.start()
+        if registration_queue is not None:
+            registration_queue.start()
+        if birthday_job is not None:
+            birthday_job.start()
+        if notification_job is not None:
+            notification_job.start()
+        if avatar_refresh_job is not None:
+            avatar_refresh_job.start()
+
+        if settings.bot_mode == "webhook":
+            await run_webhook(dp, bot, settings, **workflow_data)
+        else:
+            # Polling and webhooks are mutually exclusive on the Telegram side
+            await bot.delete_webhook()
+            await dp.start_polling(bot, **workflow_data)
     finally:
+        if birthday_job is not None:
+            await birthday_job.close()
+        if notification_job is not None:
+            await notification_job.close()
+        if avatar_refresh_job is not None:
+            await avatar_refresh_job.close()
+        await avatar_resolver.close()
+        if registration_queue is not None:
+            await registration_queue.close(timeout=settings.registration_drain_timeout)
+        await sender.close(timeout=settings.sender_drain_timeout)
+        for name, stats in api_client.stats.items():
+            logger.info(
+                f"Backend {name}: {stats.calls} calls, {stats.failures} failed, "
+                f"{stats.retries} retries, avg {stats.avg_time * 1000:.1f} ms, "
+                f"max {stats.max_time * 1000:.1f} ms"
+            )
         await api_client.close()
         await bot.session.close()
         logger.info("Bot stopped")
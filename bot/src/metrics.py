@@ -0,0 +1,45 @@
+"""
+Prometheus metrics for the bot.
+Served on an internal port, like the backend's.
+"""
+
+import logging
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_MESSAGES = Counter(
+    "bot_outbound_messages_total",
+    "Messages handled by the outbound sender, by lane and result",
+    ["lane", "result"],
+)
+OUTBOUND_QUEUE_DEPTH = Gauge(
+    "bot_outbound_queue_depth",
+    "Messages queued or delayed in the outbound sender",
+)
+OUTBOUND_RETRY_BACKLOG = Gauge(
+    "bot_outbound_retry_backlog",
+    "Messages waiting in the persistent retry queue",
+)
+SEND_TOKEN_WAIT = Histogram(
+    "bot_send_token_wait_seconds",
+    "Time a send waited for a global rate limit token",
+    ["lane"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+TELEGRAM_RATE_LIMITED = Counter(
+    "bot_telegram_rate_limited_total",
+    "429 Too Many Requests responses from the Bot API",
+)
+AVATAR_MIRRORS = Counter(
+    "bot_avatar_mirrors_total",
+    "Profile photos resolved to a backend avatar URL, by result (reused/uploaded/failed)",
+    ["result"],
+)
+
+
+def start_metrics_server(port: int) -> None:
+    """Expose /metrics on `port`."""
+    start_http_server(port)
+    logger.info(f"Metrics available on :{port}/metrics")
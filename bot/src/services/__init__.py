@@ -0,0 +1,20 @@
+from .avatar import AvatarRefreshJob, AvatarResolver
+from .birthdays import BirthdayReminderJob
+from .notifications import BackendNotificationJob
+from .ratelimit import Lane, PriorityTokenBucket, RateLimitMiddleware
+from .registration import RegistrationQueue
+from .sender import MemoryRetryStore, OutboundSender, RedisRetryStore
+
+__all__ = [
+    "AvatarRefreshJob",
+    "AvatarResolver",
+    "BackendNotificationJob",
+    "BirthdayReminderJob",
+    "Lane",
+    "MemoryRetryStore",
+    "OutboundSender",
+    "PriorityTokenBucket",
+    "RateLimitMiddleware",
+    "RedisRetryStore",
+    "RegistrationQueue",
+]
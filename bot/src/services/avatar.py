@@ -0,0 +1,235 @@
+"""
+Avatar resolution for registered users.
+Runs off the /start reply path, mirrors each profile photo to the backend once
+and skips Telegram calls when the photo is unchanged.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import PhotoSize
+
+from src.api import BackendAPIClient
+from src.metrics import AVATAR_MIRRORS, TELEGRAM_RATE_LIMITED
+from src.services.ratelimit import Lane, PriorityTokenBucket
+from src.services.registration import RegistrationQueue
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAvatar:
+    """Last resolved profile photo of a user."""
+
+    file_unique_id: Optional[str]
+    avatar_url: Optional[str]
+    checked_at: float
+
+
+class AvatarResolver:
+    """
+    Resolves avatars in the background and caches them per user.
+
+    Within `ttl` seconds of the last check nothing is fetched. After that,
+    only the cheap get_user_profile_photos call is made. When the photo's
+    file_unique_id changed, the backend is asked whether it already has that
+    photo; only if not is it downloaded from Telegram and uploaded. Users
+    link to the backend's copy, never to a Bot API file URL, which would
+    expire and expose the bot token. Concurrent resolutions of one photo
+    share a single download.
+    """
+
+    def __init__(self, api_client: BackendAPIClient, ttl: float, max_entries: int):
+        self._api_client = api_client
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._cache: OrderedDict[int, CachedAvatar] = OrderedDict()
+        self._mirrors: dict[str, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _remember(self, telegram_id: int, entry: CachedAvatar) -> None:
+        self._cache[telegram_id] = entry
+        self._cache.move_to_end(telegram_id)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def schedule(
+        self,
+        bot: Bot,
+        writer: Union[BackendAPIClient, RegistrationQueue],
+        telegram_id: int,
+        known_url: Optional[str] = None,
+    ) -> None:
+        """Refresh the user's avatar without blocking the caller."""
+        task = asyncio.create_task(self.refresh(bot, writer, telegram_id, known_url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def refresh(
+        self,
+        bot: Bot,
+        writer: Union[BackendAPIClient, RegistrationQueue],
+        telegram_id: int,
+        known_url: Optional[str] = None,
+    ) -> None:
+        """Like update, but logs failures instead of raising them."""
+        try:
+            await self.update(bot, writer, telegram_id, known_url)
+        except Exception as e:
+            logger.debug(f"Could not refresh avatar for {telegram_id}: {e}")
+
+    async def update(
+        self,
+        bot: Bot,
+        writer: Union[BackendAPIClient, RegistrationQueue],
+        telegram_id: int,
+        known_url: Optional[str] = None,
+    ) -> None:
+        """Resolve the current avatar and push it to the backend if it changed."""
+        cached = self._cache.get(telegram_id)
+        now = time.monotonic()
+        if cached is not None and now - cached.checked_at < self._ttl:
+            return
+
+        photos = await bot.get_user_profile_photos(telegram_id, limit=1)
+        if not photos.photos or not photos.photos[0]:
+            if known_url:
+                # Photo removed or hidden; an empty URL clears the stored one
+                await writer.update_user_profile(telegram_id=telegram_id, avatar_url="")
+            self._remember(telegram_id, CachedAvatar(None, None, now))
+            return
+
+        photo = photos.photos[0][0]
+        if cached is not None and cached.file_unique_id == photo.file_unique_id:
+            cached.checked_at = now
+            self._cache.move_to_end(telegram_id)
+            return
+
+        avatar_url = await self._mirror(bot, photo)
+        if avatar_url != known_url:
+            await writer.update_user_profile(telegram_id=telegram_id, avatar_url=avatar_url)
+        self._remember(telegram_id, CachedAvatar(photo.file_unique_id, avatar_url, now))
+
+    async def _mirror(self, bot: Bot, photo: PhotoSize) -> str:
+        pending = self._mirrors.get(photo.file_unique_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._upload(bot, photo))
+            self._mirrors[photo.file_unique_id] = pending
+            pending.add_done_callback(lambda _: self._mirrors.pop(photo.file_unique_id, None))
+        return await asyncio.shield(pending)
+
+    async def _upload(self, bot: Bot, photo: PhotoSize) -> str:
+        """Backend URL of a photo, uploading it unless the backend already has it."""
+        try:
+            avatar_url = await self._api_client.get_avatar(photo.file_unique_id)
+            if avatar_url is not None:
+                AVATAR_MIRRORS.labels("reused").inc()
+                return avatar_url
+
+            file = await bot.get_file(photo.file_id)
+            if not file.file_path:
+                raise ValueError(f"No file path for photo {photo.file_unique_id}")
+            data = await bot.download_file(file.file_path)
+            avatar_url = await self._api_client.upload_avatar(
+                photo.file_unique_id, data.getvalue()
+            )
+        except Exception:
+            AVATAR_MIRRORS.labels("failed").inc()
+            raise
+        AVATAR_MIRRORS.labels("uploaded").inc()
+        return avatar_url
+
+    async def close(self) -> None:
+        """Wait for in-flight refreshes to finish."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class AvatarRefreshJob:
+    """
+    Re-checks the avatars of active users every `interval` seconds.
+
+    Users who changed their profile photo without pressing /start again
+    would otherwise keep the old one. Only users the backend reports as
+    active in the last `active_days` days are visited, plus users still on
+    a Bot API file link, and at most `rate` per second; a 429 pauses the
+    run for as long as Telegram asks. The first run starts right away.
+    Run the job in one bot process only.
+    """
+
+    def __init__(
+        self,
+        resolver: AvatarResolver,
+        bot: Bot,
+        api_client: BackendAPIClient,
+        writer: Union[BackendAPIClient, RegistrationQueue],
+        interval: float,
+        active_days: int,
+        rate: float,
+        page_size: int,
+    ):
+        self._resolver = resolver
+        self._bot = bot
+        self._api_client = api_client
+        self._writer = writer
+        self._interval = interval
+        self._active_days = active_days
+        self._rate = rate
+        self._page_size = page_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run_forever(), name="avatar-refresh")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Avatar refresh run failed: {e}")
+            await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> int:
+        """Check every active user once; returns the number of users checked."""
+        started = asyncio.get_running_loop().time()
+        bucket = PriorityTokenBucket(self._rate, burst=1)
+        checked = failed = 0
+        after = 0
+        while True:
+            page = await self._api_client.get_active_users(
+                self._active_days, after=after, limit=self._page_size
+            )
+            for user in page.users:
+                while True:
+                    await bucket.acquire(Lane.BULK)
+                    try:
+                        await self._resolver.update(
+                            self._bot, self._writer, user.telegram_id, user.avatar_url
+                        )
+                    except TelegramRetryAfter as e:
+                        TELEGRAM_RATE_LIMITED.inc()
+                        bucket.pause(e.retry_after)
+                        continue
+                    except Exception as e:
+                        logger.debug(f"Could not refresh avatar for {user.telegram_id}: {e}")
+                        failed += 1
+                    break
+                checked += 1
+            if page.next_after is None:
+                break
+            after = page.next_after
+
+        elapsed = asyncio.get_running_loop().time() - started
+        logger.info(f"Avatar refresh: {checked} users checked, {failed} failed in {elapsed:.1f}s")
+        return checked
@@ -0,0 +1,120 @@
+"""
+Daily birthday reminders.
+Pages through the backend's upcoming-birthday reminders and messages each follower once.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional
+
+from src.api import BackendAPIClient
+from src.api.client import BirthdayPerson, BirthdayReminder
+from src.keyboards import get_gift_keyboard
+from src.services.ratelimit import Lane
+from src.services.sender import OutboundSender
+
+logger = logging.getLogger(__name__)
+
+
+def _when(days_ahead: int) -> str:
+    if days_ahead == 0:
+        return "Сегодня"
+    if days_ahead == 1:
+        return "Завтра"
+    if days_ahead % 10 == 1 and days_ahead % 100 != 11:
+        unit = "день"
+    elif days_ahead % 10 in (2, 3, 4) and days_ahead % 100 not in (12, 13, 14):
+        unit = "дня"
+    else:
+        unit = "дней"
+    return f"Через {days_ahead} {unit}"
+
+
+def _name(person: BirthdayPerson) -> str:
+    name = " ".join(part for part in (person.first_name, person.last_name) if part)
+    return f"{name} (@{person.username})" if person.username else name
+
+
+def format_reminder(reminder: BirthdayReminder, days_ahead: int) -> str:
+    """Text of one reminder message."""
+    names = "\n".join(f"• {_name(person)}" for person in reminder.birthdays)
+    return (
+        f"🎂 {_when(days_ahead)} день рождения:\n{names}\n\n"
+        "Загляни в списки желаний, чтобы выбрать подарок."
+    )
+
+
+class BirthdayReminderJob:
+    """
+    Sends birthday reminders once a day at `run_at` (UTC).
+
+    The backend already groups birthdays by follower, so every recipient gets
+    a single message per run. Messages go through the sender's bulk lane,
+    behind interactive replies. Run the job in one bot process only.
+    """
+
+    def __init__(
+        self,
+        sender: OutboundSender,
+        api_client: BackendAPIClient,
+        days_ahead: int,
+        run_at: time,
+        page_size: int,
+    ):
+        self._sender = sender
+        self._api_client = api_client
+        self._days_ahead = days_ahead
+        self._run_at = run_at
+        self._page_size = page_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run_forever(), name="birthday-reminders")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now(timezone.utc)
+        next_run = datetime.combine(now.date(), self._run_at, tzinfo=timezone.utc)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._seconds_until_next_run())
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception(f"Birthday reminder run failed: {e}")
+
+    async def run_once(self) -> int:
+        """Queue all of today's reminders; returns the number of messages queued."""
+        started = asyncio.get_running_loop().time()
+        queued = 0
+        after = 0
+        while True:
+            page = await self._api_client.get_birthday_reminders(
+                self._days_ahead, after=after, limit=self._page_size
+            )
+            for reminder in page.reminders:
+                await self._sender.enqueue(
+                    reminder.recipient_telegram_id,
+                    format_reminder(reminder, self._days_ahead),
+                    reply_markup=get_gift_keyboard(),
+                    lane=Lane.BULK,
+                )
+                queued += 1
+            if page.next_after is None:
+                break
+            after = page.next_after
+
+        elapsed = asyncio.get_running_loop().time() - started
+        logger.info(
+            f"Birthday reminders for {page.target_date}: {queued} queued in {elapsed:.1f}s"
+        )
+        return queued
@@ -0,0 +1,71 @@
+"""
+Backend notification relay.
+Claims messages the backend queued for users and hands them to the outbound sender.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from src.api import BackendAPIClient
+from src.services.ratelimit import Lane
+from src.services.sender import OutboundSender
+
+logger = logging.getLogger(__name__)
+
+
+class BackendNotificationJob:
+    """
+    Moves messages from the backend's queue into the outbound sender.
+
+    A batch is acknowledged once it is queued in the sender, which owns
+    pacing, 429 handling and retries from there. A batch that is claimed but
+    never acknowledged, e.g. because the process died, is handed out again
+    by the backend after its claim timeout. Claims are exclusive, so every
+    bot process may run the job.
+    """
+
+    def __init__(
+        self,
+        sender: OutboundSender,
+        api_client: BackendAPIClient,
+        interval: float,
+        batch_size: int,
+    ):
+        self._sender = sender
+        self._api_client = api_client
+        self._interval = interval
+        self._batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run_forever(), name="backend-notifications")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                queued = await self.run_once()
+            except Exception as e:
+                logger.warning(f"Backend notification poll failed: {e}")
+                queued = 0
+            # A full batch means more is probably waiting
+            if queued < self._batch_size:
+                await asyncio.sleep(self._interval)
+
+    async def run_once(self) -> int:
+        """Queue one batch of messages; returns the number queued."""
+        notifications = await self._api_client.claim_notifications(self._batch_size)
+        for notification in notifications:
+            await self._sender.enqueue(
+                notification.telegram_id, notification.text, lane=Lane.BULK
+            )
+        if notifications:
+            await self._api_client.ack_notifications(
+                [notification.id for notification in notifications]
+            )
+        return len(notifications)
@@ -0,0 +1,128 @@
+"""
+Global send rate limiting.
+All outgoing send* calls share one token bucket, with interactive replies served before bulk traffic.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.metrics import SEND_TOKEN_WAIT, TELEGRAM_RATE_LIMITED
+
+# Bot API methods that count towards the broadcast limit
+_SEND_PREFIXES = ("send", "copy", "forward")
+
+
+class Lane(IntEnum):
+    """Priority lane of an outgoing message; lower is served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+# Lane of the send currently in progress; handler replies are interactive
+current_lane: ContextVar[Lane] = ContextVar("current_lane", default=Lane.INTERACTIVE)
+
+
+class PriorityTokenBucket:
+    """
+    Token bucket whose waiters are served by lane, then in arrival order.
+
+    pause() empties the bucket until a 429's retry_after has passed, so every
+    sender backs off together instead of each one hitting the limit again.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+
+    async def acquire(self, lane: Lane) -> None:
+        now = time.monotonic()
+        if not self._waiters and now >= self._paused_until:
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._seq), future))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        await future
+
+    async def _drain(self) -> None:
+        while self._waiters:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware taking a token for every send* call.
+
+    A 429 pauses the shared bucket. Interactive sends then retry after it;
+    bulk sends re-raise so OutboundSender can reschedule without holding a worker.
+    """
+
+    def __init__(self, bucket: PriorityTokenBucket, max_retries: int = 2):
+        self._bucket = bucket
+        self._max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not method.__api_method__.startswith(_SEND_PREFIXES):
+            return await make_request(bot, method)
+
+        lane = current_lane.get()
+        for attempt in range(self._max_retries + 1):
+            started = time.monotonic()
+            await self._bucket.acquire(lane)
+            SEND_TOKEN_WAIT.labels(lane=lane.name.lower()).observe(time.monotonic() - started)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                TELEGRAM_RATE_LIMITED.inc()
+                self._bucket.pause(e.retry_after)
+                if lane is Lane.BULK or attempt == self._max_retries:
+                    raise
+        raise AssertionError("unreachable")
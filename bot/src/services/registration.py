@@ -0,0 +1,221 @@
+"""
+Write-behind registration queue.
+Buffers profile upserts in memory and sends them to the backend in batches.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Optional
+
+from src.api import BackendAPIClient, BackendAPIError
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrationQueue:
+    """
+    Coalescing, bounded buffer in front of /users/register/bulk.
+
+    Submits for the same telegram_id merge into one pending entry, so a user who
+    taps /start and then enters a birth date costs one row in one batch. A batch
+    leaves the buffer only after the backend acknowledged it; failed batches go
+    back to the front and are retried with backoff, and a batch rejected with
+    422 is split so that only the invalid rows are dropped. Upserts are
+    idempotent, so at-least-once delivery is safe. Entries still pending when
+    the process dies or the drain timeout expires are lost.
+    """
+
+    def __init__(
+        self,
+        api_client: BackendAPIClient,
+        max_pending: int,
+        batch_size: int,
+        flush_interval: float,
+        retry_backoff_max: float,
+    ):
+        self._api_client = api_client
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._retry_backoff_max = retry_backoff_max
+        self._pending: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._inflight: dict[int, dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.failed_batches = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="registration-queue")
+
+    async def submit(
+        self,
+        telegram_id: int,
+        first_name: str,
+        username: Optional[str] = None,
+        last_name: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        birth_date: Optional[date] = None,
+    ) -> None:
+        """
+        Queue a profile upsert; fields left as None keep the stored value.
+
+        When the buffer is full this waits for a flush, and past the flush
+        interval sends the profile directly, so callers are never dropped.
+        """
+        fields = {
+            "telegram_id": telegram_id,
+            "first_name": first_name,
+            "username": username,
+            "last_name": last_name,
+            "avatar_url": avatar_url,
+            "birth_date": birth_date.isoformat() if birth_date else None,
+        }
+        fields = {key: value for key, value in fields.items() if value is not None}
+
+        if telegram_id not in self._pending and not await self._wait_for_space():
+            await self._api_client.register_users_bulk([fields])
+            return
+        self._merge(telegram_id, fields)
+
+    async def update_user_profile(
+        self,
+        telegram_id: int,
+        birth_date: Optional[date] = None,
+        avatar_url: Optional[str] = None,
+    ) -> None:
+        """
+        Partial update with the same signature as BackendAPIClient's.
+
+        Merged into the buffer while the user's registration is still pending
+        or in flight, otherwise sent to the backend right away.
+        """
+        base = self._pending.get(telegram_id) or self._inflight.get(telegram_id)
+        if base is None:
+            await self._api_client.update_user_profile(
+                telegram_id=telegram_id, birth_date=birth_date, avatar_url=avatar_url
+            )
+            return
+
+        fields: dict[str, Any] = {}
+        if birth_date is not None:
+            fields["birth_date"] = birth_date.isoformat()
+        if avatar_url is not None:
+            fields["avatar_url"] = avatar_url
+        self._merge(telegram_id, {**base, **fields})
+
+    def _merge(self, telegram_id: int, fields: dict[str, Any]) -> None:
+        entry = self._pending.get(telegram_id)
+        if entry is None:
+            self._pending[telegram_id] = fields
+        else:
+            entry.update(fields)
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+
+    async def _wait_for_space(self) -> bool:
+        """Wait up to one flush interval for the buffer to drop below its limit."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_interval
+        while len(self._pending) >= self._max_pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._flushed.clear()
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._flushed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def _run(self) -> None:
+        failures = 0
+        while not (self._closing and not self._pending):
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._pending:
+                if await self._flush_batch():
+                    failures = 0
+                    continue
+                failures += 1
+                await asyncio.sleep(
+                    min(self._retry_backoff_max, self._flush_interval * 2 ** failures)
+                )
+
+    async def _flush_batch(self) -> bool:
+        """Send the oldest pending entries; returns False if they must be retried."""
+        while self._pending and len(self._inflight) < self._batch_size:
+            telegram_id, fields = self._pending.popitem(last=False)
+            self._inflight[telegram_id] = fields
+        batch = self._inflight
+
+        try:
+            await self._send(list(batch))
+            return True
+        except BackendAPIError as e:
+            self.failed_batches += 1
+            if e.status_code is not None and 400 <= e.status_code < 500 and e.status_code != 429:
+                # Retrying a rejected payload would block the queue forever
+                logger.error(f"Dropping {len(batch)} registrations rejected by backend: {e}")
+                return True
+
+            logger.warning(f"Registration batch of {len(batch)} failed, will retry: {e}")
+            # Back to the front, under any fields submitted while it was in flight
+            for telegram_id, fields in reversed(list(batch.items())):
+                newer = self._pending.pop(telegram_id, None)
+                self._pending[telegram_id] = {**fields, **newer} if newer else fields
+                self._pending.move_to_end(telegram_id, last=False)
+            return False
+        finally:
+            self._inflight = {}
+            self._flushed.set()
+
+    async def _send(self, telegram_ids: list[int]) -> None:
+        """
+        Send in-flight entries, removing each from the batch once settled.
+
+        A 422 means some rows failed validation, so the slice is bisected
+        until only the rejected rows are left and dropped; the rest of the
+        batch still goes through.
+        """
+        rows = [self._inflight[telegram_id] for telegram_id in telegram_ids]
+        try:
+            await self._api_client.register_users_bulk(rows)
+        except BackendAPIError as e:
+            if e.status_code != 422:
+                raise
+            if len(telegram_ids) == 1:
+                logger.error(f"Dropping registration of {telegram_ids[0]} rejected by backend: {e}")
+                del self._inflight[telegram_ids[0]]
+                return
+            middle = len(telegram_ids) // 2
+            await self._send(telegram_ids[:middle])
+            await self._send(telegram_ids[middle:])
+            return
+        self.sent += len(rows)
+        for telegram_id in telegram_ids:
+            del self._inflight[telegram_id]
+
+    async def close(self, timeout: float) -> None:
+        """Flush what is buffered within `timeout`, then stop."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Lost {len(self._pending)} queued registrations on shutdown")
+        logger.info(
+            f"Registration queue stopped: {self.sent} sent, "
+            f"{self.failed_batches} failed batches"
+        )
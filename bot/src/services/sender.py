@@ -0,0 +1,291 @@
+"""
+Outbound message pipeline.
+Queues notifications, paces them per chat and retries failed sends from a persistent queue.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+from aiogram.types import InlineKeyboardMarkup
+
+from src.metrics import OUTBOUND_MESSAGES, OUTBOUND_QUEUE_DEPTH, OUTBOUND_RETRY_BACKLOG
+from src.services.ratelimit import Lane, current_lane
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboundMessage:
+    """A text message waiting to be sent."""
+
+    chat_id: int
+    text: str
+    reply_markup: Optional[dict[str, Any]] = None
+    lane: Lane = Lane.BULK
+    attempts: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "OutboundMessage":
+        data = json.loads(raw)
+        data["lane"] = Lane(data["lane"])
+        return cls(**data)
+
+
+class MemoryRetryStore:
+    """Retry queue kept in process memory; lost on restart."""
+
+    def __init__(self) -> None:
+        self._items: list[tuple[float, str, OutboundMessage]] = []
+
+    async def push(self, message: OutboundMessage, due: float) -> None:
+        heapq.heappush(self._items, (due, message.id, message))
+
+    async def claim_due(self, now: float, limit: int) -> list[OutboundMessage]:
+        claimed = []
+        while self._items and self._items[0][0] <= now and len(claimed) < limit:
+            claimed.append(heapq.heappop(self._items)[2])
+        return claimed
+
+    async def size(self) -> int:
+        return len(self._items)
+
+
+class RedisRetryStore:
+    """
+    Retry queue in a Redis sorted set scored by due time.
+
+    A message is claimed by whoever removes it from the set, so several bot
+    processes can share the queue without sending a message twice.
+    """
+
+    def __init__(self, redis: Any, key: str):
+        self._redis = redis
+        self._key = key
+
+    async def push(self, message: OutboundMessage, due: float) -> None:
+        await self._redis.zadd(self._key, {message.to_json(): due})
+
+    async def claim_due(self, now: float, limit: int) -> list[OutboundMessage]:
+        members = await self._redis.zrangebyscore(self._key, "-inf", now, start=0, num=limit)
+        claimed = []
+        for member in members:
+            if await self._redis.zrem(self._key, member):
+                claimed.append(OutboundMessage.from_json(member))
+        return claimed
+
+    async def size(self) -> int:
+        return await self._redis.zcard(self._key)
+
+
+class OutboundSender:
+    """
+    Sends queued messages with per-chat pacing and retries.
+
+    The global limit is enforced by RateLimitMiddleware on the bot session,
+    which serves interactive replies before this sender's bulk lane. Here each
+    chat additionally gets at most one message per `chat_interval` seconds
+    (`group_interval` for groups). A chat that is not ready is set aside
+    rather than blocking a worker. A 429 reschedules the message after
+    retry_after. Network and 5xx failures go to the retry store with
+    exponential backoff, and so does anything still queued at shutdown.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        retry_store: MemoryRetryStore | RedisRetryStore,
+        workers: int,
+        max_pending: int,
+        chat_interval: float,
+        group_interval: float,
+        max_attempts: int,
+        retry_backoff: float,
+    ):
+        self._bot = bot
+        self._retry_store = retry_store
+        self._workers = workers
+        self._max_pending = max_pending
+        self._chat_interval = chat_interval
+        self._group_interval = group_interval
+        self._max_attempts = max_attempts
+        self._retry_backoff = retry_backoff
+        self._ready: asyncio.PriorityQueue[tuple[int, int, OutboundMessage]] = asyncio.PriorityQueue()
+        self._delayed: list[tuple[float, int, OutboundMessage]] = []
+        self._delayed_changed = asyncio.Event()
+        self._next_allowed: dict[int, float] = {}
+        self._pending = 0
+        self._space = asyncio.Condition()
+        self._seq = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._ready.qsize() + len(self._delayed)
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"outbound-worker-{index}")
+            for index in range(self._workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._scheduler(), name="outbound-scheduler"))
+
+    async def enqueue(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        lane: Lane = Lane.BULK,
+    ) -> None:
+        """Queue a message, waiting while `max_pending` messages are in the pipeline."""
+        async with self._space:
+            await self._space.wait_for(lambda: self._pending < self._max_pending)
+            self._pending += 1
+        message = OutboundMessage(
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup.model_dump(exclude_none=True) if reply_markup else None,
+            lane=lane,
+        )
+        self._ready.put_nowait((message.lane, next(self._seq), message))
+        OUTBOUND_QUEUE_DEPTH.set(self.depth)
+
+    async def _done(self) -> None:
+        async with self._space:
+            self._pending -= 1
+            self._space.notify()
+        OUTBOUND_QUEUE_DEPTH.set(self.depth)
+
+    def _delay(self, message: OutboundMessage, seconds: float) -> None:
+        heapq.heappush(self._delayed, (time.monotonic() + seconds, next(self._seq), message))
+        self._delayed_changed.set()
+
+    def _reserve_chat(self, chat_id: int) -> float:
+        """Seconds until `chat_id` may receive a message, reserving the slot if it is now."""
+        now = time.monotonic()
+        allowed = self._next_allowed.get(chat_id, 0.0)
+        if allowed > now:
+            return allowed - now
+        interval = self._chat_interval if chat_id > 0 else self._group_interval
+        self._next_allowed[chat_id] = now + interval
+        return 0.0
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, message = await self._ready.get()
+            try:
+                wait = self._reserve_chat(message.chat_id)
+                if wait > 0:
+                    self._delay(message, wait)
+                    continue
+                await self._deliver(message)
+            except Exception:
+                # One bad message must not take the worker down with it
+                logger.exception(f"Outbound worker failed on message to {message.chat_id}")
+
+    async def _deliver(self, message: OutboundMessage) -> None:
+        lane = message.lane.name.lower()
+        token = current_lane.set(message.lane)
+        rescheduled = False
+        try:
+            await self._bot.send_message(
+                message.chat_id,
+                message.text,
+                reply_markup=(
+                    InlineKeyboardMarkup.model_validate(message.reply_markup)
+                    if message.reply_markup else None
+                ),
+            )
+            OUTBOUND_MESSAGES.labels(lane=lane, result="sent").inc()
+        except TelegramRetryAfter as e:
+            OUTBOUND_MESSAGES.labels(lane=lane, result="rate_limited").inc()
+            # Still in the pipeline, so the pending slot stays taken
+            self._delay(message, e.retry_after)
+            rescheduled = True
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Blocked the bot, deleted account or never started a chat
+            OUTBOUND_MESSAGES.labels(lane=lane, result="dropped").inc()
+            logger.debug(f"Dropping message to {message.chat_id}: {e}")
+        except (TelegramNetworkError, TelegramServerError) as e:
+            message.attempts += 1
+            if message.attempts >= self._max_attempts:
+                OUTBOUND_MESSAGES.labels(lane=lane, result="failed").inc()
+                logger.warning(f"Giving up on message to {message.chat_id}: {e}")
+            else:
+                OUTBOUND_MESSAGES.labels(lane=lane, result="retried").inc()
+                backoff = self._retry_backoff * 2 ** (message.attempts - 1)
+                await self._retry_store.push(message, time.time() + backoff)
+        except Exception:
+            OUTBOUND_MESSAGES.labels(lane=lane, result="failed").inc()
+            logger.exception(f"Unexpected error sending message to {message.chat_id}")
+        finally:
+            current_lane.reset(token)
+            if not rescheduled:
+                await self._done()
+
+    async def _scheduler(self) -> None:
+        """Move due delayed messages and persisted retries back to the ready queue."""
+        next_retry_poll = 0.0
+        while True:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, seq, message = heapq.heappop(self._delayed)
+                self._ready.put_nowait((message.lane, seq, message))
+
+            if now >= next_retry_poll:
+                next_retry_poll = now + 1.0
+                for message in await self._retry_store.claim_due(time.time(), limit=100):
+                    self._pending += 1
+                    self._ready.put_nowait((message.lane, next(self._seq), message))
+                OUTBOUND_RETRY_BACKLOG.set(await self._retry_store.size())
+                # Forget chats whose pacing window has passed
+                self._next_allowed = {
+                    chat_id: allowed
+                    for chat_id, allowed in self._next_allowed.items()
+                    if allowed > now
+                }
+            OUTBOUND_QUEUE_DEPTH.set(self.depth)
+
+            timeout = min(1.0, self._delayed[0][0] - now) if self._delayed else 1.0
+            self._delayed_changed.clear()
+            try:
+                await asyncio.wait_for(self._delayed_changed.wait(), max(timeout, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self, timeout: float) -> None:
+        """Send what is queued within `timeout`; persist the rest for the next start."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._pending and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        leftover = [message for _, _, message in self._delayed]
+        while not self._ready.empty():
+            leftover.append(self._ready.get_nowait()[2])
+        for message in leftover:
+            await self._retry_store.push(message, time.time())
+        if leftover:
+            logger.warning(f"Persisted {len(leftover)} unsent messages to the retry queue")
@@ -0,0 +1,44 @@
+"""
+FSM storage factory.
+In-memory storage for a single process, Redis for state shared between bot replicas.
+"""
+
+import json
+import logging
+from functools import partial
+from typing import Optional
+
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# No whitespace in stored JSON - data values are small and read on every update
+_compact_dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+
+
+def create_fsm_storage(settings: Settings) -> tuple[BaseStorage, Optional[BaseEventIsolation]]:
+    """
+    Build the FSM storage and matching event isolation.
+
+    Without FSM_STORAGE_URL the state lives in process memory and is lost on
+    restart. With a redis:// URL state and data keys expire after FSM_STATE_TTL
+    seconds, so abandoned registration flows clean themselves up, and updates of
+    the same chat are serialized across replicas by a Redis lock.
+    """
+    if not settings.fsm_storage_url:
+        return MemoryStorage(), None
+
+    from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+    storage = RedisStorage.from_url(
+        settings.fsm_storage_url,
+        key_builder=DefaultKeyBuilder(prefix=settings.fsm_key_prefix, with_bot_id=True),
+        state_ttl=settings.fsm_state_ttl,
+        data_ttl=settings.fsm_state_ttl,
+        json_dumps=_compact_dumps,
+    )
+    logger.info(f"FSM storage: Redis (ttl={settings.fsm_state_ttl}s)")
+    return storage, storage.create_isolation()
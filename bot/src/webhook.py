@@ -0,0 +1,196 @@
+"""
+Webhook mode.
+An aiohttp server accepts updates from Telegram, queues them per chat shard and
+feeds them to the dispatcher from a pool of workers.
+"""
+
+import asyncio
+import hmac
+import logging
+import signal
+from contextlib import suppress
+from typing import Any, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def shard_key(update: Update) -> int:
+    """Chat the update belongs to, falling back to the sender and the update id."""
+    event = update.event
+    chat = getattr(event, "chat", None) or getattr(getattr(event, "message", None), "chat", None)
+    if chat is not None:
+        return chat.id
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return user.id
+    return update.update_id
+
+
+class UpdateWorkerPool:
+    """
+    Processes updates concurrently while keeping each chat's updates in order.
+
+    Every worker owns a bounded queue and updates are routed by chat id, so one
+    chat is always handled by the same worker, one update at a time. A full
+    queue rejects the update instead of growing: Telegram retries it later.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        workers: int,
+        queue_size: int,
+        **workflow_data: Any,
+    ):
+        self._dispatcher = dispatcher
+        self._bot = bot
+        self._workflow_data = workflow_data
+        per_worker = max(1, queue_size // workers)
+        self._queues: list[asyncio.Queue[Update]] = [
+            asyncio.Queue(maxsize=per_worker) for _ in range(workers)
+        ]
+        self._tasks: list[asyncio.Task] = []
+        self.processed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    @property
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"update-worker-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+
+    def submit(self, update: Update) -> bool:
+        """Queue an update; returns False if its shard is full."""
+        queue = self._queues[shard_key(update) % len(self._queues)]
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        return True
+
+    async def _worker(self, queue: asyncio.Queue[Update]) -> None:
+        while True:
+            update = await queue.get()
+            try:
+                await self._dispatcher.feed_update(self._bot, update, **self._workflow_data)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.exception(f"Failed to process update {update.update_id}: {e}")
+            finally:
+                queue.task_done()
+
+    async def stop(self, timeout: float) -> None:
+        """Let queued updates finish within `timeout`, then cancel the workers."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self.depth} queued updates on shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def create_webhook_app(
+    pool: UpdateWorkerPool,
+    bot: Bot,
+    settings: Settings,
+) -> web.Application:
+    """aiohttp app with the webhook endpoint and a health check."""
+    secret: Optional[str] = settings.webhook_secret or None
+
+    async def handle_update(request: web.Request) -> web.Response:
+        if secret is not None and not hmac.compare_digest(
+            request.headers.get(SECRET_HEADER, ""), secret
+        ):
+            return web.Response(status=401)
+
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": bot})
+        except Exception:
+            return web.Response(status=400)
+
+        if not pool.submit(update):
+            # Telegram redelivers non-2xx updates, which gives us backpressure for free
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    async def handle_health(request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "healthy",
+            "queued": pool.depth,
+            "processed": pool.processed,
+            "rejected": pool.rejected,
+            "failed": pool.failed,
+        })
+
+    app = web.Application()
+    app.router.add_post(settings.webhook_path, handle_update)
+    app.router.add_get("/health", handle_health)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, settings: Settings, **workflow_data: Any) -> None:
+    """Serve the webhook until SIGTERM/SIGINT."""
+    pool = UpdateWorkerPool(
+        dp,
+        bot,
+        workers=settings.webhook_workers,
+        queue_size=settings.webhook_queue_size,
+        **workflow_data,
+    )
+    app = create_webhook_app(pool, bot, settings)
+    runner = web.AppRunner(app)
+
+    await dp.emit_startup(bot=bot, **workflow_data)
+    pool.start()
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    await site.start()
+
+    if settings.webhook_base_url:
+        await bot.set_webhook(
+            url=f"{settings.webhook_base_url.rstrip('/')}{settings.webhook_path}",
+            secret_token=settings.webhook_secret or None,
+            allowed_updates=dp.resolve_used_update_types(),
+            max_connections=settings.webhook_max_connections,
+        )
+    logger.info(
+        f"Webhook listening on {settings.webhook_host}:{settings.webhook_port}"
+        f"{settings.webhook_path} with {settings.webhook_workers} workers"
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await stop.wait()
+    finally:
+        # Stop accepting first so Telegram holds new updates while the queue drains
+        await runner.cleanup()
+        await pool.stop(timeout=settings.webhook_drain_timeout)
+        await dp.emit_shutdown(bot=bot, **workflow_data)
+        logger.info(
+            f"Webhook stopped: {pool.processed} processed, "
+            f"{pool.rejected} rejected, {pool.failed} failed"
+        )
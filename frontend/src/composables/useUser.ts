@@ -3,6 +3,7 @@
  */
 
 import { ref } from 'vue'
+import { apiFetch } from '@/services/api'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1'
 
@@ -10,6 +11,14 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/
 // FriendsView watches this to trigger a re-fetch of the friends list
 export const subscribeVersion = ref(0)
 
+/**
+ * Avatars mirrored by the backend are stored as paths relative to the API root
+ */
+export function resolveAvatarUrl(avatarUrl: string | null | undefined): string | null {
+  if (!avatarUrl) return null
+  return avatarUrl.startsWith('/') ? `${API_BASE_URL}${avatarUrl}` : avatarUrl
+}
+
 export function useUser() {
   const loading = ref(false)
   const error = ref<string | null>(null)
@@ -22,7 +31,7 @@ export function useUser() {
     error.value = null
 
     try {
-      const response = await fetch(`${API_BASE_URL}/users/telegram/${telegramId}/profile`, {
+      const response = await apiFetch(`${API_BASE_URL}/users/telegram/${telegramId}/profile`, {
         method: 'PATCH',
         headers: {
           'Content-Type': 'application/json',
@@ -57,7 +66,7 @@ export function useUser() {
         ? `${API_BASE_URL}/users/telegram/${telegramId}?current_user_id=${currentUserId}`
         : `${API_BASE_URL}/users/telegram/${telegramId}`
 
-      const response = await fetch(url, {
+      const response = await apiFetch(url, {
         method: 'GET',
         headers: {
           'Content-Type': 'application/json',
@@ -85,7 +94,7 @@ export function useUser() {
   async function subscribe(currentUserId: number, targetId: number): Promise<boolean> {
     loading.value = true
     try {
-      const response = await fetch(`${API_BASE_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
+      const response = await apiFetch(`${API_BASE_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
       })
@@ -103,7 +112,7 @@ export function useUser() {
   async function unsubscribe(currentUserId: number, targetId: number): Promise<boolean> {
     loading.value = true
     try {
-      const response = await fetch(`${API_BASE_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
+      const response = await apiFetch(`${API_BASE_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
         method: 'DELETE',
         headers: { 'Content-Type': 'application/json' },
       })
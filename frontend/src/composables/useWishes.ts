@@ -4,6 +4,7 @@
 
 import { ref } from 'vue'
 import type { Wish, CreateWishRequest } from '@/types'
+import { apiFetch } from '@/services/api'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1'
 
@@ -48,7 +49,7 @@ export function useWishes() {
             const url = viewerTelegramId
                 ? `${API_BASE_URL}/wishes?wishlist_id=${wishlistId}&viewer_telegram_id=${viewerTelegramId}`
                 : `${API_BASE_URL}/wishes?wishlist_id=${wishlistId}`
-            const response = await fetch(url)
+            const response = await apiFetch(url)
 
             if (!response.ok) {
                 throw new Error(`Failed to fetch wishes: ${response.statusText}`)
@@ -63,12 +64,53 @@ export function useWishes() {
         }
     }
 
+    // Live updates for the wishlist being viewed (Server-Sent Events)
+    let stream: EventSource | null = null
+
+    function subscribeToWishlist(wishlistId: string, viewerTelegramId?: number): void {
+        unsubscribeFromWishlist()
+        const url = viewerTelegramId
+            ? `${API_BASE_URL}/wishlists/${wishlistId}/stream?viewer_telegram_id=${viewerTelegramId}`
+            : `${API_BASE_URL}/wishlists/${wishlistId}/stream`
+        stream = new EventSource(url)
+
+        stream.addEventListener('wish', (event) => {
+            const delta = JSON.parse((event as MessageEvent).data)
+            if (delta.type === 'deleted') {
+                wishes.value = wishes.value.filter(w => w.id !== delta.id)
+                if (selectedWish.value?.id === delta.id) selectedWish.value = null
+                return
+            }
+            const wish: Wish = delta.wish
+            const index = wishes.value.findIndex(w => w.id === wish.id)
+            if (index !== -1) {
+                wishes.value[index] = wish
+            } else {
+                wishes.value.unshift(wish)
+            }
+            if (selectedWish.value?.id === wish.id) selectedWish.value = wish
+        })
+
+        // Updates were missed (slow connection or server restart): reload the list
+        stream.addEventListener('reset', () => {
+            fetchWishes(wishlistId, viewerTelegramId)
+            subscribeToWishlist(wishlistId, viewerTelegramId)
+        })
+    }
+
+    function unsubscribeFromWishlist(): void {
+        if (stream) {
+            stream.close()
+            stream = null
+        }
+    }
+
     async function createWish(wish: CreateWishRequest, telegramId: number): Promise<Wish | null> {
         loading.value = true
         error.value = null
 
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes?telegram_id=${telegramId}`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -101,7 +143,7 @@ export function useWishes() {
     async function deleteWish(wishId: string, telegramId: number): Promise<boolean> {
         loading.value = true
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes/${wishId}?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes/${wishId}?telegram_id=${telegramId}`, {
                 method: 'DELETE',
             })
 
@@ -124,7 +166,7 @@ export function useWishes() {
     async function updateWish(wishId: string, wish: Partial<CreateWishRequest>, telegramId: number): Promise<Wish | null> {
         loading.value = true;
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes/${wishId}?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes/${wishId}?telegram_id=${telegramId}`, {
                 method: 'PUT',
                 headers: {
                     'Content-Type': 'application/json',
@@ -178,7 +220,7 @@ export function useWishes() {
         loading.value = true
         try {
             // 1. Fetch wishes to move
-            const response = await fetch(`${API_BASE_URL}/wishes?wishlist_id=${fromWishlistId}`)
+            const response = await apiFetch(`${API_BASE_URL}/wishes?wishlist_id=${fromWishlistId}`)
             if (!response.ok) throw new Error('Failed to fetch wishes')
             const wishesToMove: Wish[] = await response.json()
 
@@ -187,7 +229,7 @@ export function useWishes() {
             for (let i = 0; i < wishesToMove.length; i += BATCH_SIZE) {
                 const batch = wishesToMove.slice(i, i + BATCH_SIZE)
                 const batchPromises = batch.map(wish =>
-                    fetch(`${API_BASE_URL}/wishes/${wish.id}?telegram_id=${telegramId}`, {
+                    apiFetch(`${API_BASE_URL}/wishes/${wish.id}?telegram_id=${telegramId}`, {
                         method: 'PUT',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({ wishlist_id: toWishlistId }),
@@ -211,7 +253,7 @@ export function useWishes() {
     async function fulfillWish(wishId: string, telegramId: number): Promise<Wish | null> {
         loading.value = true
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes/${wishId}/fulfill?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes/${wishId}/fulfill?telegram_id=${telegramId}`, {
                 method: 'POST',
             })
 
@@ -244,7 +286,7 @@ export function useWishes() {
 
     async function bookWish(wishId: string, telegramId: number): Promise<Wish | null> {
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes/${wishId}/book?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes/${wishId}/book?telegram_id=${telegramId}`, {
                 method: 'POST',
             })
             if (!response.ok) throw new Error('Failed to book wish')
@@ -262,7 +304,7 @@ export function useWishes() {
 
     async function unbookWish(wishId: string, telegramId: number): Promise<Wish | null> {
         try {
-            const response = await fetch(`${API_BASE_URL}/wishes/${wishId}/book?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_BASE_URL}/wishes/${wishId}/book?telegram_id=${telegramId}`, {
                 method: 'DELETE',
             })
             if (!response.ok) throw new Error('Failed to unbook wish')
@@ -284,6 +326,8 @@ export function useWishes() {
         loading,
         error,
         fetchWishes,
+        subscribeToWishlist,
+        unsubscribeFromWishlist,
         createWish,
         deleteWish,
         updateWish,
@@ -4,6 +4,7 @@
 
 import { ref } from 'vue'
 import type { Wishlist, WishlistListResponse } from '@/types'
+import { apiFetch } from '@/services/api'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1'
 
@@ -16,7 +17,7 @@ export function useWishlists() {
     error.value = null
 
     try {
-      const response = await fetch(`${API_BASE_URL}/wishlists/user/telegram/${telegramId}`)
+      const response = await apiFetch(`${API_BASE_URL}/wishlists/user/telegram/${telegramId}`)
 
       if (!response.ok) {
         if (response.status === 404) {
@@ -47,7 +48,7 @@ export function useWishlists() {
     loading.value = true
     error.value = null
     try {
-      const response = await fetch(`${API_BASE_URL}/wishlists/?telegram_id=${telegramId}`, {
+      const response = await apiFetch(`${API_BASE_URL}/wishlists/?telegram_id=${telegramId}`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -82,7 +83,7 @@ export function useWishlists() {
   ): Promise<Wishlist | null> {
     loading.value = true
     try {
-      const response = await fetch(`${API_BASE_URL}/wishlists/${id}`, {
+      const response = await apiFetch(`${API_BASE_URL}/wishlists/${id}`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -112,7 +113,7 @@ export function useWishlists() {
   async function deleteWishlist(id: string): Promise<boolean> {
     loading.value = true
     try {
-      const response = await fetch(`${API_BASE_URL}/wishlists/${id}`, {
+      const response = await apiFetch(`${API_BASE_URL}/wishlists/${id}`, {
         method: 'DELETE'
       })
 
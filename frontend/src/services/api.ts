@@ -0,0 +1,40 @@
+/**
+ * fetch wrapper for backend API calls.
+ *
+ * Write responses carry the database position of the write in
+ * X-DB-Position. Sending the highest position seen back on every request
+ * lets the backend serve reads from a read replica only once it has
+ * caught up, so users always see their own changes.
+ */
+
+const DB_POSITION_HEADER = 'X-DB-Position'
+const STORAGE_KEY = 'db-position'
+
+let dbPosition: string | null = sessionStorage.getItem(STORAGE_KEY)
+
+/** Compare PostgreSQL LSNs like '16/B374D848'. */
+function isNewer(candidate: string, current: string | null): boolean {
+    if (!current) return true
+    const [candHigh, candLow] = candidate.split('/').map(part => parseInt(part, 16))
+    const [curHigh, curLow] = current.split('/').map(part => parseInt(part, 16))
+    if (candHigh !== curHigh) return candHigh > curHigh
+    return candLow > curLow
+}
+
+function rememberPosition(response: Response) {
+    const position = response.headers.get(DB_POSITION_HEADER)
+    if (position && isNewer(position, dbPosition)) {
+        dbPosition = position
+        sessionStorage.setItem(STORAGE_KEY, position)
+    }
+}
+
+export async function apiFetch(input: string, init: RequestInit = {}): Promise<Response> {
+    const headers = new Headers(init.headers)
+    if (dbPosition) {
+        headers.set(DB_POSITION_HEADER, dbPosition)
+    }
+    const response = await fetch(input, { ...init, headers })
+    rememberPosition(response)
+    return response
+}
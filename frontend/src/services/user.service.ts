@@ -1,4 +1,5 @@
 import type { User } from '@/types'
+import { apiFetch } from '@/services/api'
 
 const API_URL = import.meta.env.VITE_API_URL || '/api/v1'
 
@@ -13,7 +14,7 @@ export const userService = {
      */
     async getFriends(telegramId: number): Promise<User[]> {
         try {
-            const response = await fetch(`${API_URL}/users/friends?telegram_id=${telegramId}`, {
+            const response = await apiFetch(`${API_URL}/users/friends?telegram_id=${telegramId}`, {
                 method: 'GET',
                 headers: {
                     'Content-Type': 'application/json',
@@ -34,7 +35,7 @@ export const userService = {
 
     async subscribe(currentUserId: number, targetId: number): Promise<void> {
         try {
-            const response = await fetch(`${API_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
+            const response = await apiFetch(`${API_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -52,7 +53,7 @@ export const userService = {
 
     async unsubscribe(currentUserId: number, targetId: number): Promise<void> {
         try {
-            const response = await fetch(`${API_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
+            const response = await apiFetch(`${API_URL}/users/${targetId}/subscribe?current_user_id=${currentUserId}`, {
                 method: 'DELETE',
                 headers: {
                     'Content-Type': 'application/json',
@@ -70,7 +71,7 @@ export const userService = {
 
     async searchUsers(query: string, currentUserId: number): Promise<User[]> {
         try {
-            const response = await fetch(`${API_URL}/users/search?query=${encodeURIComponent(query)}&current_user_id=${currentUserId}`, {
+            const response = await apiFetch(`${API_URL}/users/search?query=${encodeURIComponent(query)}&current_user_id=${currentUserId}`, {
                 method: 'GET',
                 headers: {
                     'Content-Type': 'application/json',
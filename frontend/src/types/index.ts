@@ -63,6 +63,7 @@ export interface Wish {
   description: string | null
   link: string | null
   image_url: string | null
+  image_thumbnail_url?: string | null  // resized copy, relative to the API root; append &w=<width>
   price: number | null
   currency: string | null
   is_booked: boolean